@@ -0,0 +1,42 @@
+"""
+Offline backtest of the monitor/rebalance logic over a local candle file.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.backtest prices.csv [--range-width 0.02] [--rebalance-interval 3600]
+"""
+import argparse
+import json
+
+from ..utils.candles import load_candles
+from ..utils.history import granularity_seconds
+from .engine import BacktestParams, run_backtest
+
+
+def main() -> None:
+    defaults = BacktestParams()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or Parquet file with timestamp, close and optional volume columns")
+    parser.add_argument("--granularity", default="15m", help="Expected candle spacing (StrategyConfig.granularity)")
+    parser.add_argument("--range-width", type=float, default=defaults.range_width)
+    parser.add_argument("--rebalance-interval", type=int, default=defaults.rebalance_interval)
+    parser.add_argument("--fee-tier", type=int, default=defaults.fee_tier)
+    parser.add_argument("--initial-capital", type=float, default=defaults.initial_capital)
+    parser.add_argument("--pool-liquidity-usd", type=float, default=defaults.pool_liquidity_usd)
+    args = parser.parse_args()
+
+    candles = load_candles(args.path)
+    if candles.step != granularity_seconds(args.granularity):
+        print(f"Warning: candle spacing is {candles.step}s, expected {args.granularity}")
+
+    result = run_backtest(candles, BacktestParams(
+        range_width=args.range_width,
+        rebalance_interval=args.rebalance_interval,
+        fee_tier=args.fee_tier,
+        initial_capital=args.initial_capital,
+        pool_liquidity_usd=args.pool_liquidity_usd,
+    ))
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
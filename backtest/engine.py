@@ -0,0 +1,235 @@
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..utils.candles import Candles
+
+TRIGGER_BOUNDS = 1
+TRIGGER_TIME = 2
+
+# Largest look-ahead used when building the next-trigger table; segments that run past
+# it (very long rebalance intervals) are resolved with a direct scan.
+MAX_WINDOW = 512
+
+
+@dataclass(frozen=True)
+class BacktestParams:
+    """
+    Decision parameters, defaulting to the values hard-coded in the strategy.
+
+    Attributes:
+        range_width: Half-width of the LP range around the open price (PRICE_RANGE_MULTIPLIER).
+        rebalance_interval: Seconds after which a rebalance is forced (REBALANCE_INTERVAL).
+        fee_tier: Pool fee in hundredths of a bip (500 = 0.05%).
+        initial_capital: Starting capital in USDC.
+        pool_liquidity_usd: USD value of the pool liquidity active around the price, at
+            a concentration comparable to ours; our fee share is capital / this value.
+        execution_delay: Candles between a trigger and the re-opened position. The state
+            machine triggers in MONITOR_PRICE and rebalances on the following tick.
+        price_deviation_threshold: Deviation from the open price that triggers an immediate
+            rebalance even inside the range (PRICE_DEVIATION_THRESHOLD); None to disable.
+        min_price_deviation: Deviation required for the interval trigger to fire
+            (MIN_PRICE_DEVIATION, without the strategy's hysteresis); 0 fires on time alone.
+        slippage: Cost charged on the swapped half of the position at each rebalance.
+        gas_cost_usd: Flat cost per rebalance (close + open transactions).
+    """
+    range_width: float = 0.02
+    rebalance_interval: int = 3600
+    fee_tier: int = 500
+    initial_capital: float = 1000.0
+    pool_liquidity_usd: float = 20_000_000.0
+    execution_delay: int = 1
+    price_deviation_threshold: Optional[float] = 0.02
+    min_price_deviation: float = 0.005
+    slippage: float = 0.005
+    gas_cost_usd: float = 0.0
+
+    @property
+    def bound_width(self) -> float:
+        """Deviation that triggers an immediate rebalance (range edge or deviation rule)."""
+        if self.price_deviation_threshold is None:
+            return self.range_width
+        return min(self.range_width, self.price_deviation_threshold)
+
+
+@dataclass
+class BacktestResult:
+    params: BacktestParams
+    candles: int
+    rebalances: int
+    rebalances_by_trigger: Dict[str, int]
+    time_in_range: float
+    fees: float
+    impermanent_loss: float
+    rebalance_costs: float
+    lp_value: float
+    hold_value: float
+    elapsed: float
+    rebalance_indices: np.ndarray = field(repr=False)
+
+    @property
+    def net_value(self) -> float:
+        return self.lp_value + self.fees - self.rebalance_costs
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {key: value for key, value in asdict(self).items() if key not in ("params", "rebalance_indices")}
+        summary["net_value"] = self.net_value
+        summary["params"] = asdict(self.params)
+        return summary
+
+
+def _triggers(
+    prices: np.ndarray, timestamps: np.ndarray, i: Any, j: Any, params: BacktestParams
+) -> Tuple[Any, Any]:
+    """Whether a position opened at i is rebalanced at j, by bounds and by interval."""
+    deviation = np.abs(prices[j] / prices[i] - 1)
+    bounds = deviation > params.bound_width
+    interval = (timestamps[j] - timestamps[i] > params.rebalance_interval) & (
+        deviation > params.min_price_deviation
+    )
+    return bounds, interval
+
+
+def next_triggers(
+    timestamps: np.ndarray, prices: np.ndarray, params: BacktestParams
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    For every candle i, the candle at which a position opened at i would be rebalanced.
+
+    Mirrors the strategy's default triggers: a rebalance fires when the price leaves the
+    bounds set at i (or moves `price_deviation_threshold` from it), or once more than
+    `rebalance_interval` seconds have passed and the price moved by more than
+    `min_price_deviation`. Bounds are checked first.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Next trigger index per candle, the
+            trigger kind, and a mask of candles with no trigger inside the look-ahead
+            window, which must be resolved with `_scan`.
+    """
+    n = len(prices)
+    index = np.arange(n)
+    nxt = np.full(n, n, dtype=np.int64)
+    kind = np.zeros(n, dtype=np.int8)
+    found = np.zeros(n, dtype=bool)
+
+    step = max(int(np.median(np.diff(timestamps))), 1) if n > 1 else 1
+    window = min(params.rebalance_interval // step + 2, MAX_WINDOW)
+    for k in range(1, window + 1):
+        j = index + k
+        valid = ~found & (j < n)
+        if not valid.any():
+            break
+        bounds, interval = _triggers(prices, timestamps, index, np.minimum(j, n - 1), params)
+        bounds &= valid
+        interval &= valid & ~bounds
+        nxt[bounds | interval] = j[bounds | interval]
+        kind[bounds] = TRIGGER_BOUNDS
+        kind[interval] = TRIGGER_TIME
+        found |= bounds | interval
+
+    unresolved = ~found & (index + window < n - 1)
+    return nxt, kind, unresolved
+
+
+def _scan(prices: np.ndarray, timestamps: np.ndarray, i: int, params: BacktestParams) -> Tuple[int, int]:
+    """Find the first trigger for a position opened at i, scanning forward in chunks."""
+    n = len(prices)
+    start = i + 1
+    while start < n:
+        j = np.arange(start, min(start + 4096, n))
+        bounds, interval = _triggers(prices, timestamps, i, j, params)
+        hit = bounds | interval
+        if hit.any():
+            first = int(np.argmax(hit))
+            return int(j[first]), TRIGGER_BOUNDS if bounds[first] else TRIGGER_TIME
+        start = int(j[-1]) + 1
+    return n, 0
+
+
+def rebalance_points(candles: Candles, params: BacktestParams) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices where positions are (re)opened, starting at the first candle, and the trigger of each."""
+    prices, timestamps, n = candles.close, candles.timestamps, len(candles)
+    nxt, kind, unresolved = next_triggers(timestamps, prices, params)
+
+    points, triggers = [0], [0]
+    i = 0
+    while True:
+        j, trigger = int(nxt[i]), int(kind[i])
+        if unresolved[i]:
+            j, trigger = _scan(prices, timestamps, i, params)
+        if j >= n:
+            break
+        i = j + params.execution_delay
+        if i >= n:
+            break
+        points.append(i)
+        triggers.append(trigger)
+    return np.asarray(points, dtype=np.int64), np.asarray(triggers, dtype=np.int8)
+
+
+def run_backtest(candles: Candles, params: BacktestParams = BacktestParams()) -> BacktestResult:
+    """
+    Replay a price series through the monitor/rebalance decision logic.
+
+    Positions are modelled as full-range-width Uniswap V3 positions holding all capital,
+    re-opened at the current price on every rebalance. Fees are estimated from candle
+    volume (when present) times our share of the active liquidity while in range;
+    impermanent loss compares each position with holding its opening tokens.
+    """
+    started = time.perf_counter()
+    prices, n = candles.close, len(candles)
+    if n < 2:
+        raise ValueError("Need at least two candles to backtest")
+
+    starts, triggers = rebalance_points(candles, params)
+    ends = np.append(starts[1:], n - 1)
+    w = params.range_width
+
+    # Per-segment position math for one unit of liquidity (value is homogeneous in L).
+    p0, p1 = prices[starts], prices[ends]
+    sqrt_p0, sqrt_p1 = np.sqrt(p0), np.sqrt(p1)
+    sqrt_a, sqrt_b = np.sqrt(p0 * (1 - w)), np.sqrt(p0 * (1 + w))
+    x0, y0 = 1 / sqrt_p0 - 1 / sqrt_b, sqrt_p0 - sqrt_a
+    sqrt_c = np.clip(sqrt_p1, sqrt_a, sqrt_b)
+    x1, y1 = 1 / sqrt_c - 1 / sqrt_b, sqrt_c - sqrt_a
+    value0 = x0 * p0 + y0
+    lp_ratio = (x1 * p1 + y1) / value0
+    hold_ratio = (x0 * p1 + y0) / value0
+
+    segment_value = params.initial_capital * np.concatenate(([1.0], np.cumprod(lp_ratio)[:-1]))
+
+    # Map every candle to the position open at that time.
+    lengths = np.diff(np.append(starts, n))
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    open_price = p0[owner]
+    in_range = (prices >= open_price * (1 - w)) & (prices <= open_price * (1 + w))
+
+    fees = 0.0
+    if candles.volume is not None:
+        share = np.minimum(segment_value[owner] / params.pool_liquidity_usd, 1.0)
+        fees = float(np.sum(candles.volume * in_range * share) * params.fee_tier / 1_000_000)
+
+    # Each rebalance swaps about half of the closed position and pays gas.
+    closed_value = segment_value[:-1] * lp_ratio[:-1]
+    rebalance_costs = float(np.sum(closed_value * params.slippage / 2) + params.gas_cost_usd * (len(starts) - 1))
+
+    hold_value = params.initial_capital / 2 * (1 + prices[-1] / prices[0])
+    return BacktestResult(
+        params=params,
+        candles=n,
+        rebalances=len(starts) - 1,
+        rebalances_by_trigger={
+            "position_bounds": int(np.sum(triggers == TRIGGER_BOUNDS)),
+            "time_interval": int(np.sum(triggers == TRIGGER_TIME)),
+        },
+        time_in_range=float(np.mean(in_range)),
+        fees=fees,
+        impermanent_loss=float(np.prod(lp_ratio / hold_ratio) - 1),
+        rebalance_costs=rebalance_costs,
+        lp_value=float(params.initial_capital * np.prod(lp_ratio)),
+        hold_value=float(hold_value),
+        elapsed=time.perf_counter() - started,
+        rebalance_indices=starts[1:],
+    )
@@ -0,0 +1,185 @@
+"""
+Parameter sweep over the backtester, fanned out over a process pool.
+
+The candle series is written once to a .npy file and memory-mapped by every worker
+instead of being pickled to each one. Results are cached on disk by a hash of the
+parameters and the data, so extending a grid only evaluates the new points.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.backtest.sweep prices.csv \\
+        --grid range_width=0.01,0.02,0.03 --grid rebalance_interval=1800,3600,7200
+    python -m <strategy_dir>.backtest.sweep prices.csv --random 200 \\
+        --range min_price_deviation=0.001:0.01 --range range_width=0.005:0.05
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.candles import Candles, load_candles
+from .engine import BacktestParams, run_backtest
+
+# Worker-process copy of the memory-mapped candles, set by `_init_worker`.
+_candles: Optional[Candles] = None
+
+
+def grid(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the given parameter values."""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_points(space: Dict[str, Tuple[float, float]], count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """`count` points drawn uniformly from (low, high) per parameter; ints stay ints."""
+    rng = random.Random(seed)
+    points = []
+    for _ in range(count):
+        point = {}
+        for name, (low, high) in sorted(space.items()):
+            if isinstance(low, int) and isinstance(high, int):
+                point[name] = rng.randint(low, high)
+            else:
+                point[name] = rng.uniform(low, high)
+        points.append(point)
+    return points
+
+
+def data_fingerprint(candles: Candles) -> str:
+    digest = hashlib.sha256()
+    for column in (candles.timestamps, candles.close, candles.volume):
+        if column is not None:
+            digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def param_hash(params: BacktestParams, fingerprint: str) -> str:
+    payload = json.dumps({"params": asdict(params), "data": fingerprint}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def _write_shared(candles: Candles, path: str) -> None:
+    """Store the candles as one (3, n) float64 array: timestamps, close, volume (NaN if absent)."""
+    volume = candles.volume if candles.volume is not None else np.full(len(candles), np.nan)
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, np.vstack([candles.timestamps.astype(np.float64), candles.close, volume]))
+    os.replace(tmp_path, path)
+
+
+def _init_worker(path: str) -> None:
+    global _candles
+    data = np.load(path, mmap_mode="r")
+    volume = data[2]
+    _candles = Candles(
+        timestamps=data[0].astype(np.int64),
+        close=data[1],
+        volume=None if np.isnan(volume[0]) else volume,
+    )
+
+
+def _evaluate(params: BacktestParams) -> Dict[str, Any]:
+    return run_backtest(_candles, params).summary()
+
+
+def run_sweep(
+    candles: Candles,
+    points: List[Dict[str, Any]],
+    base: BacktestParams = BacktestParams(),
+    cache_dir: str = ".sweep_cache",
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every parameter point, reusing cached results.
+
+    Args:
+        candles: Price series to replay.
+        points: Parameter overrides, one dict per evaluation.
+        base: Parameters not being swept.
+        cache_dir: Directory holding the shared data file and cached results.
+        workers: Process count (defaults to the CPU count).
+
+    Returns:
+        List[Dict[str, Any]]: One result summary per point, in the order given.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fingerprint = data_fingerprint(candles)
+    param_sets = [replace(base, **point) for point in points]
+    hashes = [param_hash(params, fingerprint) for params in param_sets]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = {}
+    for key, params in zip(hashes, param_sets):
+        path = os.path.join(cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                results[key] = json.load(f)
+        else:
+            pending[key] = params
+    print(f"{len(points)} points: {len(results)} cached, {len(pending)} to evaluate")
+
+    if pending:
+        data_path = os.path.join(cache_dir, f"data-{fingerprint}.npy")
+        if not os.path.exists(data_path):
+            _write_shared(candles, data_path)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_path,)) as pool:
+            for key, summary in zip(pending, pool.map(_evaluate, pending.values(), chunksize=4)):
+                results[key] = summary
+                with open(os.path.join(cache_dir, f"{key}.json"), "w") as f:
+                    json.dump(summary, f)
+
+    return [results[key] for key in hashes]
+
+
+def _parse_value(name: str, raw: str) -> Any:
+    kind = {f.name: f.type for f in fields(BacktestParams)}[name]
+    if raw == "None":
+        return None
+    return int(raw) if kind in (int, "int") else float(raw)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or Parquet candle file")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH")
+    parser.add_argument("--random", type=int, default=0, help="Number of random points drawn from --range")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=".sweep_cache")
+    parser.add_argument("--top", type=int, default=10, help="Number of best results to print")
+    args = parser.parse_args()
+
+    points = []
+    if args.grid:
+        space = {}
+        for spec in args.grid:
+            name, values = spec.split("=")
+            space[name] = [_parse_value(name, value) for value in values.split(",")]
+        points += grid(space)
+    if args.random:
+        space = {}
+        for spec in args.range:
+            name, bounds = spec.split("=")
+            low, high = bounds.split(":")
+            space[name] = (_parse_value(name, low), _parse_value(name, high))
+        points += random_points(space, args.random, args.seed)
+    if not points:
+        parser.error("Nothing to sweep: pass --grid and/or --random with --range")
+
+    results = run_sweep(load_candles(args.path), points, cache_dir=args.cache_dir, workers=args.workers)
+    ranked = sorted(zip(points, results), key=lambda item: item[1]["net_value"], reverse=True)
+    for point, summary in ranked[:args.top]:
+        print(
+            f"net {summary['net_value']:12.2f}  rebalances {summary['rebalances']:6d}  "
+            f"in range {summary['time_in_range']:.3f}  {point}"
+        )
+
+
+if __name__ == "__main__":
+    main()
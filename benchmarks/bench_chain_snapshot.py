@@ -0,0 +1,82 @@
+"""
+Compares one MONITOR_PRICE cycle read as individual eth_calls against one ChainSnapshot.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_chain_snapshot [cycles] [latency_ms]
+"""
+import sys
+import time
+
+from eth_abi import decode
+from web3 import Web3
+
+from ..utils.chain_snapshot import (
+    POSITION_MANAGER_ADDRESS,
+    POSITIONS_TYPES,
+    SLOT0_TYPES,
+    ChainSnapshot,
+    encode_call,
+)
+from .fake_rpc import FakeChain, FakeRpcServer
+
+POOL = "0xf0e2c47d4c9fbb3be249a88a18f75b7c2914f70f"
+WALLET = "0x000000000000000000000000000000000000bEEF"
+WETH = "0x4200000000000000000000000000000000000006"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+POSITION_ID = 42
+# sqrtPriceX96 for ~3000 USDC per WETH (18 / 6 decimals)
+SQRT_PRICE_X96 = 4339505179874779489431521
+TICK = -196257
+
+
+def make_chain() -> FakeChain:
+    chain = FakeChain(POOL, SQRT_PRICE_X96, TICK)
+    chain.set_balance(WETH, WALLET, 10**18)
+    chain.set_balance(USDC, WALLET, 3_000 * 10**6)
+    chain.positions[POSITION_ID] = (
+        0, WALLET, WETH, USDC, 500, TICK - 200, TICK + 200, 10**15, 0, 0, 0, 0
+    )
+    return chain
+
+
+def individual_reads(web3: Web3) -> None:
+    """The pre-snapshot access pattern: one eth_call per value."""
+    def call(to, data, types):
+        return decode(types, bytes(web3.eth.call({"to": Web3.to_checksum_address(to), "data": "0x" + data.hex()})))
+
+    call(POOL, encode_call("slot0()"), SLOT0_TYPES)
+    call(POSITION_MANAGER_ADDRESS, encode_call("positions(uint256)", ["uint256"], [POSITION_ID]), POSITIONS_TYPES)
+    for token in (WETH, USDC):
+        call(token, encode_call("balanceOf(address)", ["address"], [WALLET]), ["uint256"])
+
+
+def main(cycles: int = 200, latency_ms: float = 0.0) -> None:
+    with FakeRpcServer(make_chain(), latency=latency_ms / 1000) as server:
+        web3 = Web3(Web3.HTTPProvider(server.url))
+
+        server.reset_counters()
+        start = time.perf_counter()
+        for _ in range(cycles):
+            individual_reads(web3)
+        individual_time = time.perf_counter() - start
+        individual_trips, individual_calls = server.round_trips, server.method_counts["eth_call"]
+
+        snapshots = ChainSnapshot(web3, POOL, WALLET, WETH, USDC, 18, 6)
+        server.reset_counters()
+        start = time.perf_counter()
+        for _ in range(cycles):
+            snapshot = snapshots.take(POSITION_ID)
+        snapshot_time = time.perf_counter() - start
+        snapshot_trips, snapshot_calls = server.round_trips, server.method_counts["eth_call"]
+
+    print(f"cycles: {cycles}, injected latency: {latency_ms} ms")
+    print(f"individual eth_calls: {individual_calls / cycles:.1f} eth_call, "
+          f"{individual_trips / cycles:.1f} round trips, {individual_time / cycles * 1000:.2f} ms per cycle")
+    print(f"chain snapshot:       {snapshot_calls / cycles:.1f} eth_call, "
+          f"{snapshot_trips / cycles:.1f} round trips, {snapshot_time / cycles * 1000:.2f} ms per cycle")
+    print(f"snapshot at block {snapshot.block_number}: spot {snapshot.spot_price:.2f}, "
+          f"SDK round trips saved so far: {snapshots.stats['round_trips_saved']}")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:])))
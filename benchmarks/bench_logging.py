@@ -0,0 +1,67 @@
+"""
+Caller-side cost of a tick's logging: print() of the state versus the queued JSON-lines logger.
+
+The sink is a stream whose writes take `write_ms` (a slow terminal, pipe or log shipper).
+print() pays for formatting the full state and for the write on every tick; the
+structured logger only builds a small dict and enqueues it, the write happens on its
+background thread.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_logging [ticks] [write_ms]
+"""
+import sys
+import time
+
+from ..utils.history import PriceHistory, RebalanceHistory
+from ..utils.structured_log import LogWriter, StructuredLogger
+
+
+class SlowStream:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def main(ticks: int = 2000, write_ms: float = 0.2) -> None:
+    ticks, delay = int(ticks), float(write_ms) / 1000
+    prices, rebalances = PriceHistory(), RebalanceHistory()
+    for i in range(ticks):
+        prices.append(1_700_000_000 + 60 * i, 3000.0 + i % 50)
+    state = {"current_state": "MONITOR_PRICE", "price_history": prices.encode(),
+             "rebalance_history": rebalances.encode()}
+
+    stream = SlowStream(delay)
+    started = time.perf_counter()
+    for i in range(ticks):
+        print(state, file=stream)
+        print(f"No rebalancing needed. Price: {3000.0 + i % 50}", file=stream)
+    print_time = time.perf_counter() - started
+
+    stream = SlowStream(delay)
+    writer = LogWriter(stream)
+    log = StructuredLogger("bench", writer).bind(strategy="bench")
+    started = time.perf_counter()
+    for i in range(ticks):
+        log.info("Persistent state", current_state="MONITOR_PRICE", price_history_len=len(prices),
+                 rebalance_history_len=len(rebalances))
+        log.info("No rebalancing needed", price=3000.0 + i % 50)
+    log_time = time.perf_counter() - started
+    writer.flush(timeout=60)
+    drained = time.perf_counter() - started
+
+    print(f"{ticks} ticks, {write_ms} ms per stream write")
+    print(f"print():            {print_time * 1e6 / ticks:8.1f} us per tick on the caller")
+    print(f"structured logger:  {log_time * 1e6 / ticks:8.1f} us per tick on the caller "
+          f"({stream.lines} lines written, drained after {drained:.2f} s, {writer.dropped} dropped)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,100 @@
+"""
+Checks made and range exits caught late by the MONITOR_PRICE cadence, per policy.
+
+A seeded per-block price path with calm and volatile regimes is replayed against a ±2%
+position, re-centered whenever an exit is detected. Compared: a check every block (the
+lower bound of the old spin loop, which re-checked as fast as RPC answered), a fixed
+polling interval, and `MonitorScheduler` fed by the samples its own checks took. Each
+check stands for one chain snapshot; detection delay is the time from a range exit to
+the check that sees it (from the start of the out-of-range stretch it catches).
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_monitor_scheduler [hours] [fixed_interval] [seed]
+"""
+import math
+import random
+import sys
+import time
+
+from ..utils.history import PriceHistory
+from ..utils.monitor_scheduler import MonitorScheduler, log_distance, realized_variance_rate
+
+BLOCK_TIME = 2
+RANGE_WIDTH = 0.02
+WINDOW = 96 * 900  # time_window × granularity of the default preset
+REGIMES = [(6 * 3600, 0.4), (2 * 3600, 1.5), (4 * 3600, 0.6), (1 * 3600, 3.0)]  # (seconds, annualized vol)
+
+
+def price_path(hours: float, seed: int) -> list:
+    """Per-block prices cycling through the volatility regimes."""
+    rng = random.Random(seed)
+    blocks = int(hours * 3600 / BLOCK_TIME)
+    prices, price, regime, regime_left = [], 3000.0, 0, REGIMES[0][0]
+    for _ in range(blocks):
+        sigma = REGIMES[regime][1] * math.sqrt(BLOCK_TIME / (365 * 86400))
+        price *= math.exp(rng.gauss(0, sigma))
+        prices.append(price)
+        regime_left -= BLOCK_TIME
+        if regime_left <= 0:
+            regime = (regime + 1) % len(REGIMES)
+            regime_left = REGIMES[regime][0]
+    return prices
+
+
+def replay(prices: list, next_delay) -> dict:
+    """Check at the times `next_delay(now, price, bounds, history)` picks; re-center on detected exits."""
+    history = PriceHistory()
+    bounds = (prices[0] * (1 - RANGE_WIDTH), prices[0] * (1 + RANGE_WIDTH))
+    now, checks, delays, exited_at = 0.0, 0, [], None
+    end = len(prices) * BLOCK_TIME
+    block = 0
+    while now < end:
+        # Exits between checks, found by scanning the blocks the schedule skipped
+        target = min(int(now / BLOCK_TIME), len(prices) - 1)
+        for index in range(block, target + 1):
+            if bounds[0] < prices[index] < bounds[1]:
+                exited_at = None
+            elif exited_at is None:
+                exited_at = index * BLOCK_TIME
+        block = target + 1
+        price = prices[target]
+        checks += 1
+        history.append(int(now), price)
+        if not bounds[0] < price < bounds[1]:
+            delays.append(now - (exited_at if exited_at is not None else now))
+            bounds, exited_at = (price * (1 - RANGE_WIDTH), price * (1 + RANGE_WIDTH)), None
+        now += max(next_delay(now, price, bounds, history), BLOCK_TIME)
+    delays.sort()
+    return {
+        "checks": checks,
+        "exits": len(delays),
+        "mean_delay": sum(delays) / len(delays) if delays else 0.0,
+        "p95_delay": delays[int(len(delays) * 0.95)] if delays else 0.0,
+    }
+
+
+def main(hours: str = "48", fixed_interval: str = "60", seed: str = "5") -> None:
+    prices = price_path(float(hours), int(seed))
+    scheduler = MonitorScheduler(min_interval=BLOCK_TIME, max_interval=300.0)
+
+    def adaptive(now, price, bounds, history):
+        variance = realized_variance_rate(history.timestamps(), history.prices(), now - WINDOW)
+        return scheduler.next_interval(log_distance(price, bounds), variance)
+
+    policies = {
+        "every block": lambda *_: BLOCK_TIME,
+        f"fixed {fixed_interval}s": lambda *_: float(fixed_interval),
+        "adaptive": adaptive,
+    }
+    print(f"{hours}h of {BLOCK_TIME}s blocks, ±{RANGE_WIDTH:.0%} range, regimes {REGIMES}")
+    for name, policy in policies.items():
+        started = time.perf_counter()
+        result = replay(prices, policy)
+        elapsed = time.perf_counter() - started
+        print(f"{name:12s} checks {result['checks']:7d} ({result['checks'] / float(hours):7.1f}/h)  "
+              f"exits {result['exits']:3d}  detection delay mean {result['mean_delay']:6.1f}s "
+              f"p95 {result['p95_delay']:6.1f}s  (replay {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
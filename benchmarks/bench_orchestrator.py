@@ -0,0 +1,78 @@
+"""
+Many strategy instances in one process: per-instance providers versus a shared registry.
+
+Each instance reads one chain snapshot per tick from a local fake node, like a
+MONITOR_PRICE tick. Reports the memory held by the instances' providers, the time of
+one full round of ticks and the peak number of concurrent requests at the node.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_orchestrator [instances] [latency_ms] [rpc_concurrency]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from web3 import Web3
+
+from ..orchestrator import StrategyOrchestrator
+from ..utils.chain_snapshot import ChainSnapshot
+from ..utils.providers import ProviderRegistry, RpcBudget
+from .bench_chain_snapshot import POOL, POSITION_ID, USDC, WALLET, WETH, make_chain
+from .fake_rpc import FakeRpcServer
+
+
+class SnapshotStrategy:
+    """Stand-in for MyStrategy with the same provider wiring and a snapshot read per tick."""
+
+    def __init__(self, web3):
+        self.web3 = web3
+        self.chain_snapshot = ChainSnapshot(web3, POOL, WALLET, WETH, USDC, 18, 6)
+
+    def run(self):
+        self.chain_snapshot.take(POSITION_ID)
+        return None
+
+
+async def no_actions(name: str, actions) -> None:
+    raise AssertionError(f"{name} returned actions; the snapshot stand-in never does")
+
+
+def measure(server: FakeRpcServer, make_web3, instances: int, max_concurrent_runs: int) -> tuple:
+    # Memory held by the instances once each has made a request (sessions, caches).
+    tracemalloc.start()
+    strategies = {f"pool-{i}": SnapshotStrategy(make_web3()) for i in range(instances)}
+    for strategy in strategies.values():
+        strategy.run()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    orchestrator = StrategyOrchestrator(strategies, no_actions, max_concurrent_runs=max_concurrent_runs)
+    server.reset_counters()
+    started = time.perf_counter()
+    asyncio.run(orchestrator.tick_all())
+    elapsed = time.perf_counter() - started
+    errors = sum(stats["errors"] for stats in orchestrator.stats.values())
+    return memory, elapsed, server.peak_in_flight, errors
+
+
+def main(instances: int = 100, latency_ms: float = 20.0, rpc_concurrency: int = 8) -> None:
+    with FakeRpcServer(make_chain(), latency=latency_ms / 1000) as server:
+        separate = measure(server, lambda: Web3(Web3.HTTPProvider(server.url)), instances, max_concurrent_runs=32)
+
+        registry = ProviderRegistry(
+            lambda network, chain: Web3(Web3.HTTPProvider(server.url)),
+            lambda protocol, network, chain: None,
+            rpc_budget=RpcBudget(rpc_concurrency),
+        )
+        shared = measure(server, lambda: registry.web3("MAINNET", "BASE"), instances, max_concurrent_runs=32)
+
+    print(f"instances: {instances}, injected latency: {latency_ms} ms")
+    for label, (memory, elapsed, peak, errors) in (("own providers", separate), ("shared registry", shared)):
+        print(f"{label:16s} {memory / 1024:9.1f} KiB held, round of ticks {elapsed * 1000:8.1f} ms, "
+              f"peak requests at node {peak:3d}, errors {errors}")
+    print(f"registry: {registry.stats}")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if i == 1 else int(arg) for i, arg in enumerate(sys.argv[1:])))
@@ -0,0 +1,158 @@
+"""
+Pool simulator accuracy and quote throughput.
+
+With a fixture recorded from a node (pool state plus QuoterV2 results at the same
+block), quotes are compared to the on-chain ones, which they should match to the wei.
+Without one, a synthetic pool is used and quotes are checked against a float
+re-derivation of the same curve. Either way, quotes are timed uncached and cached
+(the strategy re-quotes within a block for free).
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_pool_sim [fixture.json] [quotes]
+Record a fixture (needs a Base RPC endpoint):
+    python -m <strategy_dir>.benchmarks.bench_pool_sim record <rpc_url> <fixture.json> [quotes]
+"""
+import json
+import random
+import sys
+import time
+
+from ..utils.chain_snapshot import MulticallBatch
+from ..utils.pool_sim import PoolSimulator, TickBitmap
+from ..utils.tick_math import price_to_tick, sqrt_ratio_at_tick
+from .fake_sdk import POOL, USDC, WETH
+
+QUOTER_V2 = "0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a"  # Uniswap QuoterV2 on Base
+QUOTE_EXACT_INPUT_SINGLE = "quoteExactInputSingle((address,address,uint256,uint24,uint160))"
+
+
+def synthetic_pool(seed: int = 3, positions: int = 300, liquidity: tuple = (10 ** 12, 10 ** 14)) -> PoolSimulator:
+    """ETH/USDC-like pool around 3000 with randomly placed positions of `liquidity` (min, max) each."""
+    rng = random.Random(seed)
+    tick = price_to_tick(3000.0, 18, 6)
+    pool = PoolSimulator(sqrt_ratio_at_tick(tick) + 12345, tick, 0, 500, 10, {}, TickBitmap(10))
+    for _ in range(positions):
+        lower = tick // 10 * 10 + rng.randint(-3000, 3000) * 10
+        pool.add_liquidity(lower, lower + rng.randint(1, 300) * 10, rng.randint(*liquidity))
+    return pool
+
+
+def quote_sizes(count: int, seed: int = 7) -> list:
+    """(zero_for_one, amount_in) pairs from dust to pool-moving sizes, log-uniform."""
+    rng = random.Random(seed)
+    sizes = []
+    for _ in range(count):
+        zero_for_one = rng.random() < 0.5
+        exponent = rng.uniform(14, 19) if zero_for_one else rng.uniform(5, 10.5)
+        sizes.append((zero_for_one, int(10 ** exponent)))
+    return sizes
+
+
+def float_reference(pool: PoolSimulator, zero_for_one: bool, amount_in: int) -> float:
+    """Exact-input output re-derived in floating point, range by range."""
+    remaining = amount_in * (1 - pool.fee / 1e6)
+    sqrt_price, liquidity, tick, out = pool.sqrt_price_x96 / 2 ** 96, pool.liquidity, pool.tick, 0.0
+    ticks = sorted(pool.ticks)
+    while remaining > 0:
+        candidates = [t for t in ticks if t <= tick] if zero_for_one else [t for t in ticks if t > tick]
+        if not candidates:
+            raise ValueError("Swap leaves the pool's liquidity")
+        next_tick = max(candidates) if zero_for_one else min(candidates)
+        sqrt_next = sqrt_ratio_at_tick(next_tick) / 2 ** 96
+        needed = liquidity * (1 / sqrt_next - 1 / sqrt_price) if zero_for_one else liquidity * (sqrt_next - sqrt_price)
+        if liquidity > 0 and needed >= remaining:
+            if zero_for_one:
+                return out + liquidity * (sqrt_price - 1 / (1 / sqrt_price + remaining / liquidity))
+            return out + liquidity * (1 / sqrt_price - 1 / (sqrt_price + remaining / liquidity))
+        out += liquidity * (sqrt_price - sqrt_next) if zero_for_one else liquidity * (1 / sqrt_price - 1 / sqrt_next)
+        remaining -= needed
+        sqrt_price = sqrt_next
+        net = pool.ticks[next_tick].liquidity_net
+        liquidity, tick = (liquidity - net, next_tick - 1) if zero_for_one else (liquidity + net, next_tick)
+    return out
+
+
+def record(rpc_url: str, path: str, quotes: int = 200) -> None:
+    from web3 import Web3
+
+    web3 = Web3(Web3.HTTPProvider(rpc_url))
+    pool = PoolSimulator.load(web3, POOL, word_radius=2)
+    batch = MulticallBatch()
+    sizes = quote_sizes(int(quotes))
+    for index, (zero_for_one, amount_in) in enumerate(sizes):
+        token_in, token_out = (WETH, USDC) if zero_for_one else (USDC, WETH)
+        batch.add(str(index), QUOTER_V2, QUOTE_EXACT_INPUT_SINGLE, ["uint256", "uint160", "uint32", "uint256"],
+                  ["(address,address,uint256,uint24,uint160)"], [(token_in, token_out, amount_in, pool.fee, 0)],
+                  allow_failure=True)
+    results = batch.execute(web3, pool.block_number)
+    recorded = [
+        {"zero_for_one": zero_for_one, "amount_in": str(amount_in), "amount_out": str(result[0]),
+         "sqrt_price_after": str(result[1]), "ticks_crossed": result[2]}
+        for (zero_for_one, amount_in), result in zip(sizes, results.values()) if result is not None
+    ]
+    with open(path, "w") as f:
+        json.dump({"pool": pool.to_dict(), "quotes": recorded}, f)
+    print(f"recorded {len(recorded)} quotes at block {pool.block_number} to {path}")
+
+
+def accuracy_against_fixture(pool: PoolSimulator, recorded: list) -> list:
+    exact = price_exact = incomplete = 0
+    worst = 0.0
+    for entry in recorded:
+        quote = pool.quote(entry["zero_for_one"], int(entry["amount_in"]))
+        expected = int(entry["amount_out"])
+        exact += quote.amount_out == expected
+        price_exact += quote.sqrt_price_after == int(entry["sqrt_price_after"])
+        incomplete += not quote.complete
+        worst = max(worst, abs(quote.amount_out - expected) / max(expected, 1))
+    print(f"accuracy vs QuoterV2: {exact}/{len(recorded)} amounts exact, {price_exact}/{len(recorded)} "
+          f"sqrtPriceX96 exact, worst relative error {worst:.2e}, {incomplete} beyond the loaded ticks")
+    return [(entry["zero_for_one"], int(entry["amount_in"])) for entry in recorded]
+
+
+def accuracy_against_reference(pool: PoolSimulator, sizes: list) -> None:
+    worst, crossed = 0.0, 0
+    for zero_for_one, amount_in in sizes:
+        quote = pool.quote(zero_for_one, amount_in)
+        try:
+            reference = float_reference(pool, zero_for_one, amount_in)
+        except ValueError:
+            continue
+        worst = max(worst, abs(quote.amount_out / reference - 1))
+        crossed = max(crossed, quote.ticks_crossed)
+    print(f"accuracy vs float reference: worst relative error {worst:.2e} (up to {crossed} ticks crossed)")
+
+
+def main(*args) -> None:
+    if args and args[0] == "record":
+        return record(*args[1:])
+    fixture = args[0] if args and not args[0].isdigit() else None
+    count = int(args[-1]) if args and args[-1].isdigit() else 2000
+
+    if fixture:
+        with open(fixture) as f:
+            data = json.load(f)
+        pool = PoolSimulator.from_dict(data["pool"])
+        sizes = accuracy_against_fixture(pool, data["quotes"])
+    else:
+        pool = synthetic_pool()
+        sizes = quote_sizes(count)
+        accuracy_against_reference(PoolSimulator.from_dict(pool.to_dict()), sizes[:200])
+    print(f"pool: {len(pool.ticks)} initialized ticks, {len(sizes)} quotes")
+
+    started = time.perf_counter()
+    for zero_for_one, amount_in in sizes:
+        pool.swap(zero_for_one, amount_in, commit=False)
+    uncached = (time.perf_counter() - started) / len(sizes)
+    for zero_for_one, amount_in in sizes:
+        pool.quote(zero_for_one, amount_in)
+    started = time.perf_counter()
+    for zero_for_one, amount_in in sizes:
+        pool.quote(zero_for_one, amount_in)
+    cached = (time.perf_counter() - started) / len(sizes)
+    print(f"uncached {uncached * 1e6:8.1f} us/quote ({1 / uncached:9.0f}/s)   "
+          f"cached {cached * 1e6:6.2f} us/quote ({1 / cached:11.0f}/s)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
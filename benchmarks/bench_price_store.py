@@ -0,0 +1,83 @@
+"""
+Cost of serving the strategy's candle window from the local price store.
+
+A synthetic 15m candle file stands in for the data source (`FileCandleSource`). The
+store is backfilled, then `ticks` monitoring checks every `tick_seconds` each sync and
+read a `time_window` window, as `MyStrategy.get_price_window()` does; a new candle is
+only fetched when one has closed. Reports fetches against checks (one fetch per check
+without the store), per-check latency, the cost of reopening the store from disk, and
+that the window matches the source.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_price_store [ticks] [tick_seconds] [time_window]
+"""
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from ..utils.price_store import FileCandleSource, PriceStore
+from .fake_sdk import POOL
+
+GRANULARITY = "15m"
+STEP = 900
+
+
+def write_candles(path: str, start: int, count: int, seed: int = 2) -> None:
+    rng = random.Random(seed)
+    price = 3000.0
+    with open(path, "w") as f:
+        f.write("timestamp,close,volume\n")
+        for index in range(count):
+            price *= math.exp(rng.gauss(0, 0.004))
+            f.write(f"{start + index * STEP},{price:.6f},{rng.uniform(1e5, 1e6):.2f}\n")
+
+
+def main(ticks: str = "20000", tick_seconds: str = "2", time_window: str = "96") -> None:
+    ticks, tick_seconds, time_window = int(ticks), float(tick_seconds), int(time_window)
+    start = 1_700_000_000 // STEP * STEP
+    backfill_end = start + 30 * 86400
+    count = int((backfill_end - start + ticks * tick_seconds) // STEP) + 2
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "candles.csv")
+        write_candles(path, start, count)
+        source = FileCandleSource(path)
+        store = PriceStore(os.path.join(root, "store"), source, backfill=time_window)
+
+        started = time.perf_counter()
+        store.sync(POOL, GRANULARITY, backfill_end)
+        backfill = time.perf_counter() - started
+
+        now = float(backfill_end)
+        started = time.perf_counter()
+        for _ in range(ticks):
+            store.sync(POOL, GRANULARITY, now)
+            window = store.window(POOL, GRANULARITY, time_window)
+            now += tick_seconds
+        per_check = (time.perf_counter() - started) / ticks
+
+        # Correctness, outside the timed loop: the last window against the source
+        closed = int(now - tick_seconds) // STEP * STEP
+        expected = source.candles.timestamps[source.candles.timestamps < closed][-time_window:]
+        matches = np.array_equal(window.timestamps, expected)
+        shared = np.shares_memory(window.close, store._get(POOL, GRANULARITY).records)
+
+        started = time.perf_counter()
+        reopened = PriceStore(os.path.join(root, "store"), source, backfill=time_window)
+        cold = reopened.window(POOL, GRANULARITY, time_window)
+        reopen = time.perf_counter() - started
+
+        print(f"backfill {time_window} candles: {backfill * 1e3:.2f} ms")
+        print(f"{ticks} checks every {tick_seconds:g}s: {store.stats['fetches']} fetches "
+              f"({store.stats['appended']} candles appended), {per_check * 1e6:.1f} us/check (sync + window)")
+        print(f"window is a view of the mapped file: {shared}; last window matches the source: {matches}; "
+              f"reopen + first window {reopen * 1e6:.0f} us ({len(cold)} candles)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
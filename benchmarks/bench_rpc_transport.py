@@ -0,0 +1,71 @@
+"""
+Concurrent reads through a plain Web3 HTTPProvider versus the coalescing, batching RpcTransport.
+
+Worker threads stand in for states and strategy instances asking the chain the same
+questions at once: the pool's slot0 (every worker) and a token balance (one of a few
+wallets). Reports HTTP round trips at the node, wall time and per-method latency.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_rpc_transport [workers] [rounds] [latency_ms]
+"""
+import sys
+import threading
+import time
+
+from web3 import Web3
+
+from ..utils.chain_snapshot import SLOT0_TYPES, encode_call
+from ..utils.rpc_transport import RpcTransport
+from .bench_chain_snapshot import POOL, USDC, WALLET, make_chain
+from .fake_rpc import FakeRpcServer
+
+WALLETS = [WALLET] + [f"0x{i:040x}" for i in range(1, 4)]
+
+
+def worker(web3: Web3, index: int, rounds: int, barrier: threading.Barrier) -> None:
+    slot0 = {"to": Web3.to_checksum_address(POOL), "data": "0x" + encode_call("slot0()").hex()}
+    wallet = WALLETS[index % len(WALLETS)]
+    balance = {
+        "to": Web3.to_checksum_address(USDC),
+        "data": "0x" + encode_call("balanceOf(address)", ["address"], [Web3.to_checksum_address(wallet)]).hex(),
+    }
+    for _ in range(rounds):
+        barrier.wait()
+        web3.eth.call(slot0)
+        web3.eth.call(balance)
+
+
+def measure(server: FakeRpcServer, web3: Web3, workers: int, rounds: int) -> tuple:
+    web3.eth.chain_id  # Warm up the provider outside the measurement
+    server.reset_counters()
+    barrier = threading.Barrier(workers)
+    threads = [threading.Thread(target=worker, args=(web3, i, rounds, barrier)) for i in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, server.round_trips, server.method_counts["eth_call"]
+
+
+def main(workers: int = 32, rounds: int = 20, latency_ms: float = 20.0) -> None:
+    with FakeRpcServer(make_chain(), latency=latency_ms / 1000) as server:
+        plain = measure(server, Web3(Web3.HTTPProvider(server.url)), workers, rounds)
+
+        web3 = Web3(Web3.HTTPProvider(server.url))
+        transport = RpcTransport.install(web3, pool_size=8)
+        pooled = measure(server, web3, workers, rounds)
+        transport.close()
+
+    calls = workers * rounds * 2
+    print(f"{workers} workers x {rounds} rounds = {calls} eth_calls, injected latency: {latency_ms} ms")
+    for label, (elapsed, trips, eth_calls) in (("plain provider", plain), ("rpc transport", pooled)):
+        print(f"{label:15s} {elapsed * 1000:9.1f} ms, {trips:5d} HTTP round trips, {eth_calls:5d} eth_calls at the node")
+    stats = {name: value for name, value in transport.stats.items() if name != "methods"}
+    print(f"transport: {stats}")
+    for method, latency in transport.latency_summary().items():
+        print(f"  {method:15s} n={latency['count']:5d} mean {latency['mean_ms']:7.2f} ms, max {latency['max_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if i == 2 else int(arg) for i, arg in enumerate(sys.argv[1:])))
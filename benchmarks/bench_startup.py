@@ -0,0 +1,79 @@
+"""
+Cold-start cost of the strategy: an `-X importtime` report and wall-clock time to the first run().
+
+Each measurement runs in a fresh interpreter, as a cron-style invocation would. The
+first-run() timing builds MyStrategy from a preset and needs the Almanak framework on
+the path; it is reported as skipped otherwise. It runs twice, the second time with the
+startup cache (validated config) already populated.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_startup [module] [top]
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+PACKAGE = __package__.rsplit(".", 1)[0]
+PRESET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "presets", "default", "config.json")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+FIRST_RUN = """
+import json, time
+started = time.perf_counter()
+from {package}.strategy import MyStrategy
+imported = time.perf_counter()
+with open({preset!r}) as f:
+    entry = next(iter(json.load(f)["strategy_configs"].values()))
+strategy = MyStrategy(**entry["parameters"])
+built = time.perf_counter()
+strategy.run()
+done = time.perf_counter()
+print(f"{{(imported - started) * 1e3:.1f}} {{(built - imported) * 1e3:.1f}} {{(done - built) * 1e3:.1f}}")
+"""
+
+
+def import_report(module: str, top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.getcwd(),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, name))
+    if result.returncode != 0 or not rows:
+        print(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1] if result.stderr else ''}")
+        return
+    total = sum(cumulative for cumulative, _, depth, _ in rows if depth == 0)
+    print(f"import {module}: {total / 1000:.1f} ms total, {len(rows)} modules")
+    for cumulative, self_us, _, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms cumulative {self_us / 1000:7.1f} ms self  {name}")
+
+
+def first_run(cache_dir: str) -> None:
+    env = dict(os.environ, STRATEGY_STARTUP_CACHE=cache_dir)
+    for label in ("cold cache", "warm cache"):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_RUN.format(package=PACKAGE, preset=PRESET)],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode != 0:
+            print(f"first run(): skipped ({result.stderr.strip().splitlines()[-1]})")
+            return
+        imported, built, ran = result.stdout.strip().splitlines()[-1].split()
+        print(f"first run() [{label}]: import {imported} ms, construct {built} ms, run {ran} ms")
+
+
+def main(module: str = None, top: int = 15) -> None:
+    import_report(module or f"{PACKAGE}.strategy", int(top))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.chmod(cache_dir, 0o700)
+        first_run(cache_dir)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
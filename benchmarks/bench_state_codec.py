@@ -0,0 +1,103 @@
+"""
+Persistent state encode/decode time and size: the JSON dump path versus the binary codec.
+
+The state is the template plus full price and rebalance histories, as after a long
+run. "Decode" includes rebuilding the history buffers, which the model validators do
+on load.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_state_codec [repeat]
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from ..utils.history import PriceHistory, RebalanceHistory
+from ..utils.state_codec import get_codec, to_jsonable
+from ..utils.state_schema import PERSISTENT_STATE_SCHEMA
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "templates", "persistent_state_template.json")
+
+
+def long_run_state() -> dict:
+    with open(TEMPLATE_PATH) as f:
+        values = json.load(f)
+    prices, rebalances = PriceHistory(), RebalanceHistory()
+    start = 1_700_000_000
+    for i in range(2880 + 2160 * 60):
+        prices.append(start + 60 * i, 3000.0 + (i % 500) * 0.25)
+    for i in range(1000):
+        rebalances.append(start + 3600 * i, "position_bounds",
+                          {"current_price": 3100.0, "lower_bound": 2940.0, "upper_bound": 3060.0})
+    now = datetime.now(timezone.utc)
+    values.update(
+        current_actions=[uuid.uuid4()],
+        sadflow_actions=[uuid.uuid4(), uuid.uuid4()],
+        position_id=123456,
+        eth_usdc_position_id=123456,
+        last_check_time=now,
+        last_rebalance_time=now,
+        last_rebalance_timestamp=now.timestamp(),
+        last_eth_price=3012.5,
+        position_tick_lower=-196450,
+        position_tick_upper=-196040,
+        tick_spacing=10,
+        price_history=prices,
+        rebalance_history=rebalances,
+    )
+    return values
+
+
+def rebuild_histories(data: dict) -> None:
+    data["price_history"] = PriceHistory.decode(data["price_history"])
+    data["rebalance_history"] = RebalanceHistory.decode(data["rebalance_history"])
+
+
+def dump_path_encode(values: dict) -> bytes:
+    return json.dumps(to_jsonable(values), separators=(",", ":"), default=str).encode()
+
+
+def dump_path_decode(payload: bytes) -> dict:
+    data = json.loads(payload)
+    rebuild_histories(data)
+    return data
+
+
+def timed(fn, arg, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - started) / repeat
+
+
+def main(repeat: int = 200) -> None:
+    repeat = int(repeat)
+    values = long_run_state()
+    rows = [("model_dump JSON", dump_path_encode, dump_path_decode)]
+    for name in ("json", "binary"):
+        codec = get_codec(name, PERSISTENT_STATE_SCHEMA)
+
+        def decode(payload, codec=codec):
+            _, data = codec.decode(payload)
+            rebuild_histories(data)
+            return data
+
+        rows.append((f"{name} codec", lambda data, codec=codec: codec.encode(data, 1), decode))
+
+    print(f"state: {len(values['price_history'])} price samples, "
+          f"{len(values['price_history'].rollups)} rollups, {len(values['rebalance_history'])} rebalances")
+    for label, encode, decode in rows:
+        payload = encode(values)
+        decoded = decode(payload)
+        assert decoded["price_history"].to_bytes() == values["price_history"].to_bytes()
+        encode_time, decode_time = timed(encode, values, repeat), timed(decode, payload, repeat)
+        print(f"{label:16s} {len(payload) / 1024:8.1f} KiB  encode {encode_time * 1e6:8.1f} us  "
+              f"decode {decode_time * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,88 @@
+"""
+Bytes written per MONITOR_PRICE tick: full state dump versus the snapshot + journal path.
+
+Each simulated tick updates `last_check_time` and `last_eth_price` and appends one price
+sample, which is what a quiet monitoring tick changes in the persistent state.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_state_journal [ticks]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from ..utils.history import PriceHistory, RebalanceHistory
+from ..utils.state_journal import StateJournal, atomic_write
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "templates", "persistent_state_template.json")
+
+
+def full_state(template: dict, prices: PriceHistory, rebalances: RebalanceHistory, tick_time: datetime,
+               price: float) -> dict:
+    state = dict(template)
+    state.update(
+        current_state="MONITOR_PRICE",
+        last_check_time=tick_time.isoformat(),
+        last_eth_price=price,
+        price_history=prices.encode(),
+        rebalance_history=rebalances.encode(),
+    )
+    return state
+
+
+def main(ticks: int = 2000) -> None:
+    with open(TEMPLATE_PATH) as f:
+        template = json.load(f)
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Current path: the whole state is dumped on every tick.
+        prices, rebalances = PriceHistory(), RebalanceHistory()
+        full_bytes = 0
+        started = time.perf_counter()
+        for i in range(ticks):
+            tick_time = start_time + timedelta(minutes=15 * i)
+            price = 3000.0 + i % 50
+            prices.append(int(tick_time.timestamp()), price)
+            payload = json.dumps(full_state(template, prices, rebalances, tick_time, price)).encode()
+            atomic_write(os.path.join(tmp, "full.json"), payload)
+            full_bytes += len(payload)
+        full_time = time.perf_counter() - started
+
+        # Journaled path: one snapshot, then only deltas until compaction.
+        journal = StateJournal(tmp, name="journaled")
+        prices, rebalances = PriceHistory(), RebalanceHistory()
+        journal_bytes = journal.compact(full_state(template, prices, rebalances, start_time, 0.0))
+        prices.drain_changes()
+        started = time.perf_counter()
+        for i in range(ticks):
+            tick_time = start_time + timedelta(minutes=15 * i)
+            price = 3000.0 + i % 50
+            prices.append(int(tick_time.timestamp()), price)
+            if journal.needs_compaction():
+                prices.drain_changes()
+                journal_bytes += journal.compact(full_state(template, prices, rebalances, tick_time, price))
+            else:
+                journal_bytes += journal.append(
+                    {"last_check_time": tick_time.isoformat(), "last_eth_price": price},
+                    {"price_history": [list(row) for row in prices.drain_changes()]},
+                )
+        journal_time = time.perf_counter() - started
+
+        # The rebuilt state must match the in-memory one.
+        data, appends = StateJournal(tmp, name="journaled").load()
+        rebuilt = PriceHistory.decode(data["price_history"])
+        rebuilt.replay(appends.get("price_history", []))
+        assert list(rebuilt.prices()) == list(prices.prices()), "journal replay diverged"
+
+    print(f"ticks: {ticks}")
+    print(f"full dump:  {full_bytes / ticks:10.1f} bytes/tick, {full_time / ticks * 1e6:8.1f} us/tick")
+    print(f"journaled:  {journal_bytes / ticks:10.1f} bytes/tick, {journal_time / ticks * 1e6:8.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
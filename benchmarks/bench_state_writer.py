@@ -0,0 +1,96 @@
+"""
+Save latency seen by a tick: journaled saves in the foreground versus write-behind.
+
+Each simulated tick does `work_ms` of other work (chain reads), changes what a quiet
+MONITOR_PRICE tick changes and saves; every `action_every` ticks an ActionBundle is
+returned, behind a `flush()` barrier. `io_delay_ms` is added to every journal write as
+a stand-in for slower storage. Reports the caller-side save and barrier latency, how
+many saves the writer coalesced, and that the journal rebuilds to the in-memory state.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_state_writer [ticks] [work_ms] [io_delay_ms] [action_every]
+"""
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from ..utils.history import PriceHistory, RebalanceHistory
+from ..utils.state_journal import StateJournal
+from ..utils.state_writer import StateWriter
+from .bench_state_journal import TEMPLATE_PATH, full_state
+
+
+class SlowJournal(StateJournal):
+    def __init__(self, directory: str, io_delay: float):
+        super().__init__(directory, name="state", compact_every=200)
+        self.io_delay = io_delay
+
+    def append(self, sets, appends) -> int:
+        time.sleep(self.io_delay)
+        return super().append(sets, appends)
+
+    def compact(self, data) -> int:
+        time.sleep(self.io_delay)
+        return super().compact(data)
+
+
+def run(ticks: int, work: float, io_delay: float, action_every: int, write_behind: bool) -> dict:
+    with open(TEMPLATE_PATH) as f:
+        template = json.load(f)
+    start_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SlowJournal(tmp, io_delay)
+        writer = StateWriter(journal) if write_behind else None
+        prices, rebalances = PriceHistory(), RebalanceHistory()
+        journal.compact(full_state(template, prices, rebalances, start_time, 0.0))
+        save_times, flush_times = [], []
+        for i in range(ticks):
+            time.sleep(work)
+            tick_time = start_time + timedelta(minutes=i)
+            price = 3000.0 + i % 50
+            prices.append(int(tick_time.timestamp()), price)
+
+            started = time.perf_counter()
+            if journal.needs_compaction():
+                values = full_state(template, PriceHistory.from_bytes(prices.to_bytes()), rebalances, tick_time, price)
+                prices.drain_changes()
+                writer.submit_snapshot(values) if writer else journal.compact(values)
+            else:
+                sets = {"last_check_time": tick_time.isoformat(), "last_eth_price": price}
+                appends = {"price_history": [list(row) for row in prices.drain_changes()]}
+                writer.submit_delta(sets, appends) if writer else journal.append(sets, appends)
+            save_times.append(time.perf_counter() - started)
+
+            if writer is not None and (i + 1) % action_every == 0:
+                started = time.perf_counter()
+                writer.flush()
+                flush_times.append(time.perf_counter() - started)
+        if writer is not None:
+            writer.flush()
+
+        data, appends = StateJournal(tmp, name="state").load()
+        rebuilt = PriceHistory.decode(data["price_history"])
+        rebuilt.replay(appends.get("price_history", []))
+        return {
+            "save": sum(save_times) / ticks,
+            "flush": sum(flush_times) / len(flush_times) if flush_times else 0.0,
+            "coalesced": writer.stats["coalesced"] if writer else 0,
+            "writes": writer.stats["writes"] if writer else ticks,
+            "matches": list(rebuilt.prices()) == list(prices.prices()),
+        }
+
+
+def main(ticks: str = "500", work_ms: str = "2", io_delay_ms: str = "5", action_every: str = "50") -> None:
+    ticks, work, io_delay, action_every = int(ticks), float(work_ms) / 1e3, float(io_delay_ms) / 1e3, int(action_every)
+    print(f"{ticks} ticks, {work_ms} ms of work per tick, {io_delay_ms} ms added per journal write, "
+          f"actions every {action_every} ticks")
+    for name, write_behind in (("foreground", False), ("write-behind", True)):
+        result = run(ticks, work, io_delay, action_every, write_behind)
+        print(f"{name:12s} save {result['save'] * 1e3:7.3f} ms/tick  barrier {result['flush'] * 1e3:6.2f} ms  "
+              f"writes {result['writes']:4d} (coalesced {result['coalesced']})  rebuilt state matches: {result['matches']}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,154 @@
+"""
+End-to-end cost of MyStrategy.run() against a deterministic fake Uniswap V3 SDK.
+
+Each cycle drives one strategy instance from INITIALIZATION through swap, liquidity
+provision, `ticks` MONITOR_PRICE ticks (with the rebalances the seeded price walk
+triggers) and TEARDOWN. Bundles returned by run() are applied to the fake market and
+their position id recorded, standing in for the framework's executioner. Reports
+per-state latency, SDK/RPC calls per method, peak RSS and persistent-state size growth.
+
+Reads go through the SDK getters (`use_multicall` off) so every call is counted, and
+the state is kept in a temporary local journal. Needs the Almanak framework on the
+path; it is reported as skipped otherwise.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_strategy [cycles] [ticks] [latency_ms] [json_path]
+"""
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from ..utils.metrics import MetricsRegistry
+from ..utils.providers import ProviderRegistry
+from ..utils.state_journal import to_jsonable
+from .fake_sdk import FakeMarket, FakeUniswapV3, FakeWeb3
+
+PRESET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "presets", "default", "config.json")
+SIZE_SAMPLES = 10
+
+
+def state_size(strategy) -> int:
+    return len(json.dumps(to_jsonable(strategy.persistent_state.model_dump())))
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def record_receipt(strategy, bundle, position_id) -> None:
+    """Record the outcome of an executed bundle in the persistent state."""
+    state = strategy.persistent_state
+    closed = any(getattr(action.type, "name", "") == "CLOSE_LP_POSITION" for action in bundle.actions)
+    if position_id is not None:
+        state.position_id = position_id
+        state.eth_usdc_position_id = position_id
+    elif closed:
+        state.position_id = -1
+        state.eth_usdc_position_id = None
+    strategy.save_persistent_state()
+
+
+def monitor_ticks(metrics: MetricsRegistry) -> int:
+    return sum(
+        timing["count"] for timing in metrics.to_json()["timings"]
+        if timing["name"] == "state_seconds" and timing["labels"].get("state") == "monitor_price"
+    )
+
+
+def run_cycle(strategy_class, parameters: dict, registry: ProviderRegistry, market: FakeMarket,
+              metrics: MetricsRegistry, ticks: int, sizes: list) -> int:
+    """Drive one strategy instance through a full cycle; returns the number of run() calls."""
+    strategy = strategy_class(providers=registry, **parameters)
+    strategy.metrics = metrics.bind()
+    strategy.monitor_deadline = 0  # One MONITOR_PRICE check per run(): this loop drives the ticks
+    start_ticks = monitor_ticks(metrics)
+    next_sample = 0
+    runs = 0
+    while strategy.persistent_state.current_state != strategy.State.TERMINATED:
+        done = monitor_ticks(metrics) - start_ticks
+        if done >= ticks:
+            strategy.config.initiate_teardown = True
+        actions = strategy.run()
+        runs += 1
+        if actions is not None:
+            record_receipt(strategy, actions, market.execute(actions))
+        if done >= next_sample:
+            sizes.append((done, state_size(strategy)))
+            next_sample += max(ticks // SIZE_SAMPLES, 1)
+    return runs
+
+
+def main(cycles: int = 2, ticks: int = 5000, latency_ms: float = 0.0, json_path: str = None) -> None:
+    cycles, ticks, latency = int(cycles), int(ticks), float(latency_ms) / 1000
+    try:
+        from ..strategy import MyStrategy
+    except ImportError as e:
+        print(f"bench_strategy: skipped ({e!r})")
+        return
+
+    with open(PRESET) as f:
+        base = next(iter(json.load(f)["strategy_configs"].values()))["parameters"]
+
+    market = FakeMarket()
+    sdk = FakeUniswapV3(market, latency)
+    registry = ProviderRegistry(lambda network, chain: FakeWeb3(market, sdk.calls, latency),
+                                lambda protocol, network, chain: sdk)
+    metrics = MetricsRegistry()
+    sizes_per_cycle, runs = [], 0
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as journal_root:
+        for cycle in range(cycles):
+            parameters = dict(
+                base,
+                use_multicall=False,
+                use_rpc_transport=False,
+                block_time=0.0,
+                log_level="WARNING",
+                metrics_port=None,
+                metrics_json_path=None,
+                state_journal_dir=os.path.join(journal_root, f"cycle-{cycle}"),
+            )
+            sizes = []
+            runs += run_cycle(MyStrategy, parameters, registry, market, metrics, ticks, sizes)
+            sizes_per_cycle.append(sizes)
+        journal_bytes = directory_size(journal_root)
+    elapsed = time.perf_counter() - started
+
+    timings = {
+        timing["labels"]["state"]: timing for timing in metrics.to_json()["timings"]
+        if timing["name"] == "state_seconds"
+    }
+    total_ticks = timings.get("monitor_price", {}).get("count", 0)
+    calls = Counter(sdk.calls)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    print(f"cycles: {cycles}, MONITOR_PRICE ticks: {total_ticks}, run() calls: {runs}, "
+          f"injected latency: {latency_ms} ms, wall time {elapsed:.2f} s")
+    print(f"{'state':18s} {'count':>7s} {'mean ms':>9s} {'max ms':>9s}")
+    for state, timing in sorted(timings.items()):
+        print(f"{state:18s} {timing['count']:7d} {timing['sum'] / timing['count'] * 1e3:9.3f} {timing['max'] * 1e3:9.3f}")
+    print("calls: " + ", ".join(f"{method}={count}" for method, count in sorted(calls.items()))
+          + f" ({sum(calls.values()) / max(total_ticks, 1):.2f} per tick)")
+    print("bundles executed: " + ", ".join(f"{kind}={count}" for kind, count in sorted(market.executed.items())))
+    print(f"peak RSS: {peak_rss / 2**20:.1f} MiB, journal on disk: {journal_bytes / 1024:.1f} KiB")
+    for cycle, sizes in enumerate(sizes_per_cycle):
+        (first_tick, first), (last_tick, last) = sizes[0], sizes[-1]
+        growth = (last - first) / max(last_tick - first_tick, 1) * 1000
+        print(f"cycle {cycle} state size: {first} B at tick {first_tick}, {last} B at tick {last_tick} "
+              f"({growth:+.0f} B per 1000 ticks)")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({
+                "cycles": cycles, "ticks": total_ticks, "runs": runs, "latency_ms": float(latency_ms),
+                "states": timings, "calls": calls, "bundles": market.executed, "peak_rss_bytes": peak_rss,
+                "journal_bytes": journal_bytes, "state_sizes": sizes_per_cycle,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
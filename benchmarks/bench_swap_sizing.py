@@ -0,0 +1,91 @@
+"""
+Capital left idle by the swap before a mint, per sizing method.
+
+Starting balances (all USDC, as at the first deposit, or a mix, as after a close) are
+swapped on a synthetic pool (deep by default, or `thin`: the pool_sim bench's) and
+minted over the ±2% range the strategy would open around the pool's tick; whatever
+the mint does not take is idle until another swap. Compares the old half-split swap
+with the closed-form sizing, alone and refined on the pool simulator's quotes, and
+times each.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_swap_sizing [trials] [deep|thin]
+"""
+import random
+import sys
+import time
+
+from ..utils.pool_sim import PoolSimulator
+from ..utils.swap_sizing import SwapPlan, optimal_swap
+from ..utils.tick_math import Q96, range_ticks
+from .bench_pool_sim import synthetic_pool
+
+RANGE_WIDTH = 0.02
+POOL_LIQUIDITY = {"deep": (10 ** 16, 10 ** 18), "thin": (10 ** 12, 10 ** 14)}
+FOLLOW_UP_SHARE = 0.001  # Idle value above which another swap would be worth making
+
+
+def scenarios(trials: int, seed: int = 11) -> list:
+    """(label, eth, usdc) starting balances: deposits of all USDC and post-close mixes."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(trials):
+        usdc = int(10 ** rng.uniform(8, 11.5))
+        cases.append(("deposit", 0, usdc))
+        cases.append(("post-close", int(usdc / 3000 * rng.uniform(0, 2) * 1e12), int(usdc * rng.uniform(0, 1))))
+    return cases
+
+
+def half_split(pool: PoolSimulator, eth: int, usdc: int) -> SwapPlan:
+    quote = pool.quote(False, usdc // 2)
+    return SwapPlan(False, usdc // 2, quote.amount_out, quote.sqrt_price_after)
+
+
+def idle_share(pool: PoolSimulator, tick_lower: int, tick_upper: int, eth: int, usdc: int, plan: SwapPlan) -> float:
+    price = (pool.sqrt_price_x96 / Q96) ** 2
+    total = eth * price + usdc
+    if plan.needed:
+        executed = pool.swap(plan.zero_for_one, plan.amount_in, commit=False)
+        plan = SwapPlan(plan.zero_for_one, plan.amount_in, executed.amount_out, executed.sqrt_price_after)
+    eth_after, usdc_after = plan.balances_after(eth, usdc)
+    after = PoolSimulator.from_dict(pool.to_dict())
+    after.sqrt_price_x96 = plan.sqrt_price_after if plan.needed else pool.sqrt_price_x96
+    _, used0, used1 = after.mint_quote(tick_lower, tick_upper, eth_after, usdc_after)
+    return ((eth_after - used0) * price + usdc_after - used1) / total
+
+
+def main(trials: str = "200", depth: str = "deep") -> None:
+    pool = synthetic_pool(liquidity=POOL_LIQUIDITY[depth])
+    tick_lower, tick_upper = range_ticks(pool.tick, RANGE_WIDTH, pool.tick_spacing)
+
+    def quote(zero_for_one: bool, amount_in: int):
+        result = pool.quote(zero_for_one, amount_in)
+        return result.amount_out, result.sqrt_price_after
+
+    methods = {
+        "half split": lambda eth, usdc: half_split(pool, eth, usdc),
+        "closed form (no impact)": lambda eth, usdc: optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, eth, usdc, pool.fee),
+        "closed form + quotes": lambda eth, usdc: optimal_swap(
+            pool.sqrt_price_x96, tick_lower, tick_upper, eth, usdc, pool.fee, quote=quote),
+    }
+    cases = scenarios(int(trials))
+    print(f"{len(cases)} cases on the {depth} pool, range ±{RANGE_WIDTH:.0%} over ticks [{tick_lower}, {tick_upper})")
+    for name, size in methods.items():
+        for label in ("deposit", "post-close"):
+            shares, elapsed = [], 0.0
+            for case_label, eth, usdc in cases:
+                if case_label != label:
+                    continue
+                pool._quotes.clear()
+                started = time.perf_counter()
+                plan = size(eth, usdc)
+                elapsed += time.perf_counter() - started
+                shares.append(idle_share(pool, tick_lower, tick_upper, eth, usdc, plan))
+            shares.sort()
+            follow_ups = sum(share > FOLLOW_UP_SHARE for share in shares)
+            print(f"{name:23s} {label:10s}  idle median {shares[len(shares) // 2]:.2e}  max {shares[-1]:.2e}  "
+                  f"follow-up swaps {follow_ups:4d}/{len(shares)}  {elapsed / len(shares) * 1e3:6.2f} ms/sizing")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,97 @@
+"""
+Rebalances made by the trigger rules on replayed prices, evaluated in one pass per check.
+
+The price series (a candle file, or by default the seeded regime path of
+`bench_monitor_scheduler` sampled every `check_seconds`) is replayed against a ±2%
+position re-opened at the price of every trigger. Compared: the old rules (range exit,
+or the hourly interval on time alone) and the strategy's default rules (range exit, 2%
+deviation, or the interval once the price moved 0.5%, with hysteresis). Reports
+rebalances per trigger, time in range and the cost of one `TriggerEngine.evaluate()`,
+and checks the replay without hysteresis against the backtest engine's trigger points.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_triggers [hours|candles.csv] [check_seconds] [seed]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from ..backtest.engine import BacktestParams, rebalance_points
+from ..utils.candles import Candles, load_candles
+from ..utils.triggers import Observation, TriggerEngine
+from .bench_monitor_scheduler import BLOCK_TIME, price_path
+
+RANGE_WIDTH = 0.02
+INTERVAL = 3600
+
+LEGACY = [
+    {"rule": "position_bounds"},
+    {"name": "time_interval", "rule": "time_elapsed", "seconds": INTERVAL},
+]
+DEFAULT = [  # MyStrategy.default_triggers() without dynamic_range
+    {"rule": "position_bounds"},
+    {"rule": "price_deviation", "threshold": 0.02},
+    {"name": "time_interval", "all": [
+        {"rule": "time_elapsed", "seconds": INTERVAL},
+        {"rule": "price_deviation", "threshold": "volatility", "hysteresis": 0.0025},
+    ]},
+]
+
+
+def replay(candles: Candles, specs: list) -> dict:
+    engine = TriggerEngine.compile(specs)
+    prices, timestamps = candles.close.tolist(), candles.timestamps.tolist()
+    reference, opened_at = prices[0], timestamps[0]
+    counts, points, in_range = Counter(), [0], 0
+    started = time.perf_counter()
+    for index in range(1, len(prices)):
+        price = prices[index]
+        inside = reference * (1 - RANGE_WIDTH) <= price <= reference * (1 + RANGE_WIDTH)
+        in_range += inside
+        fired = engine.evaluate(Observation(
+            price=price, timestamp=timestamps[index], in_range=inside,
+            reference_price=reference, opened_at=opened_at, volatility_threshold=0.005,
+        ))
+        if fired:
+            counts[fired[0]] += 1
+            points.append(index)
+            reference, opened_at = price, timestamps[index]
+            engine.reset()
+    per_check = (time.perf_counter() - started) / (len(prices) - 1)
+    return {"counts": counts, "points": points, "in_range": in_range / (len(prices) - 1), "per_check": per_check}
+
+
+def main(source: str = "72", check_seconds: str = "60", seed: str = "5") -> None:
+    if os.path.exists(source):
+        candles = load_candles(source)
+        label = f"{source} ({len(candles)} candles)"
+    else:
+        step = max(int(float(check_seconds) / BLOCK_TIME), 1)
+        prices = np.array(price_path(float(source), int(seed))[::step])
+        candles = Candles(timestamps=np.arange(len(prices), dtype=np.int64) * step * BLOCK_TIME, close=prices)
+        label = f"{source}h regime path checked every {step * BLOCK_TIME}s"
+    print(f"{label}, ±{RANGE_WIDTH:.0%} range, {INTERVAL}s interval")
+
+    for name, specs in (("old rules", LEGACY), ("default rules", DEFAULT)):
+        result = replay(candles, specs)
+        total = sum(result["counts"].values())
+        by_trigger = ", ".join(f"{trigger} {count}" for trigger, count in sorted(result["counts"].items()))
+        print(f"{name:14s} rebalances {total:4d} ({by_trigger})  in range {result['in_range']:6.1%}  "
+              f"evaluate {result['per_check'] * 1e6:.2f} us/check")
+
+    # Without hysteresis the rules are the ones the backtest engine vectorizes
+    plain = DEFAULT[:2] + [{"name": "time_interval", "all": [
+        {"rule": "time_elapsed", "seconds": INTERVAL}, {"rule": "price_deviation", "threshold": 0.005}]}]
+    engine_points, _ = rebalance_points(candles, BacktestParams(
+        range_width=RANGE_WIDTH, rebalance_interval=INTERVAL, execution_delay=0,
+        price_deviation_threshold=0.02, min_price_deviation=0.005,
+    ))
+    print(f"replay without hysteresis matches the backtest engine: "
+          f"{replay(candles, plain)['points'] == engine_points.tolist()}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
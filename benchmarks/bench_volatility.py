@@ -0,0 +1,102 @@
+"""
+Streaming volatility statistics against recomputing over the price history, and the
+rebalances a dynamic range saves.
+
+Per-check cost: `VolatilityStats.update()` + `variance_rate()` against
+`realized_variance_rate()` over the `time_window` of a full `PriceHistory`, on the
+same seeded regime path as `bench_monitor_scheduler`, checked every `check_seconds`.
+
+Rebalances: the path is replayed against a position re-centered whenever the price
+leaves it or, after the hourly interval, on the time trigger. Compared: the fixed ±2%
+range rebalanced every hour, and `dynamic_range` (width from the streaming sigma,
+time trigger held back until the price is an ATR off center). Reports rebalances,
+the share of checks in range, and the mean width opened.
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.benchmarks.bench_volatility [hours] [check_seconds] [seed]
+"""
+import math
+import sys
+import time
+
+from ..utils.history import PriceHistory
+from ..utils.monitor_scheduler import realized_variance_rate
+from ..utils.volatility import VolatilityStats
+from .bench_monitor_scheduler import BLOCK_TIME, REGIMES, WINDOW, price_path
+
+PERIOD, PERIODS = 900, 96  # granularity × time_window of the default preset
+REBALANCE_INTERVAL = 3600
+MIN_PRICE_DEVIATION = 0.005
+FIXED_WIDTH = 0.02
+
+
+def checks(prices: list, check_seconds: float):
+    """(timestamp, price) of each check."""
+    step = max(int(check_seconds / BLOCK_TIME), 1)
+    for index in range(0, len(prices), step):
+        yield index * BLOCK_TIME, prices[index]
+
+
+def update_cost(prices: list, check_seconds: float) -> dict:
+    history, stats = PriceHistory(), VolatilityStats(PERIOD, PERIODS)
+    samples = list(checks(prices, check_seconds))
+    for timestamp, price in samples:
+        history.append(timestamp, price)
+
+    started = time.perf_counter()
+    for timestamp, price in samples:
+        stats.update(timestamp, price)
+        stats.variance_rate()
+    streaming = (time.perf_counter() - started) / len(samples)
+
+    # Recomputing reads the whole window of the (full) history on every check
+    timestamps, history_prices = history.timestamps(), history.prices()
+    last = samples[-1][0]
+    repeats = min(len(samples), 2000)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        realized_variance_rate(timestamps, history_prices, last - WINDOW)
+    recompute = (time.perf_counter() - started) / repeats
+    return {"samples": len(history), "streaming": streaming, "recompute": recompute,
+            "state_bytes": len(stats.to_bytes())}
+
+
+def replay(prices: list, check_seconds: float, dynamic: bool) -> dict:
+    stats = VolatilityStats(PERIOD, PERIODS)
+    rebalances, in_range, count, widths = 0, 0, 0, []
+    center = bounds = opened_at = None
+    for timestamp, price in checks(prices, check_seconds):
+        stats.update(timestamp, price)
+        count += 1
+        if bounds is not None:
+            inside = bounds[0] < price < bounds[1]
+            in_range += inside
+            threshold = stats.rebalance_threshold(MIN_PRICE_DEVIATION) if dynamic else 0.0
+            due = timestamp - opened_at > REBALANCE_INTERVAL and abs(math.log(price / center)) >= threshold
+            if inside and not due:
+                continue
+            rebalances += 1
+        width = stats.range_width(REBALANCE_INTERVAL, 2.0, 0.01, 0.10, FIXED_WIDTH) if dynamic else FIXED_WIDTH
+        widths.append(width)
+        center, bounds, opened_at = price, (price * (1 - width), price * (1 + width)), timestamp
+    return {"rebalances": rebalances, "in_range": in_range / count, "mean_width": sum(widths) / len(widths)}
+
+
+def main(hours: str = "72", check_seconds: str = "10", seed: str = "5") -> None:
+    prices = price_path(float(hours), int(seed))
+    check_seconds = float(check_seconds)
+    print(f"{hours}h of {BLOCK_TIME}s blocks checked every {check_seconds:g}s, regimes {REGIMES}")
+
+    cost = update_cost(prices, check_seconds)
+    print(f"per check: streaming update {cost['streaming'] * 1e6:.2f} us, recompute over "
+          f"{cost['samples']} samples {cost['recompute'] * 1e6:.1f} us "
+          f"({cost['recompute'] / cost['streaming']:.0f}x); persisted state {cost['state_bytes']} bytes")
+
+    for name, dynamic in (("fixed ±2%", False), ("dynamic", True)):
+        result = replay(prices, check_seconds, dynamic)
+        print(f"{name:10s} rebalances {result['rebalances']:4d}  in range {result['in_range']:6.1%}  "
+              f"mean width ±{result['mean_width']:.2%}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
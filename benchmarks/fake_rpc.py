@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from eth_abi import decode, encode
+
+from ..utils.chain_snapshot import (
+    MULTICALL3_ADDRESS,
+    POSITION_MANAGER_ADDRESS,
+    POSITIONS_TYPES,
+    SLOT0_TYPES,
+    selector,
+)
+
+
+class FakeChain:
+    """
+    Minimal in-memory chain answering the contract reads the strategy makes.
+
+    Supports Multicall3 (`aggregate3`, `getBlockNumber`, `getCurrentBlockTimestamp`),
+    pool `slot0`/`tickSpacing`, position manager `positions` and ERC20 `balanceOf`.
+    """
+
+    def __init__(
+        self,
+        pool_address: str,
+        sqrt_price_x96: int,
+        tick: int,
+        block_number: int = 1_000_000,
+        block_timestamp: int = 1_700_000_000,
+        tick_spacing: int = 10,
+    ):
+        self.pool_address = pool_address.lower()
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.tick_spacing = tick_spacing
+        self.block_number = block_number
+        self.block_timestamp = block_timestamp
+        self.positions: Dict[int, tuple] = {}
+        self.balances: Dict[Tuple[str, str], int] = {}
+
+    def set_balance(self, token: str, owner: str, amount: int) -> None:
+        self.balances[(token.lower(), owner.lower())] = amount
+
+    def mine(self, blocks: int = 1, seconds_per_block: int = 2) -> None:
+        self.block_number += blocks
+        self.block_timestamp += blocks * seconds_per_block
+
+    def call(self, to: str, data: bytes) -> bytes:
+        """Execute a read-only call and return the ABI-encoded result."""
+        to = to.lower()
+        sig, args = data[:4], data[4:]
+
+        if to == MULTICALL3_ADDRESS.lower():
+            if sig == selector("getBlockNumber()"):
+                return encode(["uint256"], [self.block_number])
+            if sig == selector("getCurrentBlockTimestamp()"):
+                return encode(["uint256"], [self.block_timestamp])
+            if sig == selector("aggregate3((address,bool,bytes)[])"):
+                (calls,) = decode(["(address,bool,bytes)[]"], args)
+                results = []
+                for target, allow_failure, calldata in calls:
+                    try:
+                        results.append((True, self.call(target, calldata)))
+                    except ValueError:
+                        if not allow_failure:
+                            raise
+                        results.append((False, b""))
+                return encode(["(bool,bytes)[]"], [results])
+        if to == self.pool_address and sig == selector("slot0()"):
+            return encode(SLOT0_TYPES, [self.sqrt_price_x96, self.tick, 0, 1, 1, 0, True])
+        if to == self.pool_address and sig == selector("tickSpacing()"):
+            return encode(["int24"], [self.tick_spacing])
+        if to == POSITION_MANAGER_ADDRESS.lower() and sig == selector("positions(uint256)"):
+            (position_id,) = decode(["uint256"], args)
+            if position_id not in self.positions:
+                raise ValueError("Invalid token ID")
+            return encode(POSITIONS_TYPES, list(self.positions[position_id]))
+        if sig == selector("balanceOf(address)"):
+            (owner,) = decode(["address"], args)
+            return encode(["uint256"], [self.balances.get((to, owner.lower()), 0)])
+        raise ValueError(f"Unsupported call to {to}: 0x{data[:4].hex()}")
+
+
+class FakeRpcServer:
+    """
+    Local JSON-RPC endpoint backed by a `FakeChain`, usable as a Web3 HTTPProvider target.
+
+    Counts HTTP round trips, calls per method and the peak number of concurrent
+    requests, and can inject a fixed latency per round trip to mimic a remote provider.
+    """
+
+    def __init__(self, chain: FakeChain, latency: float = 0.0, chain_id: int = 8453):
+        self.chain = chain
+        self.latency = latency
+        self.chain_id = chain_id
+        self.round_trips = 0
+        self.method_counts: Counter = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.round_trips = 0
+            self.method_counts.clear()
+            self.peak_in_flight = 0
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = request["method"], request.get("params", [])
+        with self._lock:
+            self.method_counts[method] += 1
+        try:
+            if method == "eth_chainId":
+                result = hex(self.chain_id)
+            elif method == "eth_blockNumber":
+                result = hex(self.chain.block_number)
+            elif method == "eth_call":
+                tx = params[0]
+                data = bytes.fromhex(tx.get("data", tx.get("input", "0x"))[2:])
+                result = "0x" + self.chain.call(tx["to"], data).hex()
+            else:
+                return {"jsonrpc": "2.0", "id": request.get("id"),
+                        "error": {"code": -32601, "message": f"Method {method} not found"}}
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": 3, "message": f"execution reverted: {e}"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def __enter__(self) -> "FakeRpcServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    fake.round_trips += 1
+                    fake.in_flight += 1
+                    fake.peak_in_flight = max(fake.peak_in_flight, fake.in_flight)
+                try:
+                    if fake.latency:
+                        time.sleep(fake.latency)
+                    if isinstance(body, list):
+                        response = [fake.handle(request) for request in body]
+                    else:
+                        response = fake.handle(body)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+                payload = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler, bind_and_activate=False)
+        self._server.request_queue_size = 256  # Many concurrent clients in the orchestrator bench
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,233 @@
+import random
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
+
+from ..utils.chain_snapshot import selector
+from ..utils.tick_math import (
+    align_down,
+    align_up,
+    amounts_for_liquidity,
+    liquidity_for_amounts,
+    price_to_tick,
+    sqrt_ratio_at_tick,
+    tick_to_price,
+)
+
+POOL = "0xf0e2c47d4c9fbb3be249a88a18f75b7c2914f70f"
+WETH = "0x4200000000000000000000000000000000000006"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+POSITION_NONCE = 0
+POSITION_OPERATOR = "0x0000000000000000000000000000000000000000"
+SWAP_FEE = 0.0005
+MAX_UINT128 = (1 << 128) - 1
+
+
+class FakeMarket:
+    """
+    Deterministic in-memory pool, wallet and position manager for one ETH/USDC pool.
+
+    The pool tick follows a seeded Gaussian random walk, one step per block, so a run
+    with the same seed sees the same prices. Positions are stored in the
+    `positions(tokenId)` tuple layout and hold real liquidity: opening deposits what
+    the range takes at the current price, closing returns what that liquidity is
+    worth at the then-current price. Balances belong to the single strategy wallet.
+
+    Bundles are applied with `execute`.
+    """
+
+    def __init__(
+        self,
+        price: float = 3000.0,
+        volatility_ticks: float = 8.0,
+        seed: int = 1,
+        tick_spacing: int = 10,
+        usdc_balance: int = 1_000_000_000,
+        block_number: int = 1_000_000,
+        block_timestamp: int = 1_700_000_000,
+        seconds_per_block: int = 2,
+    ):
+        self.tick = price_to_tick(price, 18, 6)
+        self.volatility_ticks = volatility_ticks
+        self.tick_spacing = tick_spacing
+        self.block_number = block_number
+        self.block_timestamp = block_timestamp
+        self.seconds_per_block = seconds_per_block
+        self.balances: Dict[str, int] = {WETH.lower(): 0, USDC.lower(): usdc_balance}
+        self.allowances: Dict[Tuple[str, str], int] = {}
+        self.positions: Dict[int, tuple] = {}
+        self.executed = Counter()
+        self.transactions = 0
+        self._next_position_id = 1
+        self._random = random.Random(seed)
+
+    @property
+    def spot_price(self) -> float:
+        return tick_to_price(self.tick, 18, 6)
+
+    @property
+    def sqrt_price_x96(self) -> int:
+        return sqrt_ratio_at_tick(self.tick)
+
+    def step(self) -> None:
+        """Mine one block, moving the pool tick one step along the random walk."""
+        self.block_number += 1
+        self.block_timestamp += self.seconds_per_block
+        self.tick += round(self._random.gauss(0.0, self.volatility_ticks))
+
+    def execute(self, bundle) -> Optional[int]:
+        """
+        Apply an action bundle's effects, as the executioner would once it is mined.
+
+        Returns:
+            Optional[int]: The id of the position opened by the bundle, if any.
+        """
+        opened = None
+        self.transactions += len(bundle.actions)
+        for action in bundle.actions:
+            kind = getattr(action.type, "name", str(action.type))
+            params = action.params
+            self.executed[kind] += 1
+            if kind == "APPROVE":
+                self.allowances[(params.token_address.lower(), params.spender_address.lower())] = params.amount
+            elif kind == "SWAP":
+                self._swap(params.tokenIn, params.tokenOut, params.amount)
+            elif kind == "OPEN_LP_POSITION":
+                opened = self._open(params.price_lower, params.price_upper,
+                                    params.amount0_desired, params.amount1_desired)
+            elif kind == "CLOSE_LP_POSITION":
+                self._close(params.position_id)
+        self.step()
+        return opened
+
+    def _swap(self, token_in: str, token_out: str, amount_in: int) -> None:
+        price = self.spot_price
+        if token_in.lower() == USDC.lower():
+            amount_out = int(amount_in / 1e6 / price * (1 - SWAP_FEE) * 1e18)
+        else:
+            amount_out = int(amount_in / 1e18 * price * (1 - SWAP_FEE) * 1e6)
+        self.balances[token_in.lower()] -= amount_in
+        self.balances[token_out.lower()] += amount_out
+
+    def _open(self, price_lower: float, price_upper: float, amount0: int, amount1: int) -> int:
+        tick_lower = align_down(price_to_tick(float(price_lower), 18, 6), self.tick_spacing)
+        tick_upper = align_up(price_to_tick(float(price_upper), 18, 6), self.tick_spacing)
+        position_id, _, _, _ = self._mint(tick_lower, tick_upper, amount0, amount1)
+        return position_id
+
+    def _close(self, position_id: int) -> None:
+        position = self.positions.get(position_id)
+        if position is None:
+            return
+        self._decrease(position_id, position[7])
+        self._collect(position_id)
+        del self.positions[position_id]
+
+    def _mint(self, tick_lower: int, tick_upper: int, amount0: int, amount1: int) -> Tuple[int, int, int, int]:
+        liquidity = liquidity_for_amounts(self.sqrt_price_x96, tick_lower, tick_upper, amount0, amount1)
+        used0, used1 = amounts_for_liquidity(self.sqrt_price_x96, tick_lower, tick_upper, liquidity)
+        if used0 > self.balances[WETH.lower()] or used1 > self.balances[USDC.lower()]:
+            raise ValueError("STF: wallet balance too low for mint")
+        self.balances[WETH.lower()] -= used0
+        self.balances[USDC.lower()] -= used1
+        position_id = self._next_position_id
+        self._next_position_id += 1
+        self.positions[position_id] = (
+            POSITION_NONCE, POSITION_OPERATOR, WETH, USDC, 500,
+            tick_lower, tick_upper, liquidity, 0, 0, 0, 0,
+        )
+        return position_id, liquidity, used0, used1
+
+    def _decrease(self, position_id: int, liquidity: int) -> Tuple[int, int]:
+        position = list(self.positions[position_id])
+        amounts = amounts_for_liquidity(self.sqrt_price_x96, position[5], position[6], liquidity)
+        position[7] -= liquidity
+        position[10] += amounts[0]
+        position[11] += amounts[1]
+        self.positions[position_id] = tuple(position)
+        return amounts
+
+    def _collect(self, position_id: int, max0: int = MAX_UINT128, max1: int = MAX_UINT128) -> Tuple[int, int]:
+        position = list(self.positions[position_id])
+        amount0, amount1 = min(position[10], max0), min(position[11], max1)
+        position[10] -= amount0
+        position[11] -= amount1
+        self.positions[position_id] = tuple(position)
+        self.balances[WETH.lower()] += amount0
+        self.balances[USDC.lower()] += amount1
+        return amount0, amount1
+
+
+class FakeUniswapV3:
+    """
+    Stand-in for the `uniswap_v3` protocol SDK surface the strategy reads through.
+
+    Every call sleeps `latency` seconds (a node round trip) and is counted per method.
+    `get_pool_spot_rate` observes the next block of the market, so each price read of
+    a monitoring tick sees the pool move.
+    """
+
+    def __init__(self, market: FakeMarket, latency: float = 0.0):
+        self.market = market
+        self.latency = latency
+        self.calls = Counter()
+
+    def _call(self, method: str) -> None:
+        self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_pool_spot_rate(self, pool_address: str) -> float:
+        self._call("get_pool_spot_rate")
+        self.market.step()
+        return self.market.spot_price
+
+    def get_position_info(self, position_id: int) -> tuple:
+        self._call("get_position_info")
+        return self.market.positions[position_id]
+
+    def get_token_balance(self, token_address: str, wallet_address: str) -> int:
+        self._call("get_token_balance")
+        return self.market.balances[token_address.lower()]
+
+    def tick_to_price(self, tick: int, decimals0: int = 18, decimals1: int = 6) -> float:
+        self._call("tick_to_price")
+        return tick_to_price(tick, decimals0, decimals1)
+
+
+class _FakeEth:
+    def __init__(self, market: FakeMarket, calls: Counter, latency: float):
+        self._market = market
+        self._calls = calls
+        self._latency = latency
+
+    def _rpc(self, method: str) -> None:
+        self._calls[method] += 1
+        if self._latency:
+            time.sleep(self._latency)
+
+    @property
+    def block_number(self) -> int:
+        self._rpc("eth_blockNumber")
+        return self._market.block_number
+
+    def call(self, transaction: Dict, block_identifier="latest") -> bytes:
+        """ERC20 `allowance(owner, spender)` reads; the market has a single wallet."""
+        self._rpc("eth_call")
+        data = bytes.fromhex(transaction["data"][2:])
+        if data[:4] != selector("allowance(address,address)"):
+            raise ValueError("Only allowance() eth_calls are supported")
+        _, spender = decode(["address", "address"], data[4:])
+        key = (to_checksum_address(transaction["to"]).lower(), spender.lower())
+        return encode(["uint256"], [self._market.allowances.get(key, 0)])
+
+
+class FakeWeb3:
+    """The `web3.eth.block_number` read the strategy's block cache makes, counted like SDK calls."""
+
+    def __init__(self, market: FakeMarket, calls: Counter, latency: float = 0.0):
+        self.eth = _FakeEth(market, calls, latency)
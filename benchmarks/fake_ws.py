@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from eth_abi import encode
+
+from ..utils.event_monitor import SWAP_TOPIC
+
+HEADS_SUBSCRIPTION = "0x1"
+LOGS_SUBSCRIPTION = "0x2"
+
+
+def head_event(number: int, timestamp: int) -> Dict[str, Any]:
+    return {"kind": "newHeads", "result": {"number": hex(number), "timestamp": hex(timestamp)}}
+
+
+def swap_event(pool_address: str, block_number: int, tick: int, sqrt_price_x96: int = 0) -> Dict[str, Any]:
+    data = encode(["int256", "int256", "uint160", "uint128", "int24"], [0, 0, sqrt_price_x96, 0, tick])
+    return {
+        "kind": "logs",
+        "result": {
+            "address": pool_address,
+            "topics": [SWAP_TOPIC],
+            "data": "0x" + data.hex(),
+            "blockNumber": hex(block_number),
+            "removed": False,
+        },
+    }
+
+
+class ReplayWebsocketServer:
+    """
+    Local websocket stand-in for a node's eth_subscribe endpoint.
+
+    Accepts `newHeads` and `logs` subscriptions and replays recorded events (see
+    `head_event` / `swap_event`, or JSON lines in the same shape) with a fixed delay
+    between them. The send time of every event is kept to measure detection latency.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], delay: float = 0.0):
+        self.events = events
+        self.delay = delay
+        self.sent_at: List[float] = []
+        self.rpc_requests = 0
+        self.done = asyncio.Event()
+        self._server = None
+
+    @classmethod
+    def from_file(cls, path: str, delay: float = 0.0) -> "ReplayWebsocketServer":
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()], delay)
+
+    @property
+    def url(self) -> str:
+        host, port = list(self._server.sockets)[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    async def _handle(self, ws, *args) -> None:
+        subscriptions = {"newHeads": HEADS_SUBSCRIPTION, "logs": LOGS_SUBSCRIPTION}
+        for _ in range(2):
+            request = json.loads(await ws.recv())
+            self.rpc_requests += 1
+            kind = request["params"][0]
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscriptions[kind]}))
+
+        for event in self.events:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            self.sent_at.append(time.monotonic())
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {"subscription": subscriptions[event["kind"]], "result": event["result"]},
+            }))
+        self.done.set()
+        await ws.wait_closed()
+
+    async def __aenter__(self) -> "ReplayWebsocketServer":
+        import websockets
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
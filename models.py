@@ -1,13 +1,20 @@
+import copy
+import json
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
-from pydantic import BaseModel, validator
-from web3 import Web3
+from pydantic import BaseModel, Field, PrivateAttr, validator
+from eth_utils import is_address
 from src.almanak_library.enums import Chain, Network, Protocol
 from src.strategy.models import PersistentStateBase, StrategyConfigBase, InternalFlowStatus
 
+from .utils.history import PriceHistory, RebalanceHistory
+from .utils.state_codec import StateSchema, to_jsonable
+from .utils.state_schema import PERSISTENT_STATE_SCHEMA
+from .utils.volatility import VolatilityStats
+
 
 class State(Enum):
     """Enum representing the state of the strategy."""
@@ -37,7 +44,7 @@ class InitializationConfig(BaseModel):
 
     @validator("initial_token")
     def validate_ethereum_address(cls, v):
-        if not Web3.is_address(v):
+        if not is_address(v):
             raise ValueError("Invalid Ethereum address")
         return v
 
@@ -51,12 +58,26 @@ class PersistentState(PersistentStateBase):
     sadflow_actions: List[UUID] = []
     not_included_counter: int = 0
     position_id: int = -1
+    eth_usdc_position_id: Optional[int] = None
     retry_count: int = 0
-    rebalance_history: List[Dict] = []
+    rebalance_history: RebalanceHistory = Field(default_factory=RebalanceHistory)
     last_check_time: Optional[datetime] = None
     last_rebalance_time: Optional[datetime] = None
+    last_rebalance_timestamp: Optional[float] = None
     last_eth_price: Optional[float] = None
-    price_history: List[Dict] = []
+    position_tick_lower: Optional[int] = None
+    position_tick_upper: Optional[int] = None
+    tick_spacing: Optional[int] = None
+    allowances: Dict[str, int] = {}
+    price_history: PriceHistory = Field(default_factory=PriceHistory)
+    volatility: VolatilityStats = Field(default_factory=VolatilityStats)
+
+    HISTORY_FIELDS: ClassVar[Tuple[str, ...]] = ("price_history", "rebalance_history", "volatility")
+    SCHEMA: ClassVar[StateSchema] = PERSISTENT_STATE_SCHEMA
+
+    # Dirty-field tracking for incremental (journaled) saves
+    _dirty_fields: Set[str] = PrivateAttr(default_factory=set)
+    _persisted: Dict[str, str] = PrivateAttr(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
@@ -65,6 +86,104 @@ class PersistentState(PersistentStateBase):
             datetime: lambda v: v.isoformat(),
         }
 
+    @validator("price_history", pre=True)
+    def decode_price_history(cls, v):
+        return PriceHistory.decode(v)
+
+    @validator("rebalance_history", pre=True)
+    def decode_rebalance_history(cls, v):
+        return RebalanceHistory.decode(v)
+
+    @validator("volatility", pre=True)
+    def decode_volatility(cls, v):
+        return VolatilityStats.decode(v)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._dirty_fields.add(name)
+
+    def state_values(self) -> Dict[str, Any]:
+        """Field values as held by the model (enums, datetimes, histories), for a state codec."""
+        values = {name: getattr(self, name) for name in type(self).model_fields}
+        values.update(self.__pydantic_extra__ or {})
+        return values
+
+    def frozen_values(self) -> Dict[str, Any]:
+        """`state_values()` detached from the live model (histories and containers copied), for a background write."""
+        values = self.state_values()
+        for name, value in values.items():
+            if name in self.HISTORY_FIELDS:
+                values[name] = type(value).from_bytes(value.to_bytes())
+            elif isinstance(value, (list, dict)):
+                values[name] = copy.deepcopy(value)
+        return values
+
+    def journal_delta(self) -> Tuple[Dict[str, Any], Dict[str, List[list]]]:
+        """
+        Changes since the last `mark_persisted()`, for an incremental save.
+
+        Assigned fields are tracked in `__setattr__`. Containers can be mutated in place,
+        so they are compared against their last persisted value instead. History buffers
+        report the rows appended to them.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, List[list]]]: JSON-ready values of changed fields,
+                and rows appended per history field.
+        """
+        sets, appends = {}, {}
+        names = list(type(self).model_fields) + list(self.__pydantic_extra__ or {})
+        for name in names:
+            if name in self.HISTORY_FIELDS:
+                continue
+            value = getattr(self, name)
+            if name in self._dirty_fields or isinstance(value, (list, dict)):
+                encoded = to_jsonable(value)
+                if self._persisted.get(name) != json.dumps(encoded, sort_keys=True, default=str):
+                    sets[name] = encoded
+        for name in self.HISTORY_FIELDS:
+            history = getattr(self, name)
+            rows = history.drain_changes()
+            if rows is None or name in self._dirty_fields:
+                sets[name] = history.encode()
+            elif rows:
+                appends[name] = [list(row) for row in rows]
+        return sets, appends
+
+    def mark_persisted(self, values: Dict[str, Any]) -> None:
+        """Record `values` as the persisted state of their fields and clear the dirty set."""
+        for name, value in values.items():
+            if name in self.HISTORY_FIELDS:
+                getattr(self, name).drain_changes()
+            else:
+                self._persisted[name] = json.dumps(to_jsonable(value), sort_keys=True, default=str)
+        self._dirty_fields.clear()
+
+    def replay_journal(self, values: Dict[str, Any], appends: Dict[str, List[list]]) -> None:
+        """Apply history rows recorded after the snapshot and mark the result as persisted."""
+        for name, rows in appends.items():
+            getattr(self, name).replay(rows)
+        self.mark_persisted(values)
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact view of the state for logging (history sizes instead of their contents)."""
+        return {
+            "current_state": self.current_state.value,
+            "current_substate": self.current_substate.value,
+            "current_flowstatus": self.current_flowstatus.value,
+            "current_actions": [str(action) for action in self.current_actions],
+            "position_id": self.position_id,
+            "position_ticks": [self.position_tick_lower, self.position_tick_upper],
+            "last_eth_price": self.last_eth_price,
+            "last_check_time": self.last_check_time.isoformat() if self.last_check_time else None,
+            "last_rebalance_time": self.last_rebalance_time.isoformat() if self.last_rebalance_time else None,
+            "sadflow_counter": self.sadflow_counter,
+            "not_included_counter": self.not_included_counter,
+            "price_history_len": len(self.price_history),
+            "rebalance_history_len": len(self.rebalance_history),
+            "volatility_returns": len(self.volatility),
+        }
+
     def model_dump(self, **kwargs):
         data = super().model_dump(**kwargs)
         data["current_state"] = self.current_state.value
@@ -76,6 +195,9 @@ class PersistentState(PersistentStateBase):
             data["last_rebalance_time"] = self.last_rebalance_time.isoformat()
         if self.last_check_time:
             data["last_check_time"] = self.last_check_time.isoformat()
+        data["price_history"] = self.price_history.encode()
+        data["rebalance_history"] = self.rebalance_history.encode()
+        data["volatility"] = self.volatility.encode()
         return data
 
 
@@ -93,13 +215,49 @@ class StrategyConfig(StrategyConfigBase):
     pause_strategy: bool = False
     pool_address: str
     rebalance_interval: int = 3600
+    rebalance_prebuild_distance: float = 0.2
+    rebalance_prebuild_tolerance: float = 0.1
+    unlimited_approvals: bool = False
     granularity: str = "15m"
     time_window: int = 96
+    range_width: float = 0.02
+    dynamic_range: bool = False
+    range_width_sigmas: float = 2.0
+    range_width_min: float = 0.01
+    range_width_max: float = 0.10
+    rebalance_triggers: Optional[List[Dict[str, Any]]] = None
+    price_store_dir: Optional[str] = None
+    price_source_path: Optional[str] = None
+    monitor_min_interval: float = 2.0
+    monitor_max_interval: float = 300.0
+    monitor_deadline: float = 60.0
+    use_multicall: bool = True
+    pool_sim_word_radius: int = 2
+    use_rpc_transport: bool = False
+    rpc_pool_size: int = 16
+    rpc_max_batch: int = 100
+    block_time: float = 2.0
+    price_history_cap: int = 2880
+    price_rollup_interval: int = 3600
+    price_rollup_cap: int = 2160
+    rebalance_history_cap: int = 1000
+    state_journal_dir: Optional[str] = None
+    state_journal_compact_every: int = 500
+    state_write_behind: bool = False
+    ws_url: Optional[str] = None
+    log_level: str = "INFO"
+    log_path: Optional[str] = None
+    log_queue_size: int = 10000
+    log_overflow: str = "drop_new"
+    state_codec: str = "binary"
+    metrics_port: Optional[int] = None
+    metrics_json_path: Optional[str] = None
+    metrics_flush_interval: float = 15.0
     initialization: InitializationConfig
 
     @validator("pool_address")
     def validate_ethereum_address(cls, v):
-        if not Web3.is_address(v):
+        if not is_address(v):
             raise ValueError("Invalid Ethereum address")
         return v
 
@@ -0,0 +1,209 @@
+"""
+Hosts many strategy instances in one process and one asyncio event loop.
+
+Their `run()` ticks are staggered across the polling interval, and every ActionBundle
+they return is handed to an executor (`--executor module:function`, an async callable
+taking the instance name and the bundle). With `--shared-providers`, instances on the
+same network and chain share one Web3 provider and one protocol SDK (`ProviderRegistry`)
+and all their JSON-RPC traffic goes through one coalescing, batching `RpcTransport` per
+chain, capped by one `RpcBudget`: much less memory and load on the node, at the cost of
+slower rounds when the budget is the bottleneck (see `benchmarks/bench_orchestrator.py`).
+
+Run from the directory containing the strategy package:
+    python -m <strategy_dir>.orchestrator presets/default/config.json [more presets...] \\
+        --executor my_module:execute_bundle --interval 60 --max-concurrent-runs 8
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .utils.providers import ProviderRegistry, RpcBudget
+
+
+class StrategyOrchestrator:
+    """
+    Runs the `run()` tick of N strategy instances on one event loop.
+
+    `run()` is synchronous (SDK and Web3 calls block), so ticks execute on a thread pool
+    of `max_concurrent_runs` workers; that bounds the threads, and the memory they hold,
+    however many instances are hosted. Instance i first ticks at i / N of the interval,
+    which spreads the load evenly instead of firing every instance at once. An instance
+    monitoring the price checks once per tick and is next ticked at the time it
+    suggests (`next_check_at`), so quiet markets cost fewer runs than the interval.
+
+    A strategy's state machine moves on as soon as `run()` returns a bundle, so every
+    bundle must be executed: `on_actions` is required, and an instance whose bundle it
+    fails to take is no longer ticked (its state assumes actions that never ran).
+
+    Args:
+        strategies: Strategy instances by name.
+        on_actions: Executes a bundle, called with (name, actions) whenever `run()` returns one.
+        interval: Seconds between two ticks of the same instance.
+        max_concurrent_runs: Number of `run()` calls allowed to execute at once.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, Any],
+        on_actions: Callable[[str, Any], Awaitable[None]],
+        interval: float = 60.0,
+        max_concurrent_runs: int = 8,
+    ):
+        if on_actions is None:
+            raise ValueError("StrategyOrchestrator needs on_actions to execute the ActionBundles run() returns")
+        self.strategies = strategies
+        self.on_actions = on_actions
+        self.interval = interval
+        self.max_concurrent_runs = max_concurrent_runs
+        for strategy in strategies.values():
+            if hasattr(strategy, "monitor_deadline"):
+                strategy.monitor_deadline = 0  # Ticks are scheduled here, not slept through in run()
+        self.stats: Dict[str, Dict[str, Any]] = {
+            name: {"runs": 0, "errors": 0, "actions": 0, "last_duration": None, "stopped": False}
+            for name in strategies
+        }
+
+    @classmethod
+    def from_presets(
+        cls,
+        paths: List[str],
+        on_actions: Callable[[str, Any], Awaitable[None]],
+        providers: Optional[ProviderRegistry] = None,
+        **kwargs,
+    ) -> "StrategyOrchestrator":
+        """
+        Build one strategy instance per entry of `strategy_configs` in each preset file.
+
+        Args:
+            paths: Preset `config.json` files.
+            on_actions: Executes the instances' bundles (see the class).
+            providers: Registry to share providers through; without one, each instance
+                builds its own.
+            **kwargs: Passed on to the orchestrator.
+        """
+        from .strategy import MyStrategy
+
+        strategies = {}
+        for path in paths:
+            with open(path) as f:
+                preset = json.load(f)
+            for key, entry in preset["strategy_configs"].items():
+                strategies[f"{path}:{key}"] = MyStrategy(providers=providers, **entry["parameters"])
+        return cls(strategies, on_actions, **kwargs)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Tick every instance on its staggered schedule until `stop` is set."""
+        stop = stop or asyncio.Event()
+        count = max(len(self.strategies), 1)
+        with ThreadPoolExecutor(self.max_concurrent_runs, thread_name_prefix="strategy") as executor:
+            await asyncio.gather(*(
+                self._loop(name, strategy, self.interval * i / count, executor, stop)
+                for i, (name, strategy) in enumerate(self.strategies.items())
+            ))
+
+    async def tick_all(self) -> None:
+        """Run one tick of every instance (no staggering), e.g. to measure a full round."""
+        with ThreadPoolExecutor(self.max_concurrent_runs, thread_name_prefix="strategy") as executor:
+            await asyncio.gather(*(
+                self._tick(name, strategy, executor) for name, strategy in self.strategies.items()
+            ))
+
+    async def _loop(self, name: str, strategy, offset: float, executor, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + offset
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(next_tick - loop.time(), 0))
+                break
+            except asyncio.TimeoutError:
+                pass
+            if not await self._tick(name, strategy, executor):
+                break
+            # Keep the cadence, but don't queue up missed ticks after a slow run.
+            next_tick = max(next_tick + self.interval, loop.time())
+            next_check_at = getattr(strategy, "next_check_at", None)
+            if next_check_at is not None:
+                next_tick = loop.time() + max(next_check_at - time.time(), 0)
+
+    async def _tick(self, name: str, strategy, executor) -> bool:
+        """Run one tick; False once the instance is stopped because its bundle was not executed."""
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            actions = await asyncio.get_running_loop().run_in_executor(executor, strategy.run)
+        except Exception as e:
+            stats["errors"] += 1
+            strategy.log.error("run() failed", instance=name, error=repr(e))
+            return True
+        finally:
+            stats["runs"] += 1
+            stats["last_duration"] = time.perf_counter() - started
+        if actions is not None:
+            stats["actions"] += 1
+            try:
+                await self.on_actions(name, actions)
+            except Exception as e:
+                stats["errors"] += 1
+                stats["stopped"] = True
+                strategy.log.error("Executing actions failed; instance stopped", instance=name, error=repr(e))
+                return False
+        return True
+
+
+def load_executor(path: str) -> Callable[[str, Any], Awaitable[None]]:
+    """The callable at "module:function" (e.g. a wrapper around the framework's executioner)."""
+    module, _, function = path.partition(":")
+    if not module or not function:
+        raise ValueError(f"--executor must be 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module), function)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("presets", nargs="+", help="Preset config.json files")
+    parser.add_argument("--executor", required=True,
+                        help="module:function executing each returned ActionBundle, called as await f(name, actions)")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between ticks of one instance")
+    parser.add_argument("--max-concurrent-runs", type=int, default=8)
+    parser.add_argument("--shared-providers", action="store_true",
+                        help="Share Web3 providers and SDKs between instances on the same chain")
+    parser.add_argument("--rpc-concurrency", type=int, default=16,
+                        help="Max in-flight JSON-RPC requests (with --shared-providers)")
+    parser.add_argument("--rpc-pool-size", type=int, default=16, help="Keep-alive connections per chain")
+    parser.add_argument("--rpc-max-batch", type=int, default=100, help="Most requests per JSON-RPC batch")
+    args = parser.parse_args()
+
+    on_actions = load_executor(args.executor)
+    providers = None
+    if args.shared_providers:
+        from src.utils.utils import get_protocol_sdk, get_web3_by_network_and_chain
+
+        providers = ProviderRegistry(
+            get_web3_by_network_and_chain,
+            get_protocol_sdk,
+            rpc_budget=RpcBudget(args.rpc_concurrency),
+            transport_options={"pool_size": args.rpc_pool_size, "max_batch": args.rpc_max_batch},
+        )
+    orchestrator = StrategyOrchestrator.from_presets(
+        args.presets,
+        on_actions,
+        providers=providers,
+        interval=args.interval,
+        max_concurrent_runs=args.max_concurrent_runs,
+    )
+    def provider_stats():
+        return providers.stats if providers is not None else "per instance"
+
+    print(f"Hosting {len(orchestrator.strategies)} strategies, providers: {provider_stats()}")
+    try:
+        asyncio.run(orchestrator.run())
+    except KeyboardInterrupt:
+        print(f"Stopped. Providers: {provider_stats()}, strategies: {orchestrator.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from time import sleep
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.almanak_library.enums import ActionType, Protocol
 from src.almanak_library.models.action import Action
@@ -10,19 +10,19 @@ if TYPE_CHECKING:
     from ..strategy import StrategyUniV3SingleSidedETH
 
 
-def initialization(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
+def initialization(strategy: "StrategyUniV3SingleSidedETH") -> Optional[ActionBundle]:
     """
     Initializes the strategy by checking USDC balance and setting up approvals.
     
     Steps:
     1. Checks USDC balance
-    2. Approves USDC spending for Uniswap V3 Router
+    2. Approves USDC spending for Uniswap V3 Router, unless the allowance already covers it
     3. Sets up initial state variables
     
     Returns:
-        ActionBundle: Approval actions for USDC
+        Optional[ActionBundle]: Approval actions for USDC (None when no approval is needed)
     """
-    print("Initializing Single Sided ETH-USDC UniV3 Strategy")
+    strategy.log.info("Initializing Single Sided ETH-USDC UniV3 Strategy")
     
     # Constants
     USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
@@ -30,7 +30,7 @@ def initialization(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     
     # Check USDC balance
     usdc_balance = strategy.get_token_balance(USDC_ADDRESS)
-    print(f"Initial USDC balance: {usdc_balance}")
+    strategy.log.info("Initial USDC balance", usdc_balance=usdc_balance)
     
     if usdc_balance <= 0:
         raise ValueError("No USDC balance available for strategy initialization")
@@ -39,14 +39,22 @@ def initialization(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     strategy.persistent_state.last_eth_price = None
     strategy.persistent_state.last_rebalance_timestamp = None
     strategy.persistent_state.eth_usdc_position_id = None
-    strategy.persistent_state.price_history = []
+    strategy.persistent_state.position_tick_lower = None
+    strategy.persistent_state.position_tick_upper = None
+    strategy.persistent_state.price_history.clear()
+    
+    # Skip the approval when the (cached) allowance already covers the swap
+    if not strategy.allowances.required(USDC_ADDRESS, UNIV3_ROUTER, usdc_balance):
+        strategy.log.info("USDC allowance sufficient, no approval needed", spender=UNIV3_ROUTER)
+        return None
+    strategy.allowances.approving(USDC_ADDRESS, UNIV3_ROUTER)
     
     # Create approval action for USDC
     approve_params = ApproveParams(
         token_address=USDC_ADDRESS,
         spender_address=UNIV3_ROUTER,
         from_address=strategy.wallet_address,
-        amount=usdc_balance
+        amount=strategy.approval_amount(usdc_balance)
     )
     
     approve_action = Action(
@@ -1,81 +1,101 @@
-from datetime import datetime
-import pytz
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Dict, Any, List
 from time import time
 from src.almanak_library.enums import ExecutionStatus, ActionType
 
+from ..utils.triggers import Observation
+
 if TYPE_CHECKING:
     from ..strategy import StrategyUniV3SingleSidedETH
 
 def monitor_price(strategy: "StrategyUniV3SingleSidedETH") -> bool:
     """
-    Enhanced price monitoring with position-aware bounds and time-based checks.
+    Enhanced price monitoring: records the price, then evaluates the rebalance triggers
+    (`strategy.trigger_engine`) against this cycle's snapshot. Returns True when one fired.
     """
-    print("Monitoring ETH price and position")
+    strategy.log.debug("Monitoring ETH price and position")
     
-    # Get current state
-    current_time = datetime.now(pytz.utc)
-    spot_price = strategy.uniswap_v3.get_pool_spot_rate(strategy.pool_address)
+    # Get current state (price, position and balances in one block-pinned read)
+    current_time = datetime.now(timezone.utc)
+    snapshot = strategy.get_snapshot()
+    spot_price = snapshot.spot_price
+    strategy.persistent_state.price_history.append(int(current_time.timestamp()), spot_price)
+    strategy.persistent_state.volatility.update(int(current_time.timestamp()), spot_price)
     
-    # Get position info if active
-    if strategy.persistent_state.position_id != -1:
-        pos_info = strategy.get_active_position_info(strategy.persistent_state.position_id)
-        pos_lower = strategy.uniswap_v3.tick_to_price(pos_info[5])
-        pos_upper = strategy.uniswap_v3.tick_to_price(pos_info[6])
+    # Check the pool's tick against the position's tick range (integer comparison)
+    tick_table = strategy.get_tick_table(snapshot)
+    current_tick = snapshot.tick
+    in_range = None
+    if tick_table is not None:
+        if current_tick is None:
+            current_tick = tick_table.tick_at(spot_price)
+        in_range = tick_table.contains(current_tick)
         
-        # Check if price is outside position bounds
-        if spot_price < pos_lower or spot_price > pos_upper:
-            log_rebalance_metrics(strategy, {
-                'trigger': 'position_bounds',
-                'current_price': spot_price,
-                'lower_bound': pos_lower,
-                'upper_bound': pos_upper
-            })
-            return True
+        # Near a bound: keep a rebalance bundle ready for when the price leaves the range
+        if in_range and tick_table.near_bound(current_tick, strategy.config.rebalance_prebuild_distance):
+            strategy.prepare_rebalance(snapshot)
+        elif in_range:
+            strategy.rebalance_candidate = None
     
-    # Time-based check
-    if strategy.persistent_state.last_rebalance_time:
-        time_passed = current_time - strategy.persistent_state.last_rebalance_time
-        if time_passed.total_seconds() > strategy.REBALANCE_INTERVAL:
-            log_rebalance_metrics(strategy, {
-                'trigger': 'time_interval',
-                'time_passed': time_passed,
-                'interval': strategy.REBALANCE_INTERVAL
+    # Every trigger rule (bounds, deviation, interval) in one pass over this snapshot
+    observation = Observation(
+        price=spot_price,
+        timestamp=current_time.timestamp(),
+        in_range=in_range,
+        reference_price=strategy.persistent_state.last_eth_price or (tick_table.center() if tick_table else None),
+        opened_at=strategy.last_rebalance_at(),
+        volatility_threshold=strategy.rebalance_threshold(),
+    )
+    fired = strategy.trigger_engine.evaluate(observation)
+    if fired:
+        details = {
+            'trigger': fired[0],
+            'rules_fired': fired,
+            'current_price': spot_price,
+            'reference_price': observation.reference_price,
+            'deviation': observation.deviation,
+        }
+        if tick_table is not None:
+            pos_lower, pos_upper = tick_table.bounds()
+            details.update({
+                'lower_bound': pos_lower,
+                'upper_bound': pos_upper,
+                'current_tick': current_tick,
+                'tick_lower': tick_table.tick_lower,
+                'tick_upper': tick_table.tick_upper
             })
-            return True
+        if observation.elapsed is not None:
+            details['time_passed'] = timedelta(seconds=observation.elapsed)
+        log_rebalance_metrics(strategy, details)
+        return True
     
     # Store state for next check
-    strategy.persistent_state.last_eth_price = spot_price
     strategy.persistent_state.last_check_time = current_time
     
-    print(f"No rebalancing needed. Price: {spot_price}")
+    strategy.log.info("No rebalancing needed", price=spot_price, tick=snapshot.tick)
     return False
 
 def log_rebalance_metrics(strategy: "StrategyUniV3SingleSidedETH", details: Dict[str, Any]) -> None:
     """
     Logs detailed metrics about rebalancing triggers and conditions.
     """
-    print("\n=== Rebalance Triggered ===")
-    print(f"Trigger: {details['trigger']}")
-    
-    if 'current_price' in details:
-        print(f"Current Price: {details['current_price']}")
-        print(f"Position Bounds: {details['lower_bound']} - {details['upper_bound']}")
-    
-    if 'time_passed' in details:
-        print(f"Time Since Last Rebalance: {details['time_passed']}")
-        print(f"Rebalance Interval: {details['interval']} seconds")
-    
-    print(f"Wallet Balance ETH: {strategy.get_eth_balance()}")
-    print(f"Wallet Balance USDC: {strategy.get_usdc_balance()}")
-    print("==========================\n")
-    
-    # Store metrics in persistent state for analysis
-    if not hasattr(strategy.persistent_state, 'rebalance_history'):
-        strategy.persistent_state.rebalance_history = []
+    strategy.metrics.inc("rebalance_triggers_total", trigger=details['trigger'])
+    snapshot = strategy.get_snapshot()
+    fields = {
+        key: value.total_seconds() if key == 'time_passed' else value
+        for key, value in details.items() if key != 'trigger'
+    }
+    strategy.log.info(
+        "Rebalance triggered",
+        trigger=details['trigger'],
+        wallet_balance_eth=snapshot.balance_of(strategy.ETH_ADDRESS),
+        wallet_balance_usdc=snapshot.balance_of(strategy.USDC_ADDRESS),
+        **fields
+    )
     
-    strategy.persistent_state.rebalance_history.append({
-        'timestamp': datetime.now(pytz.utc),
-        'trigger': details['trigger'],
-        'details': details
-    })
+    # Store metrics in persistent state for analysis (bounded, columnar)
+    strategy.persistent_state.rebalance_history.append(
+        int(datetime.now(timezone.utc).timestamp()),
+        details['trigger'],
+        details
+    )
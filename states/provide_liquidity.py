@@ -1,50 +1,56 @@
 from time import sleep
 from typing import TYPE_CHECKING
-from decimal import Decimal
 
 from src.almanak_library.models.action_bundle import ActionBundle
 from src.almanak_library.models.action import Action
 from src.almanak_library.models.params import OpenPositionParams
 from src.almanak_library.enums import ActionType, Protocol
 
+from ..utils.tick_math import tick_to_price
+
 if TYPE_CHECKING:
     from ..strategy import StrategyUniV3SingleSidedETH
 
 def provide_liquidity(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     """
-    Provides liquidity to Uniswap V3 ETH-USDC pool with ±2% price range.
+    Provides liquidity to Uniswap V3 ETH-USDC pool with a ±range_width price range (±2% by default).
     
     Steps:
     1. Gets current ETH and USDC balances
     2. Gets current ETH price
-    3. Calculates price range (±2% from current price)
+    3. Calculates price range (±range_width from current price)
     4. Creates add liquidity action
     
     Returns:
         ActionBundle: Add liquidity action for Uniswap V3
     """
-    print("Providing liquidity to Uniswap V3 ETH-USDC pool")
+    strategy.log.info("Providing liquidity to Uniswap V3 ETH-USDC pool")
     
     # Constants
-    USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-    ETH_ADDRESS = "0x4200000000000000000000000000000006"
-    PRICE_RANGE_MULTIPLIER = Decimal('0.02')  # 2% range
+    ETH_ADDRESS, USDC_ADDRESS = strategy.ETH_ADDRESS, strategy.USDC_ADDRESS
+    
+    # Get current ETH price and balances from the cycle's chain snapshot
+    snapshot = strategy.get_snapshot()
+    eth_balance = snapshot.balance_of(strategy.ETH_ADDRESS)
+    usdc_balance = snapshot.balance_of(strategy.USDC_ADDRESS)
     
-    # Get current ETH price and balances
-    current_price = strategy.get_current_eth_price()
-    eth_balance = strategy.get_token_balance(ETH_ADDRESS)
-    usdc_balance = strategy.get_token_balance(USDC_ADDRESS)
+    # Calculate price range (±range_width) as usable ticks around the pool's current tick
+    tick_lower, tick_upper = strategy.new_position_ticks(snapshot, strategy.range_width())
+    strategy.record_rebalance(snapshot.spot_price)
+    lower_price = tick_to_price(tick_lower, strategy.ETH_DECIMALS, strategy.USDC_DECIMALS)
+    upper_price = tick_to_price(tick_upper, strategy.ETH_DECIMALS, strategy.USDC_DECIMALS)
     
-    # Calculate price range (±2%)
-    lower_price = current_price * (Decimal('1') - PRICE_RANGE_MULTIPLIER)
-    upper_price = current_price * (Decimal('1') + PRICE_RANGE_MULTIPLIER)
+    simulator = strategy.get_pool_simulator(snapshot)
+    if simulator is not None:
+        liquidity, used_eth, used_usdc = simulator.mint_quote(tick_lower, tick_upper, eth_balance, usdc_balance)
+        strategy.log.info("Mint quote", liquidity=liquidity, used_eth=used_eth, used_usdc=used_usdc)
     
     open_position_params = OpenPositionParams(
         token0=ETH_ADDRESS,
         token1=USDC_ADDRESS,
         fee=500,  # 0.05% fee tier
-        price_lower=float(lower_price),
-        price_upper=float(upper_price),
+        price_lower=lower_price,
+        price_upper=upper_price,
         amount0_desired=eth_balance,
         amount1_desired=usdc_balance,
         recipient=strategy.wallet_address,
@@ -58,3 +64,4 @@ def provide_liquidity(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     )
     
     return ActionBundle(actions=[add_liquidity_action])
+
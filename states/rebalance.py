@@ -1,38 +1,106 @@
 from time import sleep, time
-from typing import TYPE_CHECKING
-from decimal import Decimal
+from typing import TYPE_CHECKING, List, Tuple
 
 from src.almanak_library.models.action_bundle import ActionBundle
 from src.almanak_library.models.action import Action
-from src.almanak_library.models.params import ClosePositionParams, OpenPositionParams
-from src.almanak_library.enums import ActionType, Protocol
+from src.almanak_library.models.params import ApproveParams, ClosePositionParams, OpenPositionParams, SwapParams
+from src.almanak_library.enums import ActionType, Protocol, SwapSide
+
+from ..utils.rebalance_candidate import RebalanceCandidate
+from ..utils.swap_sizing import SwapPlan
+from ..utils.tick_math import FEE_TIER_TICK_SPACING, amounts_for_liquidity, sqrt_ratio_at_tick, tick_to_price
 
 if TYPE_CHECKING:
     from ..strategy import StrategyUniV3SingleSidedETH
+    from ..utils.chain_snapshot import Snapshot
+
+UNIV3_ROUTER = "0x2626664c2603336E57B271c5C0b26F421741e481"
 
 def rebalance(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     """
     Rebalances the position by:
     1. Removing current liquidity
-    2. Providing new liquidity at current price ±2%
+    2. Swapping the token in excess for the new range (sized so the mint takes both whole)
+    3. Providing new liquidity at current price ±range_width
+    
+    The bundle pre-built by MONITOR_PRICE is used when it is still fresh for the
+    current snapshot (and any approval in it is still needed); otherwise it is built now.
     
     Returns:
-        ActionBundle: Actions for removing and adding liquidity
+        ActionBundle: Actions for removing liquidity, swapping and adding liquidity
+    """
+    strategy.log.info("Rebalancing position")
+    
+    snapshot = strategy.get_snapshot()
+    candidate, strategy.rebalance_candidate = strategy.rebalance_candidate, None
+    if (
+        candidate is not None
+        and is_fresh(strategy, candidate, snapshot)
+        and approvals_needed(strategy, candidate.bundle)
+    ):
+        strategy.metrics.inc("rebalance_prebuilt_total", outcome="used")
+        strategy.log.info(
+            "Using pre-built rebalance bundle",
+            built_at_block=candidate.block_number,
+            tick_drift=strategy.pool_tick(snapshot) - candidate.center_tick,
+        )
+    else:
+        if candidate is not None:
+            strategy.metrics.inc("rebalance_prebuilt_total", outcome="stale")
+        candidate = build_rebalance(strategy, snapshot)
+    
+    # Update state (the bundle is handed to execution now, so its approvals and swaps count)
+    strategy.record_position_ticks(candidate.tick_lower, candidate.tick_upper, candidate.tick_spacing)
+    strategy.record_rebalance(snapshot.spot_price)
+    record_allowances(strategy, candidate.bundle)
+    
+    return candidate.bundle
+
+def prepare_rebalance(strategy: "StrategyUniV3SingleSidedETH", snapshot: "Snapshot") -> RebalanceCandidate:
     """
-    print("Rebalancing position")
+    Returns the rebalance bundle for the snapshot ahead of the trigger: the current
+    candidate while it is still fresh, a newly built one otherwise.
+    """
+    candidate = strategy.rebalance_candidate
+    if candidate is not None and is_fresh(strategy, candidate, snapshot):
+        return candidate
+    return build_rebalance(strategy, snapshot, speculative=True)
+
+def is_fresh(strategy: "StrategyUniV3SingleSidedETH", candidate: RebalanceCandidate, snapshot: "Snapshot") -> bool:
+    """
+    Whether a pre-built bundle still matches the position, balances and pool tick of the snapshot.
+    """
+    balances = (snapshot.balance_of(strategy.ETH_ADDRESS), snapshot.balance_of(strategy.USDC_ADDRESS))
+    return candidate.is_fresh(
+        strategy.persistent_state.eth_usdc_position_id,
+        balances,
+        strategy.pool_tick(snapshot),
+        strategy.config.rebalance_prebuild_tolerance,
+    )
+
+def build_rebalance(
+    strategy: "StrategyUniV3SingleSidedETH", snapshot: "Snapshot", speculative: bool = False
+) -> RebalanceCandidate:
+    """
+    Builds the close, swap and re-open actions for the snapshot, without changing the persistent state.
     
+    What the close returns plus the wallet balances is swapped into the new range's
+    ratio before the re-open, which is sized from the amounts expected after the swap.
+    A `speculative` build (a pre-built candidate) decides the router approval from the
+    cached allowance alone, without reading it from the chain.
+    """
     # Constants
-    USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-    ETH_ADDRESS = "0x4200000000000000000000000000000006"
-    PRICE_RANGE_MULTIPLIER = Decimal('0.02')  # 2% range
+    ETH_ADDRESS, USDC_ADDRESS = strategy.ETH_ADDRESS, strategy.USDC_ADDRESS
+    SLIPPAGE = 0.005  # 0.5% slippage
     
     # First, remove existing liquidity
+    position_id = strategy.persistent_state.eth_usdc_position_id
     close_params = ClosePositionParams(
-        position_id=strategy.persistent_state.eth_usdc_position_id,
+        position_id=position_id,
         recipient=strategy.wallet_address,
         token0=ETH_ADDRESS,
         token1=USDC_ADDRESS,
-        slippage=0.005  # 0.5% slippage
+        slippage=SLIPPAGE
     )
     
     remove_liquidity_action = Action(
@@ -41,26 +109,48 @@ def rebalance(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
         protocol=Protocol.UNISWAP_V3
     )
     
-    # Get current price and calculate new range
-    current_price = strategy.get_current_eth_price()
-    lower_price = current_price * (Decimal('1') - PRICE_RANGE_MULTIPLIER)
-    upper_price = current_price * (Decimal('1') + PRICE_RANGE_MULTIPLIER)
+    # Calculate the new range around the pool's current tick
+    tick_lower, tick_upper = strategy.plan_position_ticks(snapshot, strategy.range_width())
+    lower_price = tick_to_price(tick_lower, strategy.ETH_DECIMALS, strategy.USDC_DECIMALS)
+    upper_price = tick_to_price(tick_upper, strategy.ETH_DECIMALS, strategy.USDC_DECIMALS)
     
-    # After removal, get new balances
-    eth_balance = strategy.get_token_balance(ETH_ADDRESS)
-    usdc_balance = strategy.get_token_balance(USDC_ADDRESS)
+    # After removal, the wallet holds its balances plus the position's principal and fees
+    eth_balance = snapshot.balance_of(strategy.ETH_ADDRESS)
+    usdc_balance = snapshot.balance_of(strategy.USDC_ADDRESS)
+    eth_available, usdc_available = closed_balances(strategy, snapshot, eth_balance, usdc_balance, SLIPPAGE)
+    
+    # Swap the excess into the new range's ratio, so no follow-up swap is needed
+    actions = [remove_liquidity_action]
+    plan = strategy.plan_swap(snapshot, tick_lower, tick_upper, eth_available, usdc_available)
+    eth_desired, usdc_desired = eth_available, usdc_available
+    if plan.needed:
+        actions += swap_actions(strategy, plan, ETH_ADDRESS if plan.zero_for_one else USDC_ADDRESS,
+                                USDC_ADDRESS if plan.zero_for_one else ETH_ADDRESS, UNIV3_ROUTER, SLIPPAGE,
+                                refresh=not speculative)
+        # Only the minimum output of the swap is counted on
+        received = int(plan.expected_out * (1 - SLIPPAGE))
+        if plan.zero_for_one:
+            eth_desired, usdc_desired = eth_available - plan.amount_in, usdc_available + received
+        else:
+            eth_desired, usdc_desired = eth_available + received, usdc_available - plan.amount_in
+        strategy.log.info(
+            "Rebalance swap sized",
+            zero_for_one=plan.zero_for_one,
+            amount_in=plan.amount_in,
+            expected_out=plan.expected_out,
+        )
     
     # Create new position
     open_position_params = OpenPositionParams(
         token0=ETH_ADDRESS,
         token1=USDC_ADDRESS,
         fee=500,  # 0.05% fee tier
-        price_lower=float(lower_price),
-        price_upper=float(upper_price),
-        amount0_desired=eth_balance,
-        amount1_desired=usdc_balance,
+        price_lower=lower_price,
+        price_upper=upper_price,
+        amount0_desired=eth_desired,
+        amount1_desired=usdc_desired,
         recipient=strategy.wallet_address,
-        slippage=0.005  # 0.5% slippage
+        slippage=SLIPPAGE
     )
     
     add_liquidity_action = Action(
@@ -68,9 +158,98 @@ def rebalance(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
         params=open_position_params,
         protocol=Protocol.UNISWAP_V3
     )
+    actions.append(add_liquidity_action)
     
-    # Update state
-    strategy.persistent_state.last_eth_price = current_price
-    strategy.persistent_state.last_rebalance_timestamp = time()
+    return RebalanceCandidate(
+        bundle=ActionBundle(actions=actions),
+        position_id=position_id,
+        balances=(eth_balance, usdc_balance),
+        center_tick=strategy.pool_tick(snapshot),
+        tick_lower=tick_lower,
+        tick_upper=tick_upper,
+        tick_spacing=snapshot.tick_spacing or FEE_TIER_TICK_SPACING[500],
+        spot_price=snapshot.spot_price,
+        block_number=snapshot.block_number,
+    )
+
+def closed_balances(
+    strategy: "StrategyUniV3SingleSidedETH", snapshot: "Snapshot", eth_balance: int, usdc_balance: int, slippage: float
+) -> Tuple[int, int]:
+    """
+    (ETH, USDC) the wallet holds once the position is closed: its balances, the owed fees
+    in full and the principal at the close's minimum.
+    """
+    position = snapshot.position
+    if position is None:
+        return eth_balance, usdc_balance
+    tick_lower, tick_upper, liquidity = position[5:8]
+    sqrt_price_x96 = snapshot.sqrt_price_x96 or sqrt_ratio_at_tick(strategy.pool_tick(snapshot))
+    principal0, principal1 = amounts_for_liquidity(sqrt_price_x96, tick_lower, tick_upper, liquidity)
+    return (
+        eth_balance + position[10] + int(principal0 * (1 - slippage)),
+        usdc_balance + position[11] + int(principal1 * (1 - slippage)),
+    )
+
+def swap_actions(
+    strategy: "StrategyUniV3SingleSidedETH", plan: SwapPlan, token_in: str, token_out: str, router: str, slippage: float,
+    refresh: bool = True,
+) -> List[Action]:
+    """
+    The swap of `plan` through `router`, preceded by an approval when the allowance falls short.
     
-    return ActionBundle(actions=[remove_liquidity_action, add_liquidity_action])
+    The allowance cache is not updated here (see `record_allowances`): the actions may be
+    a pre-built candidate that is never executed. `refresh` is passed on to
+    `AllowanceCache.required`.
+    """
+    actions = []
+    if strategy.allowances.required(token_in, router, plan.amount_in, refresh=refresh):
+        actions.append(Action(
+            type=ActionType.APPROVE,
+            params=ApproveParams(
+                token_address=token_in,
+                spender_address=router,
+                from_address=strategy.wallet_address,
+                amount=strategy.approval_amount(plan.amount_in),
+            ),
+            protocol=Protocol.UNISWAP_V3,
+        ))
+    actions.append(Action(
+        type=ActionType.SWAP,
+        params=SwapParams(
+            side=SwapSide.SELL,
+            tokenIn=token_in,
+            tokenOut=token_out,
+            fee=500,  # 0.05% fee tier
+            recipient=strategy.wallet_address,
+            amount=plan.amount_in,
+            slippage=slippage,
+        ),
+        protocol=Protocol.UNISWAP_V3,
+    ))
+    return actions
+
+def approvals_needed(strategy: "StrategyUniV3SingleSidedETH", bundle: ActionBundle) -> bool:
+    """
+    Whether every approval in a pre-built bundle is still needed: it was decided from the
+    cached allowance, which is re-read from the chain here, once the bundle is to be used.
+    """
+    approved = set()
+    for action in bundle.actions:
+        if action.type == ActionType.APPROVE:
+            approved.add(action.params.token_address)
+        elif action.type == ActionType.SWAP and action.params.tokenIn in approved:
+            if not strategy.allowances.required(action.params.tokenIn, UNIV3_ROUTER, action.params.amount):
+                return False
+    return True
+
+def record_allowances(strategy: "StrategyUniV3SingleSidedETH", bundle: ActionBundle) -> None:
+    """
+    Books the router approvals and swaps of a bundle handed to execution in the allowance cache.
+    """
+    approved = set()
+    for action in bundle.actions:
+        if action.type == ActionType.APPROVE:
+            strategy.allowances.approving(action.params.token_address, action.params.spender_address)
+            approved.add(action.params.token_address)
+        elif action.type == ActionType.SWAP and action.params.tokenIn not in approved:
+            strategy.allowances.spent(action.params.tokenIn, UNIV3_ROUTER, action.params.amount)
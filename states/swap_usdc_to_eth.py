@@ -1,43 +1,74 @@
 from time import sleep
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from src.almanak_library.models.action_bundle import ActionBundle
 from src.almanak_library.models.action import Action
-from src.almanak_library.models.params import SwapParams
+from src.almanak_library.models.params import ApproveParams, SwapParams
 from src.almanak_library.enums import ActionType, Protocol, SwapSide, ExecutionStatus
 
 if TYPE_CHECKING:
     from ..strategy import StrategyUniV3SingleSidedETH
 
-def swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
+def swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> Optional[ActionBundle]:
     """
-    Swaps half of USDC balance to ETH for providing liquidity.
+    Swaps USDC to ETH in the proportion the initial position takes.
     
     Steps:
-    1. Gets current USDC balance
-    2. Calculates amount to swap (half of balance)
-    3. Creates swap action from USDC to ETH
+    1. Gets current ETH and USDC balances and the range PROVIDE_LIQUIDITY will open
+    2. Sizes the swap so a mint over that range takes both balances whole
+       (closed form at the pool price, refined on local quotes when available)
+    3. Creates swap action for that amount
     
     Returns:
-        ActionBundle: Swap action for USDC to ETH
+        Optional[ActionBundle]: Swap action, or None when the balances are already in proportion
     """
-    print("Swapping USDC to ETH")
+    strategy.log.info("Swapping USDC to ETH")
     
     # Constants
-    USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-    ETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+    ETH_ADDRESS, USDC_ADDRESS = strategy.ETH_ADDRESS, strategy.USDC_ADDRESS
+    UNIV3_ROUTER = "0x2626664c2603336E57B271c5C0b26F421741e481"
     
-    # Get USDC balance
-    usdc_balance = strategy.get_token_balance(USDC_ADDRESS)
-    amount_to_swap = usdc_balance // 2  # Swap half the balance
+    # Size the swap for the range the position will be opened over
+    snapshot = strategy.get_snapshot()
+    eth_balance = snapshot.balance_of(strategy.ETH_ADDRESS)
+    usdc_balance = snapshot.balance_of(strategy.USDC_ADDRESS)
+    tick_lower, tick_upper = strategy.plan_position_ticks(snapshot, strategy.range_width())
+    plan = strategy.plan_swap(snapshot, tick_lower, tick_upper, eth_balance, usdc_balance)
+    if not plan.needed:
+        strategy.log.info("Balances already match the position's ratio; no swap needed")
+        return None
+    
+    # ETH is token0: a zero-for-one swap sells ETH for USDC
+    token_in, token_out = (ETH_ADDRESS, USDC_ADDRESS) if plan.zero_for_one else (USDC_ADDRESS, ETH_ADDRESS)
+    strategy.log.info(
+        "Swap sized",
+        token_in=token_in,
+        amount_in=plan.amount_in,
+        expected_out=plan.expected_out,
+        half_split_usdc=usdc_balance // 2,
+    )
+    
+    # Quote it locally
+    simulator = strategy.get_pool_simulator(snapshot)
+    if simulator is not None:
+        quote = simulator.quote(zero_for_one=plan.zero_for_one, amount_in=plan.amount_in)
+        strategy.log.info(
+            "Swap quote",
+            amount_in=plan.amount_in,
+            expected_out=quote.amount_out,
+            price_impact=quote.price_impact,
+            ticks_crossed=quote.ticks_crossed,
+        )
+        if quote.price_impact > 0.005:
+            strategy.log.warning("Swap price impact exceeds the 0.5% slippage", price_impact=quote.price_impact)
     
     swap_params = SwapParams(
         side=SwapSide.SELL,
-        tokenIn=USDC_ADDRESS,
-        tokenOut=ETH_ADDRESS,
+        tokenIn=token_in,
+        tokenOut=token_out,
         fee=500,  # 0.05% fee tier
         recipient=strategy.wallet_address,
-        amount=amount_to_swap,
+        amount=plan.amount_in,
         slippage=0.005  # 0.5% slippage
     )
     
@@ -47,7 +78,25 @@ def swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
         protocol=Protocol.UNISWAP_V3
     )
     
-    return ActionBundle(actions=[swap_action])
+    # INITIALIZATION approved USDC; selling excess ETH may need its own approval first
+    actions = []
+    if strategy.allowances.required(token_in, UNIV3_ROUTER, plan.amount_in):
+        strategy.allowances.approving(token_in, UNIV3_ROUTER)
+        actions.append(Action(
+            type=ActionType.APPROVE,
+            params=ApproveParams(
+                token_address=token_in,
+                spender_address=UNIV3_ROUTER,
+                from_address=strategy.wallet_address,
+                amount=strategy.approval_amount(plan.amount_in),
+            ),
+            protocol=Protocol.UNISWAP_V3,
+        ))
+    else:
+        strategy.allowances.spent(token_in, UNIV3_ROUTER, plan.amount_in)
+    actions.append(swap_action)
+    
+    return ActionBundle(actions=actions)
 
 def validate_swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> bool:
     """
@@ -69,11 +118,12 @@ def validate_swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> bool:
     if not swap_executed:
         raise ValueError("No receipt found for swap")
         
-    # Verify tokens
-    if swap_executed.tokenIn_symbol.lower() != "usdc" or swap_executed.tokenOut_symbol.lower() != "weth":
+    # Verify tokens (the sized swap sells whichever of the two is in excess)
+    symbols = (swap_executed.tokenIn_symbol.lower(), swap_executed.tokenOut_symbol.lower())
+    if symbols not in (("usdc", "weth"), ("weth", "usdc")):
         raise ValueError("Swap executed for wrong tokens")
         
-    print(f"Swap validated successfully: {swap_executed.amountIn} USDC -> {swap_executed.amountOut} ETH")
+    strategy.log.info("Swap validated successfully", token_in=symbols[0], amount_in=swap_executed.amountIn, amount_out=swap_executed.amountOut)
     return True
 
 def sadflow_swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
@@ -83,7 +133,7 @@ def sadflow_swap_usdc_to_eth(strategy: "StrategyUniV3SingleSidedETH") -> ActionB
     actions = strategy.executioner_status["actions"]
     match actions.status:
         case ExecutionStatus.FAILED | ExecutionStatus.CANCELLED | ExecutionStatus.NOT_INCLUDED:
-            print("Swap failed, retrying with updated parameters...")
+            strategy.log.warning("Swap failed, retrying with updated parameters", status=actions.status)
             # Increase slippage for retry
             strategy.persistent_state.retry_count = strategy.persistent_state.retry_count + 1
             if strategy.persistent_state.retry_count > 3:
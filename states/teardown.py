@@ -21,16 +21,15 @@ def teardown(strategy: "StrategyUniV3SingleSidedETH") -> ActionBundle:
     Returns:
         ActionBundle: Remove liquidity actions if position exists
     """
-    print("Tearing down the strategy")
+    strategy.log.info("Tearing down the strategy")
     
     position_id = strategy.persistent_state.eth_usdc_position_id
     if not position_id:
-        print("No active position to close")
+        strategy.log.info("No active position to close")
         return None
     
     # Constants
-    USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-    ETH_ADDRESS = "0x4200000000000000000000000000000006"
+    ETH_ADDRESS, USDC_ADDRESS = strategy.ETH_ADDRESS, strategy.USDC_ADDRESS
     
     close_params = ClosePositionParams(
         position_id=position_id,
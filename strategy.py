@@ -1,4 +1,10 @@
+import importlib
+import json
+import math
 import os
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from src.almanak_library.models.action_bundle import ActionBundle
 from src.almanak_library.models import (
@@ -11,12 +17,35 @@ from src.almanak_library.strategy_base import StrategyUniV3
 from src.almanak_library.protocols.uniswap_v3 import UniswapV3
 from src.utils.utils import get_protocol_sdk, get_web3_by_network_and_chain
 
-from .states.initialization import initialization
-from .states.teardown import teardown
-from .states.swap_usdc_to_eth import swap_usdc_to_eth
-from .states.provide_liquidity import provide_liquidity
-from .states.monitor_price import monitor_price
-from .states.rebalance import rebalance
+from .utils.history import granularity_seconds
+from .utils.metrics import NULL_METRICS
+from .utils.tick_math import FEE_TIER_TICK_SPACING, TickTable, price_to_tick, range_ticks, sqrt_ratio_at_tick
+from .utils.monitor_scheduler import MonitorScheduler, log_distance, realized_variance_rate
+from .utils.read_cache import BlockCache
+from .utils.rebalance_candidate import RebalanceCandidate
+from .utils.startup_cache import startup_cache
+from .utils.triggers import TriggerEngine
+from .utils.state_journal import StateJournal, to_jsonable
+from .utils.structured_log import get_logger
+
+# Modules that pull in eth_abi, requests or http.server are imported by the code paths
+# that use them (snapshot reads, approvals, quotes, transport, exporters), not at startup.
+if TYPE_CHECKING:
+    import asyncio
+
+    from .utils.allowances import AllowanceCache
+    from .utils.candles import Candles
+    from .utils.chain_snapshot import ChainSnapshot, Snapshot
+    from .utils.pool_sim import PoolSimulator
+    from .utils.price_store import PriceStore
+    from .utils.providers import ProviderRegistry
+    from .utils.rpc_transport import RpcTransport
+    from .utils.state_writer import StateWriter
+    from .utils.swap_sizing import SwapPlan
+
+
+# State handlers imported so far, by (state module, function) (see MyStrategy.state_handler)
+_STATE_HANDLERS: Dict[Tuple[str, str], Callable] = {}
 
 
 class MyStrategy(StrategyUniV3):
@@ -27,13 +56,18 @@ class MyStrategy(StrategyUniV3):
     
     # Token addresses
     USDC_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-    ETH_ADDRESS = "0x4200000000000000000000000000000006"
+    ETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+    ETH_DECIMALS = 18
+    USDC_DECIMALS = 6
 
-    def __init__(self, **kwargs):
+    def __init__(self, providers: Optional["ProviderRegistry"] = None, **kwargs):
         """
         Initialize the strategy with given configuration parameters.
 
         Args:
+            providers: Registry of Web3 providers and SDKs shared with other instances
+                in the same process (see `orchestrator.py`). Without one, the strategy
+                builds its own.
             **kwargs: Strategy-specific configuration parameters.
         """
         super().__init__()
@@ -45,7 +79,8 @@ class MyStrategy(StrategyUniV3):
 
         # Get configuration from kwargs
         try:
-            self.config = StrategyConfig(**kwargs)
+            # Validated once per config/schema version, then served from the startup cache
+            self.config = startup_cache.validated(StrategyConfig, kwargs)
         except Exception as e:
             raise ValueError(f"Invalid Strategy Configuration. {e}")
 
@@ -56,8 +91,98 @@ class MyStrategy(StrategyUniV3):
         self.pool_address = self.config.pool_address
 
         # Initialize web3 and protocol SDK
-        self.web3 = get_web3_by_network_and_chain(self.network, self.chain)
-        self.uniswap_v3 = get_protocol_sdk(self.protocol, self.network, self.chain)
+        if providers is not None:
+            self.web3 = providers.web3(self.network, self.chain)
+            self.uniswap_v3 = providers.sdk(self.protocol, self.network, self.chain)
+        else:
+            self.web3 = get_web3_by_network_and_chain(self.network, self.chain)
+            self.uniswap_v3 = get_protocol_sdk(self.protocol, self.network, self.chain)
+
+        # Coalescing, pooled and batching JSON-RPC transport (shared providers bring their own)
+        self.rpc_transport: Optional["RpcTransport"] = None
+        if providers is None and self.config.use_rpc_transport:
+            from .utils.rpc_transport import RpcTransport
+
+            self.rpc_transport = RpcTransport.install(
+                self.web3, pool_size=self.config.rpc_pool_size, max_batch=self.config.rpc_max_batch
+            )
+
+        # Structured JSON-lines logging, written by a background thread
+        self.log = get_logger(
+            self.STRATEGY_NAME,
+            level=self.config.log_level,
+            path=self.config.log_path,
+            queue_size=self.config.log_queue_size,
+            overflow=self.config.log_overflow,
+        ).bind(strategy=str(self.id))
+
+        # Metrics (Prometheus endpoint and/or JSON file); a no-op sink when neither is configured
+        self.metrics = NULL_METRICS
+        if self.config.metrics_port or self.config.metrics_json_path:
+            from .utils.metrics import REGISTRY, flush_json_periodically, serve_prometheus
+
+            self.metrics = REGISTRY.bind(strategy=str(self.id))
+            if self.config.metrics_port:
+                serve_prometheus(self.config.metrics_port)
+            if self.config.metrics_json_path:
+                flush_json_periodically(self.config.metrics_json_path, self.config.metrics_flush_interval)
+            if self.rpc_transport is not None:
+                REGISTRY.add_collector(self._rpc_transport_metrics)
+
+        # Block-pinned chain reads, taken at most once per run() cycle
+        self.chain_snapshot: Optional["ChainSnapshot"] = None
+        self.snapshot: Optional["Snapshot"] = None
+
+        # Position tick range followed by watch_pool(), refreshed after every wake
+        self._watched_bounds: Optional[Tuple[int, int]] = None
+        self._tick_table: Optional[TickTable] = None
+
+        # Local pool math for quotes, loaded at most once per block
+        self._pool_simulator: Optional["PoolSimulator"] = None
+
+        # Cadence of MONITOR_PRICE checks. run() sleeps between checks until `monitor_deadline`
+        # seconds have passed, then returns with `next_check_at` (unix time) suggested for the
+        # next call; hosts that schedule run() themselves set the deadline to 0.
+        self.monitor_scheduler = MonitorScheduler(self.config.monitor_min_interval, self.config.monitor_max_interval)
+        self.monitor_deadline = self.config.monitor_deadline
+        self.next_check_at: Optional[float] = None
+
+        # Rebalance triggers, compiled once from `rebalance_triggers` (or `default_triggers()`)
+        self.trigger_engine = TriggerEngine.compile(self.config.rebalance_triggers or self.default_triggers())
+
+        # Local candle store for `data_source` (opened on first use; None when disabled)
+        self._price_store: Optional["PriceStore"] = None
+        self._price_sync_after = 0.0  # Retry time after a failed fetch
+
+        # Rebalance bundle pre-built by MONITOR_PRICE while the price is near a bound (in memory only)
+        self.rebalance_candidate: Optional[RebalanceCandidate] = None
+
+        # Token allowances, cached in the persistent state (built on first use, see `allowances`)
+        self._allowances: Optional["AllowanceCache"] = None
+
+        # Read-through cache for SDK reads, valid for one block or until our actions execute
+        self.read_cache = BlockCache(
+            lambda: self.web3.eth.block_number, block_time=self.config.block_time
+        )
+
+        # Journaled persistent state (local snapshot + delta journal), when configured
+        self.state_journal: Optional[StateJournal] = None
+        self._state_saved = False
+        if self.config.state_journal_dir:
+            from .utils.state_codec import get_codec
+
+            self.state_journal = StateJournal(
+                self.config.state_journal_dir,
+                name=str(self.id),
+                compact_every=self.config.state_journal_compact_every,
+                codec=get_codec(self.config.state_codec, self.get_persistent_state_model().SCHEMA),
+            )
+        # Background writer for the journal, flushed before actions are handed to execution
+        self.state_writer: Optional["StateWriter"] = None
+        if self.state_journal is not None and self.config.state_write_behind:
+            from .utils.state_writer import StateWriter
+
+            self.state_writer = StateWriter(self.state_journal, on_write=self._state_written, log=self.log)
 
         self.initialize_persistent_state()
 
@@ -87,6 +212,133 @@ class MyStrategy(StrategyUniV3):
         )
         super().initialize_persistent_state(template_path)
 
+    def load_persistent_state(self) -> None:
+        """
+        Load the persistent state, from the local journal when `state_journal_dir` is set.
+
+        In journaled mode the state is rebuilt from the last snapshot plus the journal
+        entries written after it. If this instance saved the state last and nothing
+        changed on disk since, the in-memory state is reused as-is.
+        """
+        with self.metrics.time("state_load_seconds"):
+            self._load_persistent_state()
+
+    def _load_persistent_state(self) -> None:
+        if self.state_journal is None:
+            return super().load_persistent_state()
+
+        if self.state_writer is not None:
+            # Saves still in flight are newer than the files; the journal is only read once they land.
+            if self._state_saved:
+                self._state_saved = False
+                return
+            self.flush_persistent_state()
+        if self._state_saved and self.state_journal.is_current():
+            self._state_saved = False
+            return
+        self._state_saved = False
+
+        loaded = self.state_journal.load()
+        if loaded is None:
+            # First run with a journal: seed it from the regular state store.
+            super().load_persistent_state()
+            self._compact_persistent_state()
+            return
+
+        data, appends = loaded
+        self.persistent_state = self.get_persistent_state_model()(**data)
+        self.persistent_state.replay_journal(data, appends)
+
+    def save_persistent_state(self) -> None:
+        """
+        Save the persistent state, incrementally when `state_journal_dir` is set.
+
+        In journaled mode only the fields changed since the last save (and rows appended
+        to the histories) are appended to the journal. It is periodically compacted into
+        a full snapshot. With `state_write_behind` the save is handed to a background
+        writer and this returns without I/O (see `flush_persistent_state`).
+        """
+        with self.metrics.time("state_save_seconds"):
+            written = self._save_persistent_state()
+        if self.metrics.enabled and self.state_writer is None:
+            if written is None:
+                # Full save through the framework: measure what it serializes.
+                written = len(json.dumps(to_jsonable(self.persistent_state.model_dump())))
+            self.metrics.inc("state_written_bytes_total", written)
+            self.metrics.set("state_last_save_bytes", written)
+
+    def _save_persistent_state(self) -> Optional[int]:
+        """Save the state; returns the bytes written in journaled mode, None otherwise."""
+        if self.state_journal is None:
+            super().save_persistent_state()
+            return None
+
+        writer = self.state_writer
+        compact = not self.state_journal.has_snapshot() or self.state_journal.needs_compaction()
+        if writer is not None:
+            self._state_saved = True
+            if not (compact or writer.needs_snapshot):
+                sets, appends = self.persistent_state.journal_delta()
+                if writer.submit_delta(sets, appends):
+                    self.persistent_state.mark_persisted(sets)
+                    return 0
+            values = self.persistent_state.frozen_values()
+            writer.submit_snapshot(values)
+            self.persistent_state.mark_persisted(values)
+            return 0
+
+        if compact:
+            written = self._compact_persistent_state()
+        else:
+            sets, appends = self.persistent_state.journal_delta()
+            written = self.state_journal.append(sets, appends)
+            self.persistent_state.mark_persisted(sets)
+        self._state_saved = True
+        return written
+
+    def flush_persistent_state(self) -> None:
+        """
+        Barrier for write-behind saves: return once every save so far is on disk.
+
+        A failed background write is retried once in the foreground as a full snapshot,
+        so the state on disk matches memory before actions are handed to execution.
+        """
+        if self.state_writer is None:
+            return
+        with self.metrics.time("state_flush_seconds"):
+            try:
+                self.state_writer.flush()
+            except Exception as e:
+                self.log.warning("Background state write failed, writing a full snapshot", error=repr(e))
+                self.metrics.inc("state_write_errors_total")
+                self.state_writer.submit_snapshot(self.persistent_state.frozen_values())
+                self.state_writer.flush()
+
+    def _state_written(self, written: int, seconds: float) -> None:
+        self.metrics.inc("state_written_bytes_total", written)
+        self.metrics.set("state_last_save_bytes", written)
+        self.metrics.observe("state_write_seconds", seconds)
+
+    def _compact_persistent_state(self) -> int:
+        values = self.persistent_state.state_values()
+        written = self.state_journal.compact(values)
+        self.persistent_state.mark_persisted(values)
+        return written
+
+    def apply_history_limits(self) -> None:
+        """Bound the loaded price and rebalance histories to the configured sizes."""
+        self.persistent_state.price_history.set_limits(
+            self.config.price_history_cap,
+            self.config.price_rollup_interval,
+            self.config.price_rollup_cap,
+        )
+        self.persistent_state.rebalance_history.set_limits(self.config.rebalance_history_cap)
+        # Volatility statistics are re-derived from the raw prices when first used or re-configured
+        volatility = self.persistent_state.volatility
+        period = granularity_seconds(self.config.granularity)
+        if (volatility.period, volatility.window) != (period, self.config.time_window) or volatility.bucket < 0:
+            volatility.rebuild(self.persistent_state.price_history.raw.rows(), period, self.config.time_window)
+
     def restart_cycle(self) -> None:
         """A Strategy should only be restarted when the full cycle is completed."""
         if self.persistent_state.current_state == self.State.COMPLETED:
@@ -101,7 +353,7 @@ class MyStrategy(StrategyUniV3):
             # Dump the state to the persistent state because we load it when called.
             self.save_persistent_state()
         elif self.persistent_state.current_state == self.State.TERMINATED:
-            print("Strategy is terminated, nothing to restart.")
+            self.log.info("Strategy is terminated, nothing to restart.")
         else:
             raise ValueError("The strategy is not completed yet, can't restart.")
 
@@ -125,15 +377,21 @@ class MyStrategy(StrategyUniV3):
             associated with specific states like initialization, rebalancing, or closing positions.
             - It integrates debugging features to display balances and positions if enabled.
         """
-        print("Running the strategy")
+        self.log.debug("Running the strategy")
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.monitor_deadline
+        self.snapshot = None
+        self.read_cache.unpin()
+        self.next_check_at = None
         if self.config.pause_strategy:
-            print("Strategy is paused.")
+            self.log.info("Strategy is paused.")
             return None
 
         try:
             self.load_persistent_state()
         except Exception as e:
             raise ValueError(f"Unable to load persistent state. {e}")
+        self.apply_history_limits()
 
         if self.config.initiate_teardown and (
             self.persistent_state.current_state in [
@@ -144,39 +402,40 @@ class MyStrategy(StrategyUniV3):
             self.persistent_state.current_state = self.State.TEARDOWN
             self.persistent_state.current_flowstatus = self.InternalFlowStatus.PREPARING_ACTION
 
-        print(self.persistent_state)
+        self.log.info("Persistent state", **self.persistent_state.summary())
 
         actions = None
         while self.is_locked and not actions:
             match self.persistent_state.current_state:
                 case State.INITIALIZATION:
-                    actions = initialization(self)
+                    actions = self.run_state("initialization")
                     self.persistent_state.current_state = State.SWAP_USDC_TO_ETH
                 
                 case State.SWAP_USDC_TO_ETH:
-                    actions = swap_usdc_to_eth(self)
+                    actions = self.run_state("swap_usdc_to_eth")
                     self.persistent_state.current_state = State.PROVIDE_LIQUIDITY
                 
                 case State.PROVIDE_LIQUIDITY:
-                    actions = provide_liquidity(self)
+                    actions = self.run_state("provide_liquidity")
                     self.persistent_state.current_state = State.MONITOR_PRICE
                 
                 case State.MONITOR_PRICE:
-                    actions = monitor_price(self)
-                    if actions:  # If rebalance is needed
+                    if self.run_state("monitor_price"):  # Rebalance needed: build it in this same cycle
                         self.persistent_state.current_state = State.REBALANCE
+                    elif not self.wait_for_next_check(deadline):
+                        break
                 
                 case State.REBALANCE:
-                    actions = rebalance(self)
+                    actions = self.run_state("rebalance")
                     self.persistent_state.current_state = State.MONITOR_PRICE
                 
                 case State.TEARDOWN:
-                    actions = teardown(self)
+                    actions = self.run_state("teardown")
                     self.persistent_state.current_state = State.TERMINATED
                 
                 case State.TERMINATED:
-                    print("Strategy is terminated.")
-                    actions = None
+                    self.log.info("Strategy is terminated.")
+                    break
                 
                 case _:
                     raise ValueError(f"Unknown state: {self.persistent_state.current_state}")
@@ -185,12 +444,330 @@ class MyStrategy(StrategyUniV3):
             self.persistent_state.current_actions = []
         elif isinstance(actions, ActionBundle):
             self.persistent_state.current_actions = [actions.id]
+            # The bundle changes balances and positions once executed
+            self.read_cache.invalidate()
         else:
             raise ValueError(f"Invalid actions type. {type(actions)} : {actions}")
 
+        if self.log.is_enabled_for("DEBUG"):
+            self.log.debug("Read cache", **self.read_cache.stats)
+            if self.rpc_transport is not None:
+                self.log.debug("RPC latency", methods=self.rpc_transport.latency_summary())
+
         self.save_persistent_state()
+        if actions is not None:
+            self.flush_persistent_state()
+        self.metrics.observe("run_seconds", time.perf_counter() - started)
         return actions
 
+    async def watch_pool(
+        self,
+        ws_url: Optional[str] = None,
+        on_actions: Optional[Callable[[ActionBundle], Awaitable[None]]] = None,
+        stop: Optional["asyncio.Event"] = None,
+    ) -> None:
+        """
+        Drive the strategy from pool events instead of polling run() on a timer.
+
+        Follows new blocks and the pool's Swap logs over a websocket and calls run() only
+        when the tick leaves the position range, the rebalance interval expires, or the
+        state machine has work outside MONITOR_PRICE. While the price stays in range no
+        RPC call is made at all.
+
+        Args:
+            ws_url: Websocket endpoint of the node (defaults to `config.ws_url`).
+            on_actions: Called with every ActionBundle run() returns, e.g. to execute it.
+            stop: Set to end the subscription.
+        """
+        import asyncio
+
+        from .utils.event_monitor import PoolEventMonitor
+
+        ws_url = ws_url or self.config.ws_url
+        if not ws_url:
+            raise ValueError("watch_pool() needs a websocket endpoint: set ws_url in the config.")
+
+        # Pool events wake run(); it checks once per wake instead of sleeping between checks
+        self.monitor_deadline = 0
+        self.load_persistent_state()
+        snapshot = await asyncio.to_thread(self.get_snapshot, True)
+        self._watched_bounds = self.position_ticks(snapshot)
+
+        async def wake(reason: str) -> None:
+            self.log.info("Pool event wake", reason=reason)
+            actions = await asyncio.to_thread(self.run)
+            # A rebalance records the new range in the persistent state when it is built.
+            self._watched_bounds = self.position_ticks()
+            if actions is not None and on_actions is not None:
+                await on_actions(actions)
+
+        monitor = PoolEventMonitor(
+            ws_url,
+            self.pool_address,
+            bounds=lambda: self._watched_bounds,
+            on_head=self._event_wake_reason,
+            on_wake=wake,
+            current_tick=snapshot.tick,
+            log=self.log,
+        )
+        await monitor.run(stop)
+        self.log.info("Pool event monitor stopped", **monitor.stats)
+
+    def _event_wake_reason(self, block_number: int, block_timestamp: int) -> Optional[str]:
+        """Reason to call run() at a new block without a price move, if any."""
+        state = self.persistent_state.current_state
+        if state in (State.TERMINATED, State.COMPLETED):
+            return None
+        if state != State.MONITOR_PRICE:
+            return "state_machine"
+        last_rebalance_at = self.last_rebalance_at()
+        if last_rebalance_at is not None and block_timestamp - last_rebalance_at > self.REBALANCE_INTERVAL:
+            # Past the interval the rule also waits for a price move: check at the scheduler's pace
+            if self.next_check_at is None or block_timestamp >= self.next_check_at:
+                return "time_interval"
+        return None
+
+    def wait_for_next_check(self, deadline: float) -> bool:
+        """
+        Sleep until the next MONITOR_PRICE check if it falls before `deadline` (monotonic).
+
+        Returns:
+            bool: True after sleeping (the cycle's snapshot is dropped, so the check reads
+                a new block); False when the check is due past the deadline, with
+                `next_check_at` set for the caller to wake run() at.
+        """
+        delay = self.next_check_delay()
+        self.next_check_at = time.time() + delay
+        self.metrics.set("monitor_next_check_seconds", delay)
+        if time.monotonic() + delay > deadline:
+            self.log.debug("Next check scheduled", delay=round(delay, 3), next_check_at=self.next_check_at)
+            return False
+        self.metrics.inc("monitor_sleeps_total")
+        time.sleep(delay)
+        self.snapshot = None
+        self.read_cache.unpin()
+        return True
+
+    def next_check_delay(self) -> float:
+        """
+        Seconds until the next MONITOR_PRICE check (see `MonitorScheduler`).
+
+        Scaled by the log distance from the spot price to the position's nearer bound
+        and the volatility over the configured `time_window` of `granularity` periods
+        (the streaming statistics, or until they have data the candle store or the
+        price history), and capped by the time-based rebalance (once that is due but
+        held back by `rebalance_threshold()`, the threshold's edge counts as a bound).
+        """
+        snapshot = self.get_snapshot()
+        tick_table = self.get_tick_table(snapshot)
+        distance = log_distance(snapshot.spot_price, tick_table.bounds()) if tick_table is not None else None
+        now = time.time()
+        window = self.config.time_window * granularity_seconds(self.config.granularity)
+        variance_rate = self.persistent_state.volatility.variance_rate()
+        candles = self.get_price_window(now) if variance_rate is None else None
+        if candles is not None and len(candles) > 1:
+            variance_rate = realized_variance_rate(candles.timestamps, candles.close, now - window)
+        elif variance_rate is None:
+            history = self.persistent_state.price_history
+            variance_rate = realized_variance_rate(history.timestamps(), history.prices(), now - window)
+        until_due = None
+        last_rebalance_at = self.last_rebalance_at()
+        if last_rebalance_at is not None:
+            until_due = self.REBALANCE_INTERVAL - (now - last_rebalance_at)
+            if until_due <= 0 and distance is not None:
+                # Overdue but held back by the threshold: its edge around the reference acts as a bound
+                reference = self.persistent_state.last_eth_price or tick_table.center()
+                moved = abs(math.log(snapshot.spot_price / reference))
+                distance, until_due = min(distance, max(self.rebalance_threshold() - moved, 0.0)), None
+        return self.monitor_scheduler.next_interval(distance, variance_rate, until_due)
+
+    @property
+    def price_store(self) -> Optional["PriceStore"]:
+        """The local candle store, or None unless `price_store_dir` is set."""
+        if self._price_store is None and self.config.price_store_dir:
+            from .utils.price_store import PriceStore, get_source
+
+            options = {"path": self.config.price_source_path} if self.config.data_source == "FILE" else {}
+            self._price_store = PriceStore(
+                self.config.price_store_dir, get_source(self.config.data_source, **options), backfill=self.config.time_window
+            )
+        return self._price_store
+
+    def get_price_window(self, now: Optional[float] = None) -> Optional["Candles"]:
+        """
+        The last `time_window` candles of `granularity` for the pool, from the local store.
+
+        Candles closed since the last call are fetched from `data_source` first (no request
+        while the current candle is still open, nor for one period after a failed fetch);
+        the window itself is a view into the store's memory-mapped file. None without a
+        store, or when nothing is stored yet.
+        """
+        store = self.price_store
+        if store is None:
+            return None
+        now = time.time() if now is None else now
+        if now >= self._price_sync_after:
+            try:
+                with self.metrics.time("price_store_sync_seconds"):
+                    appended = store.sync(self.pool_address, self.config.granularity, now)
+                if appended:
+                    self.metrics.inc("price_store_candles_total", appended)
+            except Exception as e:
+                # Not retried before the next candle closes
+                self._price_sync_after = now + granularity_seconds(self.config.granularity)
+                self.metrics.inc("price_store_errors_total")
+                self.log.warning("Price store sync failed; serving stored candles", error=repr(e))
+        candles = store.window(self.pool_address, self.config.granularity, self.config.time_window)
+        return candles if len(candles) else None
+
+    def position_ticks(self, snapshot: Optional["Snapshot"] = None) -> Optional[Tuple[int, int]]:
+        """
+        The open position's (tickLower, tickUpper).
+
+        The position info in `snapshot` is authoritative; when it differs from the ticks
+        recorded at open (e.g. the SDK aligned the range differently) the persistent state
+        is updated to match it.
+        """
+        state = self.persistent_state
+        ticks = snapshot.position_ticks() if snapshot is not None else None
+        if ticks is not None and ticks != (state.position_tick_lower, state.position_tick_upper):
+            state.position_tick_lower, state.position_tick_upper = ticks
+        if state.position_tick_lower is None or state.position_tick_upper is None:
+            return None
+        return state.position_tick_lower, state.position_tick_upper
+
+    def get_tick_table(self, snapshot: Optional["Snapshot"] = None) -> Optional[TickTable]:
+        """Tick/price table for the open position's range, rebuilt only when the range changes."""
+        ticks = self.position_ticks(snapshot)
+        if ticks is None:
+            return None
+        tick_spacing = self.persistent_state.tick_spacing or FEE_TIER_TICK_SPACING[500]
+        key = (*ticks, tick_spacing)
+        if self._tick_table is None or self._tick_table.key != key:
+            self._tick_table = TickTable(*key, self.ETH_DECIMALS, self.USDC_DECIMALS)
+        return self._tick_table
+
+    def pool_tick(self, snapshot: "Snapshot") -> int:
+        """The pool's tick at `snapshot`: slot0's, or the tick of the spot price when the snapshot has none."""
+        if snapshot.tick is not None:
+            return snapshot.tick
+        return price_to_tick(snapshot.spot_price, self.ETH_DECIMALS, self.USDC_DECIMALS)
+
+    def range_width(self) -> float:
+        """
+        Relative half-width of new positions, e.g. 0.02 for ±2%.
+
+        `range_width` as configured, or with `dynamic_range` sized from the streaming
+        volatility to hold the price over a rebalance interval (`range_width_sigmas`
+        standard deviations, within `range_width_min` .. `range_width_max`).
+        """
+        if not self.config.dynamic_range:
+            return self.config.range_width
+        return self.persistent_state.volatility.range_width(
+            horizon=self.REBALANCE_INTERVAL,
+            sigmas=self.config.range_width_sigmas,
+            min_width=self.config.range_width_min,
+            max_width=self.config.range_width_max,
+            default=self.config.range_width,
+        )
+
+    def rebalance_threshold(self) -> float:
+        """
+        Smallest relative move from the open price that the time-based rebalance acts on:
+        `MIN_PRICE_DEVIATION`, or with `dynamic_range` one average true range per period
+        (never below it).
+        """
+        if not self.config.dynamic_range:
+            return self.MIN_PRICE_DEVIATION
+        return self.persistent_state.volatility.rebalance_threshold(self.MIN_PRICE_DEVIATION)
+
+    def default_triggers(self) -> List[Dict[str, Any]]:
+        """
+        Rebalance rules used unless `rebalance_triggers` is set (see `utils/triggers.py`).
+
+        The price leaving the position's range; a `PRICE_DEVIATION_THRESHOLD` move from
+        the open price (left out with `dynamic_range`, where it would undercut wider
+        ranges); and, after `REBALANCE_INTERVAL`, a move of `rebalance_threshold()`, with
+        hysteresis so it stays armed while the price hovers around the threshold.
+        """
+        triggers: List[Dict[str, Any]] = [{"rule": "position_bounds"}]
+        if not self.config.dynamic_range:
+            triggers.append({"rule": "price_deviation", "threshold": self.PRICE_DEVIATION_THRESHOLD})
+        triggers.append({"name": "time_interval", "all": [
+            {"rule": "time_elapsed", "seconds": self.REBALANCE_INTERVAL},
+            {"rule": "price_deviation", "threshold": "volatility", "hysteresis": self.MIN_PRICE_DEVIATION / 2},
+        ]})
+        return triggers
+
+    def last_rebalance_at(self) -> Optional[float]:
+        """Unix time the current position was opened, if known."""
+        state = self.persistent_state
+        if state.last_rebalance_timestamp is not None:
+            return state.last_rebalance_timestamp
+        return state.last_rebalance_time.timestamp() if state.last_rebalance_time else None
+
+    def record_rebalance(self, price: float) -> None:
+        """Record a position opened now at `price`, the reference of the deviation and interval triggers."""
+        state = self.persistent_state
+        state.last_eth_price = float(price)
+        state.last_rebalance_timestamp = time.time()
+        state.last_rebalance_time = datetime.fromtimestamp(state.last_rebalance_timestamp, timezone.utc)
+        self.trigger_engine.reset()
+
+    def plan_position_ticks(self, snapshot: "Snapshot", width) -> Tuple[int, int]:
+        """Tick range for a position opened at `snapshot`, without recording it (see `new_position_ticks`)."""
+        tick_spacing = snapshot.tick_spacing or FEE_TIER_TICK_SPACING[500]
+        return range_ticks(self.pool_tick(snapshot), float(width), tick_spacing)
+
+    def new_position_ticks(self, snapshot: "Snapshot", width) -> Tuple[int, int]:
+        """
+        Tick range for a position opened now, recorded with the tick spacing in the persistent state.
+
+        The range is centered on the pool's slot0 tick (or the tick of the spot price when
+        the snapshot has none) and aligned outward to the tick spacing, so it covers at
+        least ±width.
+
+        Args:
+            snapshot: The cycle's chain snapshot.
+            width: Relative half-width of the range, e.g. 0.02 for ±2%.
+
+        Returns:
+            Tuple[int, int]: tickLower and tickUpper of the new position.
+        """
+        tick_lower, tick_upper = self.plan_position_ticks(snapshot, width)
+        self.record_position_ticks(tick_lower, tick_upper, snapshot.tick_spacing or FEE_TIER_TICK_SPACING[500])
+        return tick_lower, tick_upper
+
+    def record_position_ticks(self, tick_lower: int, tick_upper: int, tick_spacing: int) -> None:
+        self.persistent_state.tick_spacing = tick_spacing
+        self.persistent_state.position_tick_lower = tick_lower
+        self.persistent_state.position_tick_upper = tick_upper
+
+    def prepare_rebalance(self, snapshot: "Snapshot") -> None:
+        """Build the rebalance bundle for `snapshot` ahead of the trigger, or keep the current one if still fresh."""
+        with self.metrics.time("rebalance_prebuild_seconds"):
+            self.rebalance_candidate = self.state_handler("rebalance", "prepare_rebalance")(self, snapshot)
+
+    @staticmethod
+    def state_handler(name: str, function: Optional[str] = None) -> Callable:
+        """
+        The handler of a state (or another `function` of its module), imported from `states/<name>.py` on first use.
+
+        A run() cycle only executes one or two states, so the state modules (and what
+        they import) are loaded lazily rather than at strategy import time.
+        """
+        key = (name, function or name)
+        handler = _STATE_HANDLERS.get(key)
+        if handler is None:
+            module = importlib.import_module(f".states.{name}", __package__)
+            handler = _STATE_HANDLERS[key] = getattr(module, function or name)
+        return handler
+
+    def run_state(self, name: str):
+        """Run a state handler, timing it per state."""
+        with self.metrics.time("state_seconds", state=name):
+            return self.state_handler(name)(self)
+
     def complete(self) -> None:
         self.persistent_state.current_state = self.State.COMPLETED
         self.persistent_state.current_flowstatus = (
@@ -200,7 +777,8 @@ class MyStrategy(StrategyUniV3):
 
     def log_strategy_balance_metrics(self, action_id: str):
         """Logs strategy balance metrics per action. It is called in the StrategyBase class."""
-        pass
+        # An action of ours just executed: cached balances and position info are stale.
+        self.read_cache.invalidate()
 
     def get_usdc_balance(self) -> int:
         return self.get_token_balance(self.USDC_ADDRESS)
@@ -209,13 +787,198 @@ class MyStrategy(StrategyUniV3):
         return self.get_token_balance(self.ETH_ADDRESS)
 
     def get_token_balance(self, token_address: str) -> int:
-        """Get the balance of a token for the strategy's wallet address."""
-        return self.uniswap_v3.get_token_balance(token_address, self.wallet_address)
+        """Get the balance of a token for the strategy's wallet address (cached per block)."""
+        return self.read_cache.get(
+            "get_token_balance",
+            (token_address.lower(),),
+            lambda: self._sdk_call("get_token_balance", token_address, self.wallet_address),
+        )
+
+    @property
+    def allowances(self) -> "AllowanceCache":
+        """
+        The wallet's allowance cache, backed by the current persistent state.
+
+        Built on first use; approvals are limited to what the role permissions allow.
+        """
+        if self._allowances is None:
+            from .utils.allowances import AllowanceCache, SpenderPolicy
+
+            self._allowances = AllowanceCache(
+                self._read_allowance,
+                SpenderPolicy.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     "presets", "default", "permissions.json")),
+            )
+        self._allowances.store = self.persistent_state.allowances
+        return self._allowances
+
+    def approval_amount(self, amount: int) -> int:
+        """Amount to approve for a spend of `amount`: exactly it, or unlimited with `unlimited_approvals`."""
+        from .utils.allowances import MAX_UINT256
+
+        return MAX_UINT256 if self.config.unlimited_approvals else amount
+
+    def _read_allowance(self, token_address: str, spender: str) -> int:
+        from .utils.allowances import read_allowance
+
+        self.metrics.inc("sdk_calls_total", method="allowance")
+        with self.metrics.time("sdk_call_seconds", method="allowance"):
+            return read_allowance(self.web3, token_address, self.wallet_address, spender)
 
     def get_current_eth_price(self) -> float:
-        """Get the current ETH price from the pool."""
-        return self.uniswap_v3.get_pool_spot_rate(self.pool_address)
+        """Get the current ETH price from the pool (cached per block)."""
+        return self.read_cache.get(
+            "get_current_eth_price",
+            (),
+            lambda: self._sdk_call("get_pool_spot_rate", self.pool_address),
+        )
 
     def get_active_position_info(self, position_id: int) -> tuple:
-        """Get information about an active liquidity position."""
-        return self.uniswap_v3.get_position_info(position_id)
+        """Get information about an active liquidity position (cached per block)."""
+        return self.read_cache.get(
+            "get_active_position_info",
+            (position_id,),
+            lambda: self._sdk_call("get_position_info", position_id),
+        )
+
+    def _sdk_call(self, method: str, *args):
+        """Call an SDK read, counting and timing it per method."""
+        self.metrics.inc("sdk_calls_total", method=method)
+        with self.metrics.time("sdk_call_seconds", method=method):
+            return getattr(self.uniswap_v3, method)(*args)
+
+    def _rpc_transport_metrics(self):
+        """Per-method JSON-RPC request counts and latency from the transport, read at export time."""
+        for method, latency in self.rpc_transport.latency_summary().items():
+            labels = {"strategy": str(self.id), "method": method}
+            yield "counter", "rpc_requests_total", labels, latency["count"]
+            yield "gauge", "rpc_latency_mean_seconds", labels, latency["mean_ms"] / 1000
+            yield "gauge", "rpc_latency_max_seconds", labels, latency["max_ms"] / 1000
+        labels = {"strategy": str(self.id)}
+        yield "counter", "rpc_http_requests_total", labels, self.rpc_transport.stats["http_requests"]
+        yield "counter", "rpc_coalesced_total", labels, self.rpc_transport.stats["coalesced"]
+
+    def get_pool_simulator(self, snapshot: Optional["Snapshot"] = None) -> Optional["PoolSimulator"]:
+        """
+        The pool simulator at the snapshot's block, for swap and mint quotes without RPC calls.
+
+        Loaded with three Multicall3 reads (pool state, tick bitmap, initialized ticks) the
+        first time a block is quoted; None when `use_multicall` is disabled.
+        """
+        if not self.config.use_multicall:
+            return None
+        snapshot = snapshot or self.get_snapshot()
+        simulator = self._pool_simulator
+        if simulator is None or simulator.block_number != snapshot.block_number:
+            from .utils.pool_sim import PoolSimulator
+
+            self.metrics.inc("sdk_calls_total", method="pool_simulator_load")
+            with self.metrics.time("sdk_call_seconds", method="pool_simulator_load"):
+                simulator = self._pool_simulator = PoolSimulator.load(
+                    self.web3, self.pool_address, self.config.pool_sim_word_radius, snapshot.block_number
+                )
+        return simulator
+
+    def plan_swap(
+        self, snapshot: "Snapshot", tick_lower: int, tick_upper: int, amount_eth: int, amount_usdc: int,
+        min_share: float = 0.001,
+    ) -> "SwapPlan":
+        """
+        The swap after which a mint over [tick_lower, tick_upper) takes both amounts whole.
+
+        Sized on the pool simulator's quotes, price impact included. Without a simulator
+        (`use_multicall` disabled) only the closed-form approximation from the snapshot's
+        price and the fee tier is used, which ignores price impact and can leave part of
+        larger amounts idle. Swaps worth less than `min_share` of the amounts are skipped.
+        """
+        from .utils.swap_sizing import optimal_swap
+
+        simulator = self.get_pool_simulator(snapshot)
+        quote = None
+        if simulator is not None:
+            def quote(zero_for_one: bool, amount_in: int) -> Tuple[int, int]:
+                result = simulator.quote(zero_for_one, amount_in)
+                return result.amount_out, result.sqrt_price_after
+        with self.metrics.time("swap_sizing_seconds"):
+            plan = optimal_swap(
+                snapshot.sqrt_price_x96 or sqrt_ratio_at_tick(self.pool_tick(snapshot)),
+                tick_lower,
+                tick_upper,
+                amount_eth,
+                amount_usdc,
+                fee_pips=500,
+                quote=quote,
+                min_share=min_share,
+            )
+        return plan
+
+    def get_snapshot(self, refresh: bool = False) -> "Snapshot":
+        """
+        Get the chain snapshot for the current run() cycle, reading it on first use.
+
+        All pool, position and balance reads of a cycle come from this one view. With
+        `use_multicall` enabled it is fetched in a single Multicall3 eth_call pinned to
+        one block, otherwise it falls back to the individual SDK reads.
+
+        Args:
+            refresh: Discard the cycle's snapshot and read a new one.
+
+        Returns:
+            Snapshot: The chain state shared by every state handler in this cycle.
+        """
+        if self.snapshot is not None and not refresh:
+            return self.snapshot
+
+        position_id = self.persistent_state.position_id
+        position_id = None if position_id == -1 else position_id
+
+        if self.chain_snapshot is None:
+            from .utils.chain_snapshot import ChainSnapshot
+
+            self.chain_snapshot = ChainSnapshot(
+                self.web3,
+                self.pool_address,
+                self.wallet_address,
+                token0=self.ETH_ADDRESS,
+                token1=self.USDC_ADDRESS,
+                decimals0=self.ETH_DECIMALS,
+                decimals1=self.USDC_DECIMALS,
+            )
+
+        if self.config.use_multicall:
+            self.metrics.inc("sdk_calls_total", method="multicall_snapshot")
+            with self.metrics.time("sdk_call_seconds", method="multicall_snapshot"):
+                self.snapshot = self.chain_snapshot.take(position_id)
+            self._prime_read_cache(self.snapshot, position_id)
+        else:
+            # One block check for the cycle, instead of one per getter
+            self.read_cache.unpin()
+            self.read_cache.pin(self.read_cache.current_block())
+            self.snapshot = self.chain_snapshot.from_reads(
+                spot_price=self.get_current_eth_price(),
+                balances={
+                    self.ETH_ADDRESS: self.get_eth_balance(),
+                    self.USDC_ADDRESS: self.get_usdc_balance(),
+                },
+                position=self.get_active_position_info(position_id) if position_id is not None else None,
+                reads=3 if position_id is None else 4,
+            )
+
+        self.log.debug(
+            "Chain snapshot",
+            block=self.snapshot.block_number,
+            reads=self.snapshot.reads,
+            round_trips=self.snapshot.round_trips,
+            round_trips_saved_total=self.chain_snapshot.stats["round_trips_saved"],
+        )
+        return self.snapshot
+
+    def _prime_read_cache(self, snapshot: "Snapshot", position_id: Optional[int]) -> None:
+        """Seed the read cache with a snapshot's values and key its lookups off the snapshot's block."""
+        block = snapshot.block_number
+        self.read_cache.pin(block)
+        self.read_cache.put("get_current_eth_price", (), snapshot.spot_price, block)
+        for token, balance in snapshot.balances.items():
+            self.read_cache.put("get_token_balance", (token,), balance, block)
+        if position_id is not None:
+            self.read_cache.put("get_active_position_info", (position_id,), snapshot.position, block)
@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from ..utils.monitor_scheduler import MonitorScheduler, log_distance, realized_variance_rate
+
+SCHEDULER = MonitorScheduler(min_interval=2.0, max_interval=300.0, safety=0.1)
+
+
+@pytest.mark.parametrize("distance, variance_rate", [
+    (None, 1e-8),  # No position
+    (0.01, None),  # No volatility estimate yet
+    (None, None),
+    (0.0, 1e-8),  # At or outside a bound
+])
+def test_checks_every_min_interval_without_a_position_estimate_or_margin(distance, variance_rate):
+    assert SCHEDULER.next_interval(distance, variance_rate) == SCHEDULER.min_interval
+
+
+def test_quiet_market_relaxes_to_max_interval():
+    assert SCHEDULER.next_interval(0.01, 0.0) == SCHEDULER.max_interval
+    assert SCHEDULER.next_interval(0.5, 1e-12) == SCHEDULER.max_interval
+
+
+def test_interval_is_a_fraction_of_the_expected_exit_time():
+    # 0.1 * 0.01² / 1e-7 = 100 s
+    assert SCHEDULER.next_interval(0.01, 1e-7) == pytest.approx(100.0)
+    # Closer to the bound or more volatile: tighter, down to the floor
+    assert SCHEDULER.next_interval(0.005, 1e-7) == pytest.approx(25.0)
+    assert SCHEDULER.next_interval(0.001, 1e-6) == SCHEDULER.min_interval
+
+
+@pytest.mark.parametrize("distance", [1e-4, 1e-3, 1e-2, 0.1, 1.0])
+@pytest.mark.parametrize("variance_rate", [None, 0.0, 1e-10, 1e-7, 1e-3])
+def test_interval_stays_within_bounds(distance, variance_rate):
+    assert SCHEDULER.min_interval <= SCHEDULER.next_interval(distance, variance_rate) <= SCHEDULER.max_interval
+
+
+def test_never_sleeps_past_a_known_deadline():
+    assert SCHEDULER.next_interval(0.5, 0.0, until_due=30.0) == 30.0
+    # A deadline already due is still checked no faster than one block
+    assert SCHEDULER.next_interval(0.5, 0.0, until_due=-5.0) == SCHEDULER.min_interval
+    assert SCHEDULER.next_interval(0.01, 1e-7, until_due=1000.0) == pytest.approx(100.0)
+
+
+def test_log_distance_to_the_nearer_bound():
+    assert log_distance(3000.0, (2900.0, 3100.0)) == pytest.approx(math.log(3100 / 3000))
+    assert log_distance(2950.0, (2900.0, 3100.0)) == pytest.approx(math.log(2950 / 2900))
+    assert log_distance(2800.0, (2900.0, 3100.0)) == 0.0
+    assert log_distance(3100.0, (2900.0, 3100.0)) == 0.0
+
+
+def test_realized_variance_rate_weights_by_elapsed_time():
+    assert realized_variance_rate([0], [3000.0], since=0) is None
+    # Two equal moves of 1% log return over 10 s
+    prices = [3000.0, 3000.0 * math.exp(0.01), 3000.0]
+    assert realized_variance_rate([0, 4, 10], prices, since=0) == pytest.approx(2 * 0.01 ** 2 / 10)
+    # Samples before `since` are left out
+    assert realized_variance_rate([0, 4, 10], prices, since=4) == pytest.approx(0.01 ** 2 / 6)
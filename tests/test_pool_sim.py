@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from ..utils.pool_sim import PoolSimulator, TickBitmap
+from ..utils.tick_math import Q96, price_to_tick, sqrt_ratio_at_tick
+
+
+def make_pool() -> PoolSimulator:
+    """ETH/USDC-like pool around 3000: a wide position plus a narrow one just below the price."""
+    tick = price_to_tick(3000.0, 18, 6) // 10 * 10 + 5
+    pool = PoolSimulator(sqrt_ratio_at_tick(tick) + 1, tick, 0, 500, 10, {}, TickBitmap(10))
+    pool.add_liquidity(tick - 2005, tick + 1995, 10 ** 17)
+    pool.add_liquidity(tick - 305, tick - 5, 10 ** 17)
+    return pool
+
+
+def test_quote_matches_the_swap_and_leaves_the_pool_unchanged():
+    pool = make_pool()
+    before = pool.to_dict()
+    quote = pool.quote(True, 10 ** 18)
+    assert pool.to_dict() == before
+    executed = pool.swap(True, 10 ** 18)
+    assert (executed.amount_out, executed.sqrt_price_after, executed.tick_after) == (
+        quote.amount_out, quote.sqrt_price_after, quote.tick_after)
+    assert pool.sqrt_price_x96 == quote.sqrt_price_after and pool.tick == quote.tick_after
+
+
+def test_swap_within_one_range_matches_the_constant_liquidity_curve():
+    pool = make_pool()
+    liquidity, sqrt_price = pool.liquidity, pool.sqrt_price_x96 / Q96
+    amount_in = 10 ** 8  # 100 USDC: stays inside the current range
+    quote = pool.quote(False, amount_in)
+    assert quote.ticks_crossed == 0
+    sqrt_after = sqrt_price + amount_in * (1 - 500 / 1e6) / liquidity
+    expected_out = liquidity * (1 / sqrt_price - 1 / sqrt_after)
+    assert quote.amount_out == pytest.approx(expected_out, rel=1e-9)
+
+
+def test_crossing_a_tick_applies_its_liquidity_net():
+    pool = make_pool()
+    start_tick, start_liquidity = pool.tick, pool.liquidity
+    crossed = pool.swap(True, 10 ** 19)  # Sells down into the narrow position
+    assert crossed.ticks_crossed >= 1 and start_tick - 305 <= pool.tick < start_tick - 5
+    assert pool.liquidity == 2 * start_liquidity
+    pool.swap(False, 10 ** 11)  # And back up out of it
+    assert pool.liquidity == start_liquidity
+
+
+def test_exact_output_delivers_the_requested_amount():
+    pool = make_pool()
+    result = pool.swap(False, -10 ** 18, commit=False)
+    assert result.amount_out == 10 ** 18
+    exact_in = pool.quote(False, result.amount_in)
+    assert exact_in.amount_out >= 10 ** 18
+
+
+def test_round_trip_loses_only_fees_and_rounding():
+    pool = make_pool()
+    start = pool.sqrt_price_x96
+    sold = pool.swap(True, 10 ** 18)
+    bought = pool.swap(False, sold.amount_out)
+    assert bought.amount_out < 10 ** 18
+    assert bought.amount_out == pytest.approx(10 ** 18 * (1 - 500 / 1e6) ** 2, rel=1e-6)
+    assert math.isclose(pool.sqrt_price_x96, start, rel_tol=1e-6)
+
+
+def test_dict_round_trip_preserves_quotes():
+    pool = make_pool()
+    copy = PoolSimulator.from_dict(pool.to_dict())
+    for zero_for_one, amount in ((True, 10 ** 17), (True, 10 ** 19), (False, 10 ** 9), (False, 10 ** 11)):
+        assert copy.quote(zero_for_one, amount) == pool.quote(zero_for_one, amount)
@@ -0,0 +1,95 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from ..utils.state_codec import BinaryCodec, JsonCodec, StateSchema, get_codec
+from ..utils.state_schema import _V2_SLOTS, PERSISTENT_STATE_SCHEMA
+
+
+def v4_state() -> dict:
+    return {
+        "current_state": "MONITOR_PRICE",
+        "current_substate": "NO_SUBSTATE",
+        "current_flowstatus": "PREPARING_ACTION",
+        "current_actions": [uuid4(), uuid4()],
+        "sadflow_counter": 0,
+        "sadflow_actions": [],
+        "not_included_counter": 2,
+        "position_id": 1234,
+        "eth_usdc_position_id": 1234,
+        "retry_count": 0,
+        "last_check_time": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "last_rebalance_time": None,
+        "last_rebalance_timestamp": 1_714_566_600.5,
+        "last_eth_price": 3012.25,
+        "position_tick_lower": -196_460,
+        "position_tick_upper": -196_050,
+        "tick_spacing": 10,
+        "price_history": None,
+        "rebalance_history": None,
+        "volatility": None,
+        "allowances": {"0xtoken:0xspender": 10 ** 24},
+        "initialized": True,
+    }
+
+
+@pytest.mark.parametrize("codec_name", ["json", "binary"])
+def test_codec_round_trips_the_current_schema(codec_name):
+    codec = get_codec(codec_name, PERSISTENT_STATE_SCHEMA)
+    state = v4_state()
+    generation, decoded = codec.decode(codec.encode(state, generation=7))
+    assert generation == 7
+    # JSON keeps UUIDs and datetimes as text, the binary codec restores them
+    assert [str(action) for action in decoded["current_actions"]] == [str(action) for action in state["current_actions"]]
+    for field in ("position_id", "last_eth_price", "position_tick_lower", "allowances", "initialized", "last_rebalance_time"):
+        assert decoded[field] == state[field]
+    assert datetime.fromisoformat(str(decoded["last_check_time"])) == state["last_check_time"]
+
+
+def test_v1_json_snapshot_migrates_to_v4():
+    # v1 documents had no schema_version and kept the position id as an untyped extra field
+    payload = json.dumps({
+        "generation": 3,
+        "state": {"current_state": "MONITOR_PRICE", "position_id": -1, "eth_usdc_position_id": 987},
+    }).encode()
+    generation, data = JsonCodec(PERSISTENT_STATE_SCHEMA).decode(payload)
+    assert generation == 3
+    assert data["position_id"] == 987
+    assert data["last_rebalance_timestamp"] is None
+    assert data["allowances"] == {}
+    assert data["volatility"] is None
+
+
+def test_v1_migration_keeps_a_position_id_already_set():
+    payload = json.dumps({"generation": 1, "state": {"position_id": 5, "eth_usdc_position_id": 987}}).encode()
+    _, data = JsonCodec(PERSISTENT_STATE_SCHEMA).decode(payload)
+    assert data["position_id"] == 5
+
+
+def test_v2_binary_snapshot_decodes_with_its_layout_and_migrates():
+    state = {key: value for key, value in v4_state().items() if key not in ("volatility", "allowances")}
+    payload = BinaryCodec(StateSchema(2, _V2_SLOTS)).encode(state, generation=11)
+    generation, data = BinaryCodec(PERSISTENT_STATE_SCHEMA).decode(payload)
+    assert generation == 11
+    assert data["position_tick_upper"] == state["position_tick_upper"]
+    assert data["last_eth_price"] == state["last_eth_price"]
+    assert data["allowances"] == {}
+    assert data["volatility"] is None
+
+
+def test_newer_schema_versions_are_rejected():
+    payload = BinaryCodec(StateSchema(PERSISTENT_STATE_SCHEMA.version + 1, [])).encode({}, generation=1)
+    with pytest.raises(ValueError):
+        BinaryCodec(PERSISTENT_STATE_SCHEMA).decode(payload)
+    with pytest.raises(ValueError):
+        JsonCodec(PERSISTENT_STATE_SCHEMA).decode(json.dumps(
+            {"generation": 1, "schema_version": PERSISTENT_STATE_SCHEMA.version + 1, "state": {}}).encode())
+
+
+def test_unknown_codecs_and_slot_kinds_are_rejected():
+    with pytest.raises(ValueError):
+        get_codec("pickle", PERSISTENT_STATE_SCHEMA)
+    with pytest.raises(ValueError):
+        StateSchema(1, [("field", "complex")])
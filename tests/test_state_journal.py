@@ -0,0 +1,102 @@
+import os
+
+from ..utils.state_codec import BinaryCodec
+from ..utils.state_journal import StateJournal
+from ..utils.state_schema import PERSISTENT_STATE_SCHEMA
+
+
+def reopen(journal: StateJournal) -> StateJournal:
+    return StateJournal(journal.directory, journal.name, journal.compact_every, journal.codec)
+
+
+def test_load_without_a_snapshot_returns_none(tmp_path):
+    assert StateJournal(str(tmp_path)).load() is None
+
+
+def test_replays_sets_and_appends_in_order(tmp_path):
+    journal = StateJournal(str(tmp_path))
+    journal.compact({"position_id": -1, "last_eth_price": 3000.0})
+    journal.append({"position_id": 42}, {"price_history": [[1, 3001.0]]})
+    journal.append({"last_eth_price": 3005.5}, {"price_history": [[2, 3005.5]]})
+
+    data, appends = reopen(journal).load()
+    assert data == {"position_id": 42, "last_eth_price": 3005.5}
+    assert appends == {"price_history": [[1, 3001.0], [2, 3005.5]]}
+
+
+def test_setting_a_field_drops_the_rows_appended_before_it(tmp_path):
+    journal = StateJournal(str(tmp_path))
+    journal.compact({"price_history": ""})
+    journal.append({}, {"price_history": [[1, 3000.0]]})
+    journal.append({"price_history": "rebuilt"}, {})
+    journal.append({}, {"price_history": [[2, 3001.0]]})
+
+    data, appends = reopen(journal).load()
+    assert data["price_history"] == "rebuilt"
+    assert appends == {"price_history": [[2, 3001.0]]}
+
+
+def test_torn_last_line_is_ignored_and_truncated(tmp_path):
+    journal = StateJournal(str(tmp_path))
+    journal.compact({"position_id": -1})
+    journal.append({"position_id": 1}, {})
+    journal.append({"position_id": 2}, {})
+    good_size = os.path.getsize(journal.journal_path())
+    with open(journal.journal_path(), "rb+") as f:
+        f.seek(-5, os.SEEK_END)
+        f.truncate()  # Crash mid-write of the last entry
+
+    reloaded = reopen(journal)
+    data, _ = reloaded.load()
+    assert data["position_id"] == 1
+    assert reloaded.entries == 1
+    assert os.path.getsize(journal.journal_path()) < good_size
+
+    # New entries go after the last good one and replay normally
+    reloaded.append({"position_id": 3}, {})
+    data, _ = reopen(journal).load()
+    assert data["position_id"] == 3
+
+
+def test_corrupt_entry_stops_the_replay(tmp_path):
+    journal = StateJournal(str(tmp_path))
+    journal.compact({"position_id": -1})
+    journal.append({"position_id": 1}, {})
+    journal.append({"position_id": 2}, {})
+    journal.append({"position_id": 3}, {})
+    with open(journal.journal_path(), "rb") as f:
+        lines = f.readlines()
+    lines[1] = lines[1].replace(b"\"position_id\":2", b"\"position_id\":7")  # Checksum no longer matches
+    with open(journal.journal_path(), "wb") as f:
+        f.writelines(lines)
+
+    data, _ = reopen(journal).load()
+    assert data["position_id"] == 1
+
+
+def test_compaction_starts_a_new_generation(tmp_path):
+    journal = StateJournal(str(tmp_path), compact_every=2)
+    journal.compact({"position_id": -1})
+    old_journal = journal.journal_path()
+    journal.append({"position_id": 1}, {})
+    journal.append({"position_id": 2}, {})
+    assert journal.needs_compaction()
+
+    journal.compact({"position_id": 2})
+    assert not os.path.exists(old_journal)
+    assert journal.entries == 0
+
+    reloaded = reopen(journal)
+    data, appends = reloaded.load()
+    assert reloaded.generation == journal.generation
+    assert data == {"position_id": 2} and appends == {}
+
+
+def test_snapshot_in_another_codec_is_still_loaded(tmp_path):
+    StateJournal(str(tmp_path)).compact({"position_id": 9, "current_state": "MONITOR_PRICE"})
+
+    journal = StateJournal(str(tmp_path), codec=BinaryCodec(PERSISTENT_STATE_SCHEMA))
+    data, _ = journal.load()
+    assert data["position_id"] == 9
+    journal.compact(data)
+    assert os.listdir(tmp_path) == [os.path.basename(journal.snapshot_path)]
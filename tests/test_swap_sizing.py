@@ -0,0 +1,86 @@
+import pytest
+
+from ..utils.pool_sim import PoolSimulator, TickBitmap
+from ..utils.swap_sizing import mint_ratio, optimal_swap
+from ..utils.tick_math import Q96, price_to_tick, range_ticks, sqrt_ratio_at_tick
+
+FEE = 500
+
+
+def make_pool(liquidity: int) -> PoolSimulator:
+    """ETH/USDC-like pool around 3000 with one position of `liquidity` over ±20%."""
+    tick = price_to_tick(3000.0, 18, 6)
+    pool = PoolSimulator(sqrt_ratio_at_tick(tick) + 12345, tick, 0, FEE, 10, {}, TickBitmap(10))
+    lower, upper = range_ticks(tick, 0.2, 10)
+    pool.add_liquidity(lower, upper, liquidity)
+    return pool
+
+
+def idle_share(pool: PoolSimulator, tick_lower: int, tick_upper: int, eth: int, usdc: int, plan) -> float:
+    """Share of the starting value a mint leaves behind after executing `plan` on the pool."""
+    price = (pool.sqrt_price_x96 / Q96) ** 2
+    total = eth * price + usdc
+    after = PoolSimulator.from_dict(pool.to_dict())
+    if plan.needed:
+        executed = after.swap(plan.zero_for_one, plan.amount_in)
+        eth, usdc = (eth - plan.amount_in, usdc + executed.amount_out) if plan.zero_for_one else (
+            eth + executed.amount_out, usdc - plan.amount_in)
+    _, used0, used1 = after.mint_quote(tick_lower, tick_upper, eth, usdc)
+    return ((eth - used0) * price + usdc - used1) / total
+
+
+def quoter(pool: PoolSimulator):
+    def quote(zero_for_one: bool, amount_in: int):
+        result = pool.quote(zero_for_one, amount_in)
+        return result.amount_out, result.sqrt_price_after
+    return quote
+
+
+@pytest.mark.parametrize("eth, usdc", [(0, 10 ** 11), (3 * 10 ** 19, 0), (3 * 10 ** 19, 2 * 10 ** 10)])
+def test_quoted_sizing_leaves_balances_the_mint_takes_whole(eth, usdc):
+    pool = make_pool(10 ** 16)  # Thin enough for these swaps to move the price
+    tick_lower, tick_upper = range_ticks(pool.tick, 0.02, 10)
+    plan = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, eth, usdc, FEE, quote=quoter(pool))
+    assert plan.needed
+    assert plan.expected_out == pool.quote(plan.zero_for_one, plan.amount_in).amount_out
+    assert idle_share(pool, tick_lower, tick_upper, eth, usdc, plan) < 1e-5
+
+
+def test_closed_form_is_close_without_price_impact():
+    pool = make_pool(10 ** 22)
+    tick_lower, tick_upper = range_ticks(pool.tick, 0.02, 10)
+    plan = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, 0, 10 ** 9, FEE)
+    assert not plan.zero_for_one
+    assert idle_share(pool, tick_lower, tick_upper, 0, 10 ** 9, plan) < 1e-4
+
+
+def test_closed_form_alone_ignores_price_impact():
+    # The approximation documented in optimal_swap: on a thin pool it leaves a visible remainder
+    pool = make_pool(10 ** 16)
+    tick_lower, tick_upper = range_ticks(pool.tick, 0.02, 10)
+    closed = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, 0, 10 ** 11, FEE)
+    quoted = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, 0, 10 ** 11, FEE, quote=quoter(pool))
+    assert idle_share(pool, tick_lower, tick_upper, 0, 10 ** 11, closed) > 1e-3
+    assert idle_share(pool, tick_lower, tick_upper, 0, 10 ** 11, quoted) < 1e-5
+
+
+def test_balances_already_in_ratio_need_no_swap():
+    pool = make_pool(10 ** 22)
+    tick_lower, tick_upper = range_ticks(pool.tick, 0.02, 10)
+    ratio = mint_ratio(pool.sqrt_price_x96, tick_lower, tick_upper)
+    eth = 10 ** 18
+    usdc = int(eth * ratio * 1.0005)
+    plan = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, eth, usdc, FEE)
+    assert not plan.needed
+    assert plan.balances_after(eth, usdc) == (eth, usdc)
+
+
+def test_out_of_range_target_swaps_everything_to_the_far_side():
+    pool = make_pool(10 ** 22)
+    # Range entirely above the price: the mint takes only token0 (ETH)
+    tick_lower, tick_upper = pool.tick + 1000, pool.tick + 2000
+    assert mint_ratio(pool.sqrt_price_x96, tick_lower, tick_upper) is None
+    plan = optimal_swap(pool.sqrt_price_x96, tick_lower, tick_upper, 10 ** 18, 5 * 10 ** 9, FEE, quote=quoter(pool))
+    assert not plan.zero_for_one and plan.amount_in == 5 * 10 ** 9
+    eth, usdc = plan.balances_after(10 ** 18, 5 * 10 ** 9)
+    assert usdc == 0 and eth > 10 ** 18
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from ..utils.tick_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    TickTable,
+    align_down,
+    price_to_tick,
+    range_ticks,
+    sqrt_ratio_at_tick,
+    tick_at_sqrt_ratio,
+    tick_to_price,
+)
+
+ETH_DECIMALS, USDC_DECIMALS = 18, 6
+
+
+def sample_ticks(count: int = 500, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    ticks = [rng.randint(MIN_TICK, MAX_TICK) for _ in range(count)]
+    # Around the ETH/USDC price, where the strategy's ranges live
+    ticks += [rng.randint(-210_000, -180_000) for _ in range(count)]
+    return ticks + [MIN_TICK, MAX_TICK, -1, 0, 1]
+
+
+def test_price_to_tick_round_trips_tick_to_price():
+    for tick in sample_ticks():
+        price = tick_to_price(tick, ETH_DECIMALS, USDC_DECIMALS)
+        assert price_to_tick(price, ETH_DECIMALS, USDC_DECIMALS) == tick
+
+
+def test_price_to_tick_is_the_largest_tick_at_or_below_the_price():
+    rng = random.Random(2)
+    for _ in range(1000):
+        price = rng.uniform(100, 100_000)
+        tick = price_to_tick(price, ETH_DECIMALS, USDC_DECIMALS)
+        assert tick_to_price(tick, ETH_DECIMALS, USDC_DECIMALS) <= price
+        assert tick_to_price(tick + 1, ETH_DECIMALS, USDC_DECIMALS) > price
+
+
+def test_sqrt_ratio_matches_the_pool_at_the_tick_limits():
+    assert sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert sqrt_ratio_at_tick(0) == 1 << 96
+
+
+def test_tick_at_sqrt_ratio_round_trips_sqrt_ratio_at_tick():
+    for tick in sample_ticks():
+        if tick == MAX_TICK:
+            continue  # MAX_SQRT_RATIO itself is out of the pool's price range
+        assert tick_at_sqrt_ratio(sqrt_ratio_at_tick(tick)) == tick
+        # Any price short of the next tick's ratio still reports this tick
+        assert tick_at_sqrt_ratio(sqrt_ratio_at_tick(tick + 1) - 1) == tick
+    with pytest.raises(ValueError):
+        tick_at_sqrt_ratio(MAX_SQRT_RATIO)
+
+
+@pytest.mark.parametrize("tick", [MIN_TICK - 1, MAX_TICK + 1])
+def test_sqrt_ratio_at_tick_rejects_ticks_out_of_range(tick):
+    with pytest.raises(ValueError):
+        sqrt_ratio_at_tick(tick)
+
+
+def test_range_ticks_cover_the_width_and_align_to_the_spacing():
+    for center in (-196_256, -196_250, 0, 12_345):
+        lower, upper = range_ticks(center, 0.02, 10)
+        assert lower % 10 == 0 and upper % 10 == 0
+        assert tick_to_price(lower, 0, 0) <= tick_to_price(center, 0, 0) * 0.98
+        assert tick_to_price(upper, 0, 0) >= tick_to_price(center, 0, 0) * 1.02
+
+
+def test_tick_table_agrees_with_exact_conversion():
+    lower, upper = range_ticks(-196_256, 0.02, 10)
+    table = TickTable(lower, upper, 10, ETH_DECIMALS, USDC_DECIMALS)
+    for tick in range(lower - 500, upper + 500, 10):
+        price = tick_to_price(tick, ETH_DECIMALS, USDC_DECIMALS)
+        assert table.tick_at(price) == tick
+        # Halfway to the next tick still maps down to this one
+        assert table.tick_at(price * 1.00005) == tick
+    for price in (10.0, 1e6):
+        assert table.tick_at(price) == align_down(price_to_tick(price, ETH_DECIMALS, USDC_DECIMALS), 10)
+
+
+def test_tick_table_contains_matches_the_pool_definition():
+    table = TickTable(-196_450, -196_050, 10, ETH_DECIMALS, USDC_DECIMALS)
+    assert table.contains(-196_450)
+    assert table.contains(-196_051)
+    assert not table.contains(-196_050)
+    assert not table.contains(-196_451)
@@ -0,0 +1,67 @@
+import pytest
+
+from ..utils.triggers import AllOf, Observation, PriceDeviation, TimeElapsed, TriggerEngine, compile_rule
+
+
+def observe(price: float, timestamp: float = 0.0, **kwargs) -> Observation:
+    return Observation(price=price, timestamp=timestamp, reference_price=3000.0, **kwargs)
+
+
+def test_price_deviation_hysteresis_holds_until_the_move_falls_back():
+    rule = PriceDeviation(0.02, hysteresis=0.005)
+    # deviations: 1.9%, 2.1% (fires), 1.8% (held above 1.5%), 1.4% (released), 1.9% (below 2% again)
+    fired = [rule.evaluate(observe(3000.0 * (1 + move))) for move in (0.019, 0.021, 0.018, 0.014, 0.019)]
+    assert fired == [False, True, True, False, False]
+
+
+def test_price_deviation_without_hysteresis_flips_at_the_threshold():
+    rule = PriceDeviation(0.02)
+    fired = [rule.evaluate(observe(3000.0 * (1 + move))) for move in (0.021, 0.019, 0.021)]
+    assert fired == [True, False, True]
+
+
+def test_price_deviation_volatility_threshold_and_reset():
+    rule = PriceDeviation("volatility", hysteresis=0.01)
+    assert rule.evaluate(observe(3000.0 * 0.96, volatility_threshold=0.03))
+    rule.reset()
+    # Without the carried state the 2.5% move is below the 3% threshold
+    assert not rule.evaluate(observe(3000.0 * 0.975, volatility_threshold=0.03))
+
+
+def test_price_deviation_without_a_reference_never_fires():
+    rule = PriceDeviation(0.0)
+    assert not rule.evaluate(Observation(price=3100.0, timestamp=0.0))
+
+
+def test_all_of_keeps_every_childs_hysteresis_current():
+    rule = AllOf([PriceDeviation(0.02, hysteresis=0.005), TimeElapsed(3600)])
+    # Time not elapsed yet, but the deviation rule must still latch
+    assert not rule.evaluate(observe(3000.0 * 1.021, timestamp=100.0, opened_at=0.0))
+    assert rule.evaluate(observe(3000.0 * 1.018, timestamp=4000.0, opened_at=0.0))
+
+
+def test_engine_reports_every_rule_that_fired_in_declaration_order():
+    engine = TriggerEngine.compile([
+        {"rule": "position_bounds"},
+        {"name": "time_interval", "all": [
+            {"rule": "time_elapsed", "seconds": 3600},
+            {"rule": "price_deviation", "threshold": 0.01},
+        ]},
+        {"rule": "price_deviation", "threshold": 0.05, "name": "large_move"},
+    ])
+    assert engine.evaluate(observe(3000.0, timestamp=10.0, in_range=True, opened_at=0.0)) == []
+    assert engine.evaluate(observe(3000.0 * 1.06, timestamp=4000.0, in_range=False, opened_at=0.0)) == [
+        "position_bounds", "time_interval", "large_move",
+    ]
+
+
+@pytest.mark.parametrize("spec", [
+    {"rule": "unknown"},
+    {"rule": "price_deviation", "threshold": "high"},
+    {"rule": "time_elapsed", "minutes": 5},
+    {"all": []},
+    {"any": [{"rule": "position_bounds"}], "rule": "time_elapsed"},
+])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        compile_rule(spec)
@@ -0,0 +1,88 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from ..utils.volatility import VolatilityStats
+
+
+def price_walk(periods: int, period: int = 900, per_period: int = 3, seed: int = 5) -> list:
+    """(timestamp, price) observations, `per_period` per period, of a random log walk."""
+    rng = random.Random(seed)
+    price, rows = 3000.0, []
+    for index in range(periods * per_period):
+        price *= math.exp(rng.gauss(0, 0.004))
+        rows.append((index * period // per_period, price))
+    return rows
+
+
+def period_closes(rows: list, period: int) -> list:
+    closes = {}
+    for timestamp, price in rows:
+        closes[timestamp - timestamp % period] = price
+    return [closes[bucket] for bucket in sorted(closes)]
+
+
+def test_rolling_sigma_matches_the_window_of_closed_returns():
+    stats = VolatilityStats(period=900, window=20)
+    rows = price_walk(200)
+    for timestamp, price in rows:
+        stats.update(timestamp, price)
+    closes = period_closes(rows, 900)[:-1]  # The last period is still open
+    returns = [math.log(b / a) for a, b in zip(closes, closes[1:])]
+    assert len(stats) == 20
+    assert stats.sigma == pytest.approx(statistics.stdev(returns[-20:]), rel=1e-9)
+
+
+def test_estimates_need_enough_history():
+    stats = VolatilityStats(period=900, window=20)
+    assert stats.sigma is None and stats.variance_rate() is None
+    assert stats.range_width(3600, 2.0, 0.01, 0.1, default=0.02) == 0.02
+    assert stats.rebalance_threshold(0.005) == 0.005
+    for timestamp, price in price_walk(3):
+        stats.update(timestamp, price)
+    assert stats.range_width(3600, 2.0, 0.01, 0.1, default=0.02) == 0.02
+
+
+def test_range_width_stays_within_bounds():
+    stats = VolatilityStats(period=900, window=20)
+    for timestamp, price in price_walk(50):
+        stats.update(timestamp, price)
+    assert stats.range_width(3600, 2.0, 0.01, 0.1, default=0.02) == pytest.approx(
+        2.0 * math.sqrt(stats.variance_rate() * 3600))
+    assert stats.range_width(60, 2.0, 0.05, 0.1, default=0.02) == 0.05
+    assert stats.range_width(10 ** 8, 2.0, 0.01, 0.1, default=0.02) == 0.1
+
+
+def test_stale_and_non_positive_observations_are_ignored():
+    stats = VolatilityStats(period=900, window=20)
+    for timestamp, price in price_walk(10):
+        stats.update(timestamp, price)
+    before = stats.to_bytes()
+    stats.update(0, 1.0)  # Older than the current period
+    stats.update(10 ** 6, 0.0)
+    assert stats.to_bytes() == before
+
+
+def test_packed_and_replayed_state_match_the_original():
+    rows = price_walk(60)
+    stats = VolatilityStats(period=900, window=20)
+    for timestamp, price in rows[:100]:
+        stats.update(timestamp, price)
+    restored = VolatilityStats.decode(stats.encode())
+    stats.drain_changes()
+
+    for timestamp, price in rows[100:]:
+        stats.update(timestamp, price)
+    restored.replay(stats.drain_changes())
+    assert restored.to_bytes() == stats.to_bytes()
+    assert (restored.sigma, restored.ewma_sigma, restored.relative_atr) == (
+        stats.sigma, stats.ewma_sigma, stats.relative_atr)
+
+
+def test_decode_accepts_empty_values():
+    assert len(VolatilityStats.decode(None)) == 0
+    assert len(VolatilityStats.decode("")) == 0
+    with pytest.raises(ValueError):
+        VolatilityStats.from_bytes(b"XXXX" + bytes(200))
@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Callable, Dict, Iterable, Mapping, MutableMapping, Optional, Set
+
+from eth_abi import decode
+from eth_utils import to_checksum_address
+
+from .chain_snapshot import encode_call
+
+MAX_UINT256 = (1 << 256) - 1
+APPROVE_SELECTOR = "0x095ea7b3"
+
+# Zodiac Roles v2 encodings used by permissions.json
+CLEARANCE_TARGET = 1  # Every function of the target is allowed
+CLEARANCE_FUNCTION = 2  # Only the listed functions, under their conditions
+OPERATOR_PASS = 0
+OPERATOR_OR = 2
+OPERATOR_MATCHES = 5
+OPERATOR_EQUAL_TO = 16
+
+
+def read_allowance(web3, token: str, owner: str, spender: str) -> int:
+    """ERC20 `allowance(owner, spender)` of `token`, read with one eth_call."""
+    data = encode_call("allowance(address,address)", ["address", "address"], [owner, spender])
+    raw = web3.eth.call({"to": to_checksum_address(token), "data": "0x" + data.hex()})
+    return decode(["uint256"], bytes(raw))[0]
+
+
+class SpenderPolicy:
+    """
+    The spenders each token may be approved for, as allowed by the wallet's role permissions.
+
+    Built from the targets in `presets/<preset>/permissions.json`: a token cleared as a
+    whole allows any spender, a token cleared per function allows the spenders its
+    `approve` condition pins the first parameter to. Tokens not listed, and conditions
+    this parser does not understand, allow no spender: an approval the roles modifier
+    would reject is never built.
+    """
+
+    def __init__(self, spenders: Optional[Mapping[str, Optional[Set[str]]]] = None):
+        # token -> allowed spenders (None: any); no mapping at all means unconstrained
+        self.spenders = None if spenders is None else {
+            token.lower(): None if allowed is None else {spender.lower() for spender in allowed}
+            for token, allowed in spenders.items()
+        }
+
+    @classmethod
+    def from_targets(cls, targets: Iterable[dict]) -> "SpenderPolicy":
+        spenders: Dict[str, Optional[Set[str]]] = {}
+        for target in targets:
+            if target.get("clearance") == CLEARANCE_TARGET:
+                spenders[target["address"]] = None
+            elif target.get("clearance") == CLEARANCE_FUNCTION:
+                for function in target.get("functions", []):
+                    if function.get("selector", "").lower() == APPROVE_SELECTOR:
+                        spenders[target["address"]] = _approve_spenders(function)
+        return cls(spenders)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SpenderPolicy":
+        """The policy of a permissions.json; unconstrained when the file does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls.from_targets(json.load(f))
+
+    def allows(self, token: str, spender: str) -> bool:
+        if self.spenders is None:
+            return True
+        if token.lower() not in self.spenders:
+            return False
+        allowed = self.spenders[token.lower()]
+        return allowed is None or spender.lower() in allowed
+
+
+def _approve_spenders(function: dict) -> Optional[Set[str]]:
+    if function.get("wildcarded"):
+        return None
+    condition = function.get("condition")
+    if not condition or condition.get("operator") != OPERATOR_MATCHES or not condition.get("children"):
+        return set()
+    spender = condition["children"][0]
+    if spender.get("operator") == OPERATOR_PASS:
+        return None
+    options = spender.get("children", []) if spender.get("operator") == OPERATOR_OR else [spender]
+    return {
+        "0x" + option["compValue"][-40:].lower()
+        for option in options if option.get("operator") == OPERATOR_EQUAL_TO
+    }
+
+
+class AllowanceCache:
+    """
+    (token, spender) allowances of the strategy wallet, kept in the persistent state.
+
+    A cached allowance only ever errs low: approvals are not recorded until read back
+    from the chain (the approve may still fail), while spends are deducted as soon as
+    the action spending them is handed to execution. So a cached value that covers an
+    amount is trusted without a read, and a value that does not is re-read once before
+    an approval is asked for (unless the caller only builds speculatively).
+    `stats["approvals"]` counts approvals handed to execution (`approving`).
+    """
+
+    def __init__(self, read: Callable[[str, str], int], policy: Optional[SpenderPolicy] = None):
+        self.read = read
+        self.policy = policy or SpenderPolicy()
+        self.store: MutableMapping[str, int] = {}
+        self.stats = {"hits": 0, "reads": 0, "approvals": 0}
+
+    @staticmethod
+    def key(token: str, spender: str) -> str:
+        return f"{token.lower()}:{spender.lower()}"
+
+    def get(self, token: str, spender: str, refresh: bool = False) -> int:
+        """The allowance of `spender` over `token`, read from the chain if not cached (or `refresh`)."""
+        key = self.key(token, spender)
+        if refresh or key not in self.store:
+            self.stats["reads"] += 1
+            self.store[key] = self.read(token, spender)
+        return self.store[key]
+
+    def required(self, token: str, spender: str, amount: int, refresh: bool = True) -> bool:
+        """
+        Whether `spender` must be approved before it can spend `amount` of `token`.
+
+        Args:
+            token: Token to spend.
+            spender: Contract spending it.
+            amount: Amount to spend.
+            refresh: Re-read a cached allowance that falls short before answering; without
+                it the cached value decides (for actions that may never be executed).
+
+        Raises:
+            ValueError: If an approval is needed but the wallet's permissions do not allow
+                approving `spender`.
+        """
+        key = self.key(token, spender)
+        if self.store.get(key, -1) >= amount:
+            self.stats["hits"] += 1
+            return False
+        if refresh and self.get(token, spender, refresh=True) >= amount:
+            return False
+        if not self.policy.allows(token, spender):
+            raise ValueError(f"Permissions do not allow approving {spender} for {token}")
+        return True
+
+    def approving(self, token: str, spender: str) -> None:
+        """An approve action was handed to execution: the allowance is read back from the chain on next use."""
+        self.stats["approvals"] += 1
+        self.store.pop(self.key(token, spender), None)
+
+    def spent(self, token: str, spender: str, amount: int) -> None:
+        """An action spending `amount` through `spender` was handed to execution."""
+        key = self.key(token, spender)
+        if key in self.store and self.store[key] != MAX_UINT256:  # Infinite approvals are not decreased
+            self.store[key] = max(self.store[key] - amount, 0)
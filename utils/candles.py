@@ -0,0 +1,64 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class Candles:
+    """Price series as parallel NumPy columns, timestamps in epoch seconds."""
+    timestamps: np.ndarray
+    close: np.ndarray
+    volume: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def step(self) -> int:
+        """Median spacing between candles, in seconds."""
+        return int(np.median(np.diff(self.timestamps))) if len(self) > 1 else 0
+
+
+def _to_epoch_seconds(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind in "iuf":
+        values = values.astype(np.int64)
+        # Millisecond timestamps (as exported by most candle APIs)
+        return values // 1000 if values.size and values.max() > 10**11 else values
+    stripped = np.char.replace(np.char.replace(values.astype(str), "Z", ""), "+00:00", "")
+    return stripped.astype("datetime64[s]").astype(np.int64)
+
+
+def load_candles(path: str, price_column: str = "close") -> Candles:
+    """
+    Load candles from a local CSV or Parquet file, sorted by time.
+
+    The file needs a `timestamp` column (epoch seconds/milliseconds or ISO-8601) and a
+    price column (`close` by default); a `volume` column (in USD) enables fee estimates.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pandas with pyarrow installed")
+        frame = pd.read_parquet(path)
+        columns = {name: frame[name].to_numpy() for name in frame.columns}
+    elif ext == ".csv":
+        table = np.genfromtxt(path, delimiter=",", names=True, dtype=None, encoding="utf-8")
+        columns = {name: np.atleast_1d(table[name]) for name in table.dtype.names}
+    else:
+        raise ValueError(f"Unsupported candle file type: {ext}")
+
+    if "timestamp" not in columns or price_column not in columns:
+        raise ValueError(f"Candle file needs 'timestamp' and '{price_column}' columns, has {list(columns)}")
+
+    timestamps = _to_epoch_seconds(np.asarray(columns["timestamp"]))
+    order = np.argsort(timestamps, kind="stable")
+    volume = columns.get("volume")
+    return Candles(
+        timestamps=timestamps[order],
+        close=np.asarray(columns[price_column], dtype=np.float64)[order],
+        volume=np.asarray(volume, dtype=np.float64)[order] if volume is not None else None,
+    )
@@ -0,0 +1,230 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+from .tick_math import tick_to_price
+
+# Multicall3 is deployed at the same address on every EVM chain, Base included.
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# Uniswap V3 NonfungiblePositionManager on Base.
+POSITION_MANAGER_ADDRESS = "0x03a520b32C04BF3bEEf7BEb72E919cf822Ed34f1"
+
+SLOT0_TYPES = ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"]
+POSITIONS_TYPES = [
+    "uint96", "address", "address", "address", "uint24", "int24", "int24",
+    "uint128", "uint256", "uint256", "uint128", "uint128",
+]
+
+# Number of separate SDK round trips one MONITOR_PRICE tick used to make for the
+# same data: spot rate, position info, two tick_to_price conversions and two balances.
+SDK_READS_PER_CYCLE = 6
+
+
+def selector(signature: str) -> bytes:
+    """Return the 4-byte function selector for a solidity signature."""
+    return function_signature_to_4byte_selector(signature)
+
+
+def encode_call(signature: str, arg_types: Sequence[str] = (), args: Sequence[Any] = ()) -> bytes:
+    """ABI-encode a contract call (selector + arguments)."""
+    return selector(signature) + (encode(list(arg_types), list(args)) if arg_types else b"")
+
+
+def sqrt_price_x96_to_price(sqrt_price_x96: int, decimals0: int, decimals1: int) -> float:
+    """Price of token0 in token1 units for a sqrtPriceX96, adjusted for token decimals."""
+    return (sqrt_price_x96 / 2 ** 96) ** 2 * 10 ** (decimals0 - decimals1)
+
+
+@dataclass
+class MulticallBatch:
+    """
+    Collects contract reads and resolves them in a single Multicall3 `aggregate3` eth_call.
+
+    Every read in the batch is evaluated by the node against the same block, which
+    makes the results a consistent view of the chain.
+    """
+    multicall_address: str = MULTICALL3_ADDRESS
+    _calls: List[Tuple[str, str, bytes, List[str], bool]] = field(default_factory=list)
+
+    def add(
+        self,
+        name: str,
+        target: str,
+        signature: str,
+        output_types: List[str],
+        arg_types: Sequence[str] = (),
+        args: Sequence[Any] = (),
+        allow_failure: bool = False,
+    ) -> None:
+        """Queue a read; its decoded outputs are returned under `name`."""
+        calldata = encode_call(signature, arg_types, args)
+        self._calls.append((name, to_checksum_address(target), calldata, output_types, allow_failure))
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def calldata(self) -> bytes:
+        calls = [(target, allow_failure, data) for _, target, data, _, allow_failure in self._calls]
+        return encode_call("aggregate3((address,bool,bytes)[])", ["(address,bool,bytes)[]"], [calls])
+
+    def execute(self, web3, block_identifier: Any = "latest") -> Dict[str, Optional[tuple]]:
+        """
+        Run the batch as one eth_call.
+
+        Returns:
+            Dict[str, Optional[tuple]]: Decoded outputs per read name, None for allowed failures.
+        """
+        raw = web3.eth.call(
+            {"to": to_checksum_address(self.multicall_address), "data": "0x" + self.calldata().hex()},
+            block_identifier,
+        )
+        (results,) = decode(["(bool,bytes)[]"], bytes(raw))
+
+        decoded = {}
+        for (name, target, _, output_types, allow_failure), (success, data) in zip(self._calls, results):
+            if not success:
+                if not allow_failure:
+                    raise ValueError(f"Multicall read '{name}' on {target} reverted")
+                decoded[name] = None
+                continue
+            decoded[name] = decode(output_types, data)
+        return decoded
+
+
+@dataclass
+class Snapshot:
+    """A block-pinned view of everything the strategy states read from the chain."""
+    block_number: Optional[int]
+    block_timestamp: Optional[int]
+    sqrt_price_x96: Optional[int]
+    tick: Optional[int]
+    spot_price: float
+    balances: Dict[str, int]
+    position: Optional[tuple] = None
+    tick_spacing: Optional[int] = None
+    reads: int = 0
+    round_trips: int = 0
+
+    @property
+    def round_trips_saved(self) -> int:
+        return max(self.reads - self.round_trips, 0)
+
+    def balance_of(self, token_address: str) -> int:
+        return self.balances[token_address.lower()]
+
+    def position_ticks(self) -> Optional[Tuple[int, int]]:
+        """Position (tickLower, tickUpper), if the snapshot includes a position."""
+        if self.position is None:
+            return None
+        return self.position[5], self.position[6]
+
+    def position_bounds(self, decimals0: int, decimals1: int) -> Tuple[float, float]:
+        """Position (lower, upper) bounds as prices, converted locally from its ticks."""
+        return (
+            tick_to_price(self.position[5], decimals0, decimals1),
+            tick_to_price(self.position[6], decimals0, decimals1),
+        )
+
+
+class ChainSnapshot:
+    """
+    Builds a `Snapshot` of pool, position and wallet state with one Multicall3 request.
+
+    Replaces the per-state sequence of SDK calls (spot rate, position info, tick
+    conversions, token balances) and keeps a running count of the round trips saved.
+    """
+
+    def __init__(
+        self,
+        web3,
+        pool_address: str,
+        wallet_address: str,
+        token0: str,
+        token1: str,
+        decimals0: int,
+        decimals1: int,
+        multicall_address: str = MULTICALL3_ADDRESS,
+        position_manager_address: str = POSITION_MANAGER_ADDRESS,
+    ):
+        self.web3 = web3
+        self.pool_address = to_checksum_address(pool_address)
+        self.wallet_address = to_checksum_address(wallet_address)
+        self.token0 = token0
+        self.token1 = token1
+        self.decimals0 = decimals0
+        self.decimals1 = decimals1
+        self.multicall_address = multicall_address
+        self.position_manager_address = position_manager_address
+        self.stats = {"snapshots": 0, "round_trips": 0, "round_trips_saved": 0}
+
+    def take(self, position_id: Optional[int] = None, block_identifier: Any = "latest") -> Snapshot:
+        """
+        Read block, pool, position and balances in a single eth_call.
+
+        Args:
+            position_id: LP position token id to include, or None to skip it.
+            block_identifier: Block to pin the reads to (defaults to the latest block).
+
+        Returns:
+            Snapshot: The consistent view, tagged with the block it was read at.
+        """
+        batch = MulticallBatch(self.multicall_address)
+        batch.add("block_number", self.multicall_address, "getBlockNumber()", ["uint256"])
+        batch.add("block_timestamp", self.multicall_address, "getCurrentBlockTimestamp()", ["uint256"])
+        batch.add("slot0", self.pool_address, "slot0()", SLOT0_TYPES)
+        batch.add("tick_spacing", self.pool_address, "tickSpacing()", ["int24"])
+        for token in (self.token0, self.token1):
+            batch.add(
+                token.lower(), token, "balanceOf(address)", ["uint256"], ["address"], [self.wallet_address]
+            )
+        if position_id is not None:
+            batch.add(
+                "position", self.position_manager_address, "positions(uint256)", POSITIONS_TYPES,
+                ["uint256"], [position_id],
+            )
+
+        results = batch.execute(self.web3, block_identifier)
+        sqrt_price_x96, tick = results["slot0"][0], results["slot0"][1]
+
+        # Without a position there is no position info and no tick conversion to replace.
+        reads = SDK_READS_PER_CYCLE if position_id is not None else 3
+        snapshot = Snapshot(
+            block_number=results["block_number"][0],
+            block_timestamp=results["block_timestamp"][0],
+            sqrt_price_x96=sqrt_price_x96,
+            tick=tick,
+            spot_price=sqrt_price_x96_to_price(sqrt_price_x96, self.decimals0, self.decimals1),
+            balances={
+                self.token0.lower(): results[self.token0.lower()][0],
+                self.token1.lower(): results[self.token1.lower()][0],
+            },
+            position=results.get("position"),
+            tick_spacing=results["tick_spacing"][0],
+            reads=reads,
+            round_trips=1,
+        )
+        self._record(snapshot)
+        return snapshot
+
+    def from_reads(self, spot_price: float, balances: Dict[str, int], position: Optional[tuple], reads: int) -> Snapshot:
+        """Wrap individually fetched values (no Multicall) in a `Snapshot` for the same consumers."""
+        snapshot = Snapshot(
+            block_number=None,
+            block_timestamp=None,
+            sqrt_price_x96=None,
+            tick=None,
+            spot_price=spot_price,
+            balances={token.lower(): amount for token, amount in balances.items()},
+            position=position,
+            reads=reads,
+            round_trips=reads,
+        )
+        self._record(snapshot)
+        return snapshot
+
+    def _record(self, snapshot: Snapshot) -> None:
+        self.stats["snapshots"] += 1
+        self.stats["round_trips"] += snapshot.round_trips
+        self.stats["round_trips_saved"] += snapshot.round_trips_saved
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from eth_utils import keccak
+
+from .structured_log import StructuredLogger, get_logger
+
+SWAP_TOPIC = "0x" + keccak(text="Swap(address,address,int256,int256,uint160,uint128,int24)").hex()
+SWAP_DATA_TYPES = ["int256", "int256", "uint160", "uint128", "int24"]
+
+
+def _connect(url: str):
+    import websockets  # Only needed for event-driven monitoring
+    return websockets.connect(url, max_size=None)
+
+
+class PoolEventMonitor:
+    """
+    Follows a pool over a websocket subscription and wakes the strategy only when needed.
+
+    Subscribes to `newHeads` and to the pool's `Swap` logs. The current tick is taken from
+    each Swap event, so no RPC is made while the price stays inside the position range.
+    The monitor wakes the strategy when:
+    - a Swap moves the tick outside the range returned by `bounds()`, or
+    - `on_head(block_number, block_timestamp)` returns a reason (e.g. the rebalance
+      interval expired, or the state machine is not in MONITOR_PRICE).
+
+    Detection latency is therefore one block at most. Only one wake runs at a time, and
+    events that arrive during a wake are folded into the state the next check sees.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        pool_address: str,
+        bounds: Callable[[], Optional[Tuple[int, int]]],
+        on_head: Callable[[int, int], Optional[str]],
+        on_wake: Callable[[str], Awaitable[Any]],
+        current_tick: Optional[int] = None,
+        connect: Callable[[str], Any] = _connect,
+        reconnect_delay: float = 1.0,
+        log: Optional[StructuredLogger] = None,
+    ):
+        self.ws_url = ws_url
+        self.pool_address = pool_address.lower()
+        self.bounds = bounds
+        self.on_head = on_head
+        self.on_wake = on_wake
+        self.current_tick = current_tick
+        self.connect = connect
+        self.reconnect_delay = reconnect_delay
+        self.log = log or get_logger("event_monitor")
+        self.block_number: Optional[int] = None
+        self.stats = {"heads": 0, "swaps": 0, "wakes": 0, "reconnects": 0}
+        self.wake_reasons: List[Tuple[str, float]] = []
+        self._wake_task: Optional[asyncio.Task] = None
+        self._request_id = 0
+
+    def tick_in_range(self) -> bool:
+        bounds = self.bounds()
+        if bounds is None or self.current_tick is None:
+            return True
+        tick_lower, tick_upper = bounds
+        return tick_lower <= self.current_tick < tick_upper
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Follow the subscriptions until `stop` is set, reconnecting on connection errors."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                async with self.connect(self.ws_url) as ws:
+                    await self._follow(ws, stop)
+            except ValueError:
+                raise  # Subscription rejected by the node: reconnecting won't help
+            except Exception as e:
+                self.log.warning("Pool event subscription dropped, reconnecting", error=repr(e))
+            if stop.is_set():
+                break
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(self.reconnect_delay)
+        if self._wake_task is not None:
+            await self._wake_task
+
+    async def _follow(self, ws, stop: asyncio.Event) -> None:
+        backlog: List[Dict[str, Any]] = []
+        heads_id = await self._subscribe(ws, ["newHeads"], backlog)
+        logs_id = await self._subscribe(
+            ws, ["logs", {"address": self.pool_address, "topics": [SWAP_TOPIC]}], backlog
+        )
+        handlers = {heads_id: self._on_head, logs_id: self._on_log}
+        for message in backlog:
+            self._dispatch(message, handlers)
+
+        # A wake may be due before any event arrives (e.g. already out of range).
+        self._check_range()
+        stop_wait = asyncio.ensure_future(stop.wait())
+        try:
+            while not stop.is_set():
+                receive = asyncio.ensure_future(ws.recv())
+                done, _ = await asyncio.wait({receive, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if receive not in done:
+                    receive.cancel()
+                    break
+                self._dispatch(json.loads(receive.result()), handlers)
+        finally:
+            stop_wait.cancel()
+
+    async def _subscribe(self, ws, params: list, backlog: List[Dict[str, Any]]) -> str:
+        self._request_id += 1
+        request_id = self._request_id
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": "eth_subscribe", "params": params}))
+        while True:
+            message = json.loads(await ws.recv())
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise ValueError(f"eth_subscribe {params[0]} failed: {message['error']}")
+                return message["result"]
+            backlog.append(message)
+
+    def _dispatch(self, message: Dict[str, Any], handlers: Dict[str, Callable]) -> None:
+        if message.get("method") != "eth_subscription":
+            return
+        params = message["params"]
+        handler = handlers.get(params["subscription"])
+        if handler is not None:
+            handler(params["result"])
+
+    def _on_head(self, head: Dict[str, Any]) -> None:
+        self.stats["heads"] += 1
+        self.block_number = int(head["number"], 16)
+        reason = self.on_head(self.block_number, int(head["timestamp"], 16))
+        if reason:
+            self._wake(reason)
+
+    def _on_log(self, log: Dict[str, Any]) -> None:
+        if log.get("removed") or log["address"].lower() != self.pool_address:
+            return
+        self.stats["swaps"] += 1
+        *_, tick = decode(SWAP_DATA_TYPES, bytes.fromhex(log["data"][2:]))
+        self.current_tick = tick
+        self._check_range()
+
+    def _check_range(self) -> None:
+        if not self.tick_in_range():
+            self._wake("position_bounds")
+
+    def _wake(self, reason: str) -> None:
+        if self._wake_task is not None and not self._wake_task.done():
+            return
+        self.stats["wakes"] += 1
+        self.wake_reasons.append((reason, time.monotonic()))
+        self._wake_task = asyncio.ensure_future(self._run_wake(reason))
+
+    async def _run_wake(self, reason: str) -> None:
+        try:
+            await self.on_wake(reason)
+        except Exception as e:
+            self.log.warning("Strategy wake failed", reason=reason, error=repr(e))
@@ -0,0 +1,356 @@
+import base64
+import math
+import struct
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+_RING_HEADER = struct.Struct("<II")  # cap, count
+GRANULARITY_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def granularity_seconds(granularity: str) -> int:
+    """Seconds per candle for a granularity string such as "15m", "1h" or "1d"."""
+    return int(granularity[:-1]) * GRANULARITY_UNITS[granularity[-1]]
+
+
+class ColumnarRing:
+    """
+    Fixed-capacity ring buffer storing each column in its own typed `array`.
+
+    Appending past capacity overwrites the oldest row and hands it back to the caller,
+    so memory stays constant however long the strategy runs.
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], cap: int):
+        if cap <= 0:
+            raise ValueError(f"Ring capacity must be positive, got {cap}")
+        self.columns = list(columns)
+        self.cap = cap
+        self._data = {name: array(typecode, [0]) * cap for name, typecode in self.columns}
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: Sequence[Any]) -> Optional[Tuple]:
+        """Append a row; returns the evicted oldest row when the ring was full."""
+        evicted = None
+        if self._count < self.cap:
+            idx = (self._start + self._count) % self.cap
+            self._count += 1
+        else:
+            idx = self._start
+            evicted = tuple(self._data[name][idx] for name, _ in self.columns)
+            self._start = (self._start + 1) % self.cap
+        for (name, _), value in zip(self.columns, row):
+            self._data[name][idx] = value
+        return evicted
+
+    def column(self, name: str) -> array:
+        """Copy of a column in insertion order (oldest first)."""
+        data = self._data[name]
+        end = self._start + self._count
+        if end <= self.cap:
+            return data[self._start:end]
+        return data[self._start:] + data[:end - self.cap]
+
+    def last(self, name: str) -> Any:
+        if not self._count:
+            raise IndexError("Ring is empty")
+        return self._data[name][(self._start + self._count - 1) % self.cap]
+
+    def rows(self) -> Iterator[Tuple]:
+        return zip(*(self.column(name) for name, _ in self.columns))
+
+    def clear(self) -> None:
+        self._start = 0
+        self._count = 0
+
+    def resize(self, cap: int) -> List[Tuple]:
+        """Change capacity, keeping the newest rows; returns the rows dropped (oldest first)."""
+        rows = list(self.rows())
+        dropped = rows[:max(len(rows) - cap, 0)]
+        self.__init__(self.columns, cap)
+        for row in rows[len(dropped):]:
+            self.append(row)
+        return dropped
+
+    def to_bytes(self) -> bytes:
+        """Pack as header + one little-endian block per column."""
+        parts = [_RING_HEADER.pack(self.cap, self._count)]
+        for name, _ in self.columns:
+            column = self.column(name)
+            if sys.byteorder != "little":
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, columns: Sequence[Tuple[str, str]], buf: memoryview) -> Tuple["ColumnarRing", int]:
+        """Unpack a ring written by `to_bytes`; returns it and the number of bytes consumed."""
+        cap, count = _RING_HEADER.unpack_from(buf, 0)
+        ring = cls(columns, cap)
+        offset = _RING_HEADER.size
+        for name, typecode in ring.columns:
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(buf[offset:offset + size])
+            if sys.byteorder != "little":
+                column.byteswap()
+            ring._data[name][:count] = column
+            offset += size
+        ring._count = count
+        return ring, offset
+
+
+class PriceHistory:
+    """
+    Bounded price series: recent raw observations plus downsampled OHLC rollups.
+
+    Raw (timestamp, price) samples are kept as int64/float64 columns up to `cap`.
+    Samples pushed out of the raw ring are folded into `rollup_interval`-second OHLC
+    buckets, themselves capped at `rollup_cap`. Serializes to a packed binary blob.
+
+    Samples appended since the last `drain_changes()` are tracked so the persistent
+    state journal can record them as appends instead of rewriting the whole series.
+    """
+    MAGIC = b"PH01"
+    _HEADER = struct.Struct("<4sI")  # magic, rollup_interval
+    RAW_COLUMNS = [("timestamp", "q"), ("price", "d")]
+    ROLLUP_COLUMNS = [("timestamp", "q"), ("open", "d"), ("high", "d"), ("low", "d"), ("close", "d")]
+
+    def __init__(self, cap: int = 2880, rollup_interval: int = 3600, rollup_cap: int = 2160):
+        self.rollup_interval = rollup_interval
+        self.raw = ColumnarRing(self.RAW_COLUMNS, cap)
+        self.rollups = ColumnarRing(self.ROLLUP_COLUMNS, rollup_cap)
+        self._pending: Optional[List[Tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f"PriceHistory(samples={len(self.raw)}/{self.raw.cap}, rollups={len(self.rollups)}/{self.rollups.cap})"
+
+    def append(self, timestamp: int, price: float) -> None:
+        evicted = self.raw.append((timestamp, price))
+        if evicted is not None:
+            self._roll_up(*evicted)
+        if self._pending is not None:
+            self._pending.append((timestamp, price))
+
+    def replay(self, rows: List[Sequence[Any]]) -> None:
+        """Re-apply rows returned by `drain_changes()`."""
+        for timestamp, price in rows:
+            self.append(int(timestamp), float(price))
+
+    def drain_changes(self) -> Optional[List[Tuple]]:
+        """Rows appended since the last drain, or None if the history was rewritten and must be saved whole."""
+        changes, self._pending = self._pending, []
+        return changes
+
+    def _roll_up(self, timestamp: int, price: float) -> None:
+        bucket = timestamp - timestamp % self.rollup_interval
+        rollups = self.rollups
+        if len(rollups) and rollups.last("timestamp") == bucket:
+            idx = (rollups._start + len(rollups) - 1) % rollups.cap
+            rollups._data["high"][idx] = max(rollups._data["high"][idx], price)
+            rollups._data["low"][idx] = min(rollups._data["low"][idx], price)
+            rollups._data["close"][idx] = price
+        else:
+            rollups.append((bucket, price, price, price, price))
+
+    def timestamps(self) -> array:
+        return self.raw.column("timestamp")
+
+    def prices(self) -> array:
+        return self.raw.column("price")
+
+    def clear(self) -> None:
+        self.raw.clear()
+        self.rollups.clear()
+        self._pending = None
+
+    def set_limits(self, cap: int, rollup_interval: int, rollup_cap: int) -> None:
+        """Apply configured limits to a loaded history, rolling up any samples that no longer fit."""
+        if (cap, rollup_interval, rollup_cap) == (self.raw.cap, self.rollup_interval, self.rollups.cap):
+            return
+        self._pending = None
+        # Buckets already built for a previous interval are kept as-is.
+        self.rollup_interval = rollup_interval
+        if rollup_cap != self.rollups.cap:
+            self.rollups.resize(rollup_cap)
+        if cap != self.raw.cap:
+            for timestamp, price in self.raw.resize(cap):
+                self._roll_up(timestamp, price)
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self.MAGIC, self.rollup_interval) + self.raw.to_bytes() + self.rollups.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PriceHistory":
+        buf = memoryview(data)
+        magic, rollup_interval = cls._HEADER.unpack_from(buf, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a packed PriceHistory (magic {magic!r})")
+        history = cls(rollup_interval=rollup_interval)
+        offset = cls._HEADER.size
+        history.raw, size = ColumnarRing.from_bytes(cls.RAW_COLUMNS, buf[offset:])
+        offset += size
+        history.rollups, _ = ColumnarRing.from_bytes(cls.ROLLUP_COLUMNS, buf[offset:])
+        return history
+
+    def encode(self) -> str:
+        """Base64 text form, for embedding in the JSON persistent state."""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, value: Any) -> "PriceHistory":
+        """Build from an encoded string, packed bytes, an existing instance, or a legacy list of dicts."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_bytes(base64.b64decode(value)) if value else cls()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        history = cls()
+        for entry in value or []:
+            history.append(_to_epoch(entry["timestamp"]), float(entry["price"]))
+        return history
+
+
+class RebalanceHistory:
+    """
+    Bounded log of rebalance triggers as typed columns.
+
+    Each record keeps the trigger code, the price and position bounds (for bound
+    triggers) and the elapsed time (for interval triggers); missing values are NaN.
+    Records pushed out of the ring are kept only as per-trigger counts. Like
+    `PriceHistory`, records appended since the last `drain_changes()` are tracked.
+    """
+    MAGIC = b"RH01"
+    TRIGGERS = ["other", "position_bounds", "time_interval", "price_deviation"]
+    COLUMNS = [
+        ("timestamp", "q"), ("trigger", "B"), ("price", "d"),
+        ("lower_bound", "d"), ("upper_bound", "d"), ("time_passed", "d"),
+    ]
+
+    def __init__(self, cap: int = 1000):
+        self.ring = ColumnarRing(self.COLUMNS, cap)
+        self.evicted_counts = array("q", [0]) * len(self.TRIGGERS)
+        self._pending: Optional[List[Tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    def __repr__(self) -> str:
+        return f"RebalanceHistory(records={len(self.ring)}/{self.ring.cap}, evicted={sum(self.evicted_counts)})"
+
+    def append(self, timestamp: int, trigger: str, details: Dict[str, Any]) -> None:
+        code = self.TRIGGERS.index(trigger) if trigger in self.TRIGGERS else 0
+        time_passed = details.get("time_passed", math.nan)
+        if hasattr(time_passed, "total_seconds"):
+            time_passed = time_passed.total_seconds()
+        self.append_row((
+            timestamp,
+            code,
+            float(details.get("current_price", math.nan)),
+            float(details.get("lower_bound", math.nan)),
+            float(details.get("upper_bound", math.nan)),
+            float(time_passed),
+        ))
+
+    def append_row(self, row: Tuple) -> None:
+        """Append an already-encoded record (one value per column)."""
+        evicted = self.ring.append(row)
+        if evicted is not None:
+            self.evicted_counts[evicted[1]] += 1
+        if self._pending is not None:
+            self._pending.append(row)
+
+    def replay(self, rows: List[Sequence[Any]]) -> None:
+        """Re-apply rows returned by `drain_changes()`."""
+        for timestamp, code, *values in rows:
+            self.append_row((int(timestamp), int(code), *(float(v) for v in values)))
+
+    def drain_changes(self) -> Optional[List[Tuple]]:
+        """Rows appended since the last drain, or None if the history was rewritten and must be saved whole."""
+        changes, self._pending = self._pending, []
+        return changes
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Records as dicts (oldest first), for analysis and debugging."""
+        names = [name for name, _ in self.COLUMNS]
+        records = []
+        for row in self.ring.rows():
+            record = dict(zip(names, row))
+            record["trigger"] = self.TRIGGERS[record["trigger"]]
+            records.append(record)
+        return records
+
+    def trigger_counts(self) -> Dict[str, int]:
+        """Total triggers per reason, including records no longer held in the ring."""
+        counts = dict(zip(self.TRIGGERS, self.evicted_counts))
+        for code in self.ring.column("trigger"):
+            counts[self.TRIGGERS[code]] += 1
+        return counts
+
+    def clear(self) -> None:
+        self.ring.clear()
+        self.evicted_counts = array("q", [0]) * len(self.TRIGGERS)
+        self._pending = None
+
+    def set_limits(self, cap: int) -> None:
+        if cap != self.ring.cap:
+            self._pending = None
+            for row in self.ring.resize(cap):
+                self.evicted_counts[row[1]] += 1
+
+    def to_bytes(self) -> bytes:
+        counts = array("q", self.evicted_counts)
+        if sys.byteorder != "little":
+            counts.byteswap()
+        return self.MAGIC + struct.pack("<B", len(counts)) + counts.tobytes() + self.ring.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RebalanceHistory":
+        buf = memoryview(data)
+        if bytes(buf[:4]) != cls.MAGIC:
+            raise ValueError(f"Not a packed RebalanceHistory (magic {bytes(buf[:4])!r})")
+        (n_counts,) = struct.unpack_from("<B", buf, 4)
+        counts = array("q")
+        counts.frombytes(buf[5:5 + 8 * n_counts])
+        if sys.byteorder != "little":
+            counts.byteswap()
+        history = cls()
+        history.ring, _ = ColumnarRing.from_bytes(cls.COLUMNS, buf[5 + 8 * n_counts:])
+        history.evicted_counts[:len(counts)] = counts
+        return history
+
+    def encode(self) -> str:
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, value: Any) -> "RebalanceHistory":
+        """Build from an encoded string, packed bytes, an existing instance, or a legacy list of dicts."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_bytes(base64.b64decode(value)) if value else cls()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        history = cls()
+        for entry in value or []:
+            history.append(_to_epoch(entry["timestamp"]), entry["trigger"], entry.get("details", {}))
+        return history
+
+
+def _to_epoch(timestamp: Any) -> int:
+    """Epoch seconds from a datetime, ISO string or number."""
+    if hasattr(timestamp, "timestamp"):
+        return int(timestamp.timestamp())
+    if isinstance(timestamp, str):
+        return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+    return int(timestamp)
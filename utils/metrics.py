@@ -0,0 +1,241 @@
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .state_journal import atomic_write
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PREFIX = "strategy_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Dict[str, Any]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and timings, rendered as Prometheus text or JSON.
+
+    Timings are kept as count / sum / max per label set (a Prometheus summary without
+    quantiles). Collectors registered with `add_collector` are called at render time for
+    values owned elsewhere (e.g. RPC transport latency), so they cost nothing per tick.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._timings: Dict[Tuple[str, LabelKey], List[float]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, Dict[str, Any], float]]]] = []
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                self._timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+
+    def time(self, name: str, **labels) -> _Timer:
+        return _Timer(self, name, labels)
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, Dict[str, Any], float]]]) -> None:
+        """Register a callable yielding (kind, name, labels, value); kind is "counter" or "gauge"."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def bind(self, **labels) -> "BoundMetrics":
+        return BoundMetrics(self, labels)
+
+    def _collect(self) -> Tuple[dict, dict, dict]:
+        with self._lock:
+            counters, gauges = dict(self._counters), dict(self._gauges)
+            timings = {key: list(value) for key, value in self._timings.items()}
+            collectors = list(self._collectors)
+        for collector in collectors:
+            for kind, name, labels, value in collector():
+                target = counters if kind == "counter" else gauges
+                target[(name, _label_key(labels))] = value
+        return counters, gauges, timings
+
+    def render_prometheus(self) -> str:
+        counters, gauges, timings = self._collect()
+        lines = []
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in values}):
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                for (metric, key), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+        for name in sorted({name for name, _ in timings}):
+            samples = [(key, value) for (metric, key), value in sorted(timings.items()) if metric == name]
+            lines.append(f"# TYPE {PREFIX}{name} summary")
+            for key, (count, total, _) in samples:
+                lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {count:g}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {total}")
+            lines.append(f"# TYPE {PREFIX}{name}_max gauge")
+            for key, (_, _, peak) in samples:
+                lines.append(f"{PREFIX}{name}_max{_format_labels(key)} {peak}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Any]:
+        counters, gauges, timings = self._collect()
+
+        def rows(values, convert):
+            return [{"name": name, "labels": dict(key), **convert(value)} for (name, key), value in sorted(values.items())]
+
+        return {
+            "time": time.time(),
+            "counters": rows(counters, lambda value: {"value": value}),
+            "gauges": rows(gauges, lambda value: {"value": value}),
+            "timings": rows(timings, lambda value: {"count": value[0], "sum": value[1], "max": value[2]}),
+        }
+
+
+class BoundMetrics:
+    """A view of a registry that adds fixed labels (e.g. the strategy id) to every sample."""
+
+    enabled = True
+
+    def __init__(self, registry: MetricsRegistry, labels: Dict[str, Any]):
+        self.registry = registry
+        self.labels = labels
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        self.registry.inc(name, value, **self.labels, **labels)
+
+    def set(self, name: str, value: float, **labels) -> None:
+        self.registry.set(name, value, **self.labels, **labels)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        self.registry.observe(name, seconds, **self.labels, **labels)
+
+    def time(self, name: str, **labels) -> _Timer:
+        return _Timer(self.registry, name, {**self.labels, **labels})
+
+
+class NullMetrics:
+    """Metrics sink used when instrumentation is disabled: every call is a no-op."""
+
+    enabled = False
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        pass
+
+    def set(self, name: str, value: float, **labels) -> None:
+        pass
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        pass
+
+    def time(self, name: str, **labels) -> _NullTimer:
+        return _NULL_TIMER
+
+
+NULL_METRICS = NullMetrics()
+REGISTRY = MetricsRegistry()
+
+_servers: Dict[int, "ThreadingHTTPServer"] = {}
+_flushers: Dict[str, threading.Thread] = {}
+_exporters_lock = threading.Lock()
+
+
+def serve_prometheus(port: int, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Serve `registry` as Prometheus text on http://host:port/metrics (once per port)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    with _exporters_lock:
+        if port in _servers:
+            return _servers[port]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                payload = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+        _servers[port] = server
+        return server
+
+
+def flush_json_periodically(path: str, interval: float, registry: MetricsRegistry = REGISTRY) -> None:
+    """Write `registry` as JSON to `path` (atomically) every `interval` seconds (once per path)."""
+    with _exporters_lock:
+        if path in _flushers:
+            return
+
+        def flush() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    atomic_write(path, json.dumps(registry.to_json()).encode())
+                except OSError as e:
+                    print(f"Metrics flush to {path} failed: {e!r}")
+
+        thread = threading.Thread(target=flush, name="metrics-flush", daemon=True)
+        thread.start()
+        _flushers[path] = thread
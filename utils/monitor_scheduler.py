@@ -0,0 +1,72 @@
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+
+def realized_variance_rate(timestamps: Sequence[int], prices: Sequence[float], since: float) -> Optional[float]:
+    """
+    Per-second variance of the log price over the (time-ordered) samples at or after `since`.
+
+    Squared log returns are summed and divided by the time they span, so irregularly
+    spaced samples (as taken by an adaptive scheduler) are weighted by their gaps.
+    None with fewer than two samples in the window.
+    """
+    first = bisect_left(timestamps, since)
+    window = [(timestamp, price) for timestamp, price in zip(timestamps[first:], prices[first:]) if price > 0]
+    if len(window) < 2 or window[-1][0] <= window[0][0]:
+        return None
+    total = sum(math.log(b / a) ** 2 for (_, a), (_, b) in zip(window, window[1:]))
+    return total / (window[-1][0] - window[0][0])
+
+
+def log_distance(price: float, bounds: Tuple[float, float]) -> float:
+    """Log-price distance from `price` to the nearer of the range's (lower, upper) bounds; 0 outside it."""
+    lower, upper = bounds
+    if not lower < price < upper:
+        return 0.0
+    return min(math.log(price / lower), math.log(upper / price))
+
+
+@dataclass
+class MonitorScheduler:
+    """
+    Cadence of MONITOR_PRICE checks between run() wake-ups.
+
+    A price diffusing with per-second log variance v needs on the order of d²/v seconds
+    to cover a log distance d, so the next check is scheduled at `safety` times that
+    expected exit time, clamped to [min_interval, max_interval]. Near a bound or in a
+    volatile market the checks tighten to `min_interval` (one block); far from the
+    bounds in a quiet one they relax to `max_interval`. Without a volatility estimate
+    the price is checked every `min_interval`. Checks never sleep past a known
+    deadline such as the time-based rebalance.
+    """
+    min_interval: float
+    max_interval: float
+    safety: float = 0.1
+
+    def next_interval(
+        self,
+        distance: Optional[float],
+        variance_rate: Optional[float],
+        until_due: Optional[float] = None,
+    ) -> float:
+        """
+        Seconds until the next check.
+
+        Args:
+            distance: Log distance to the nearest range bound, or None without a position.
+            variance_rate: Realized per-second log variance, or None without enough history.
+            until_due: Seconds until a check is due regardless of the price (e.g. the
+                rebalance interval expiring), if any.
+        """
+        if distance is None or variance_rate is None:
+            interval = self.min_interval  # No position, or no volatility estimate yet (e.g. after a restart)
+        elif variance_rate <= 0:
+            interval = self.max_interval
+        else:
+            interval = self.safety * distance * distance / variance_rate
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        if until_due is not None:
+            interval = min(interval, max(until_due, self.min_interval))
+        return interval
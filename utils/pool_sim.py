@@ -0,0 +1,483 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from .chain_snapshot import SLOT0_TYPES, MulticallBatch
+from .tick_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    amounts_for_liquidity,
+    liquidity_for_amounts,
+    sqrt_ratio_at_tick,
+    tick_at_sqrt_ratio,
+)
+
+Q128 = 1 << 128
+MAX_UINT256 = (1 << 256) - 1
+FEE_DENOMINATOR = 1_000_000
+
+TICKS_TYPES = ["uint128", "int128", "uint256", "uint256", "int56", "uint160", "uint32", "bool"]
+
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    return -(-a * b // denominator)
+
+
+def amount0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token0 between two prices for `liquidity` (SqrtPriceMath.getAmount0Delta)."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    numerator1, numerator2 = liquidity << 96, sqrt_b - sqrt_a
+    if round_up:
+        return -(-mul_div_rounding_up(numerator1, numerator2, sqrt_b) // sqrt_a)
+    return mul_div(numerator1, numerator2, sqrt_b) // sqrt_a
+
+
+def amount1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token1 between two prices for `liquidity` (SqrtPriceMath.getAmount1Delta)."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return mul_div(liquidity, sqrt_b - sqrt_a, Q96)
+
+
+def _next_sqrt_price_from_amount0(sqrt_price: int, liquidity: int, amount: int, add: bool) -> int:
+    if amount == 0:
+        return sqrt_price
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price
+    if add:
+        # The contract's overflow fallback, so results match to the wei.
+        if product <= MAX_UINT256 and numerator1 + product <= MAX_UINT256:
+            return mul_div_rounding_up(numerator1, sqrt_price, numerator1 + product)
+        return -(-numerator1 // (numerator1 // sqrt_price + amount))
+    if product > MAX_UINT256 or numerator1 <= product:
+        raise ValueError("Swap output exceeds the liquidity in range")
+    return mul_div_rounding_up(numerator1, sqrt_price, numerator1 - product)
+
+
+def _next_sqrt_price_from_amount1(sqrt_price: int, liquidity: int, amount: int, add: bool) -> int:
+    if add:
+        return sqrt_price + (amount << 96) // liquidity
+    quotient = -(-(amount << 96) // liquidity)
+    if sqrt_price <= quotient:
+        raise ValueError("Swap output exceeds the liquidity in range")
+    return sqrt_price - quotient
+
+
+def compute_swap_step(sqrt_current: int, sqrt_target: int, liquidity: int, amount_remaining: int,
+                      fee_pips: int) -> Tuple[int, int, int, int]:
+    """
+    One swap step within a single liquidity range (SwapMath.computeSwapStep).
+
+    Args:
+        amount_remaining: Positive for exact input, negative for exact output.
+
+    Returns:
+        Tuple[int, int, int, int]: sqrtPriceX96 reached, amount in, amount out and fee.
+    """
+    zero_for_one = sqrt_current >= sqrt_target
+    exact_in = amount_remaining >= 0
+
+    if exact_in:
+        remaining_less_fee = mul_div(amount_remaining, FEE_DENOMINATOR - fee_pips, FEE_DENOMINATOR)
+        amount_in = (amount0_delta(sqrt_target, sqrt_current, liquidity, True) if zero_for_one
+                     else amount1_delta(sqrt_current, sqrt_target, liquidity, True))
+        if remaining_less_fee >= amount_in:
+            sqrt_next = sqrt_target
+        elif zero_for_one:
+            sqrt_next = _next_sqrt_price_from_amount0(sqrt_current, liquidity, remaining_less_fee, True)
+        else:
+            sqrt_next = _next_sqrt_price_from_amount1(sqrt_current, liquidity, remaining_less_fee, True)
+    else:
+        amount_out = (amount1_delta(sqrt_target, sqrt_current, liquidity, False) if zero_for_one
+                      else amount0_delta(sqrt_current, sqrt_target, liquidity, False))
+        if -amount_remaining >= amount_out:
+            sqrt_next = sqrt_target
+        elif zero_for_one:
+            sqrt_next = _next_sqrt_price_from_amount1(sqrt_current, liquidity, -amount_remaining, False)
+        else:
+            sqrt_next = _next_sqrt_price_from_amount0(sqrt_current, liquidity, -amount_remaining, False)
+
+    reached = sqrt_target == sqrt_next
+    if zero_for_one:
+        if not (reached and exact_in):
+            amount_in = amount0_delta(sqrt_next, sqrt_current, liquidity, True)
+        if not (reached and not exact_in):
+            amount_out = amount1_delta(sqrt_next, sqrt_current, liquidity, False)
+    else:
+        if not (reached and exact_in):
+            amount_in = amount1_delta(sqrt_current, sqrt_next, liquidity, True)
+        if not (reached and not exact_in):
+            amount_out = amount0_delta(sqrt_current, sqrt_next, liquidity, False)
+
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+    if exact_in and sqrt_next != sqrt_target:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, FEE_DENOMINATOR - fee_pips)
+    return sqrt_next, amount_in, amount_out, fee_amount
+
+
+class TickBitmap:
+    """
+    The pool's initialized-tick bitmap: one 256-bit word per 256 compressed ticks.
+
+    Only the words that were read are known; `loaded` records their range, and a
+    search that leaves it is reported so quotes relying on unread words can be flagged.
+    """
+
+    def __init__(self, tick_spacing: int, words: Optional[Dict[int, int]] = None,
+                 loaded: Optional[Tuple[int, int]] = None):
+        self.tick_spacing = tick_spacing
+        self.words = dict(words or {})
+        self.loaded = loaded
+
+    @staticmethod
+    def position(compressed: int) -> Tuple[int, int]:
+        return compressed >> 8, compressed % 256
+
+    def flip(self, tick: int) -> None:
+        word, bit = self.position(tick // self.tick_spacing)
+        self.words[word] = self.words.get(word, 0) ^ (1 << bit)
+
+    def is_loaded(self, word: int) -> bool:
+        return self.loaded is None or self.loaded[0] <= word <= self.loaded[1]
+
+    def next_initialized_tick_within_one_word(self, tick: int, lte: bool) -> Tuple[int, bool, int]:
+        """
+        Next initialized tick in the word of `tick` (TickBitmap.nextInitializedTickWithinOneWord).
+
+        Returns:
+            Tuple[int, bool, int]: The tick, whether it is initialized, and the word searched.
+        """
+        spacing = self.tick_spacing
+        compressed = tick // spacing
+        if lte:
+            word, bit = self.position(compressed)
+            masked = self.words.get(word, 0) & ((1 << (bit + 1)) - 1)
+            if masked:
+                return (compressed - (bit - (masked.bit_length() - 1))) * spacing, True, word
+            return (compressed - bit) * spacing, False, word
+        word, bit = self.position(compressed + 1)
+        masked = self.words.get(word, 0) & ~((1 << bit) - 1)
+        if masked:
+            lowest = (masked & -masked).bit_length() - 1
+            return (compressed + 1 + (lowest - bit)) * spacing, True, word
+        return (compressed + 1 + (255 - bit)) * spacing, False, word
+
+
+@dataclass
+class TickInfo:
+    liquidity_net: int
+    fee_growth_outside0_x128: int = 0
+    fee_growth_outside1_x128: int = 0
+    liquidity_gross: int = 0
+
+
+@dataclass
+class SwapQuote:
+    """Outcome of a simulated swap, without changing the pool."""
+    zero_for_one: bool
+    amount_in: int
+    amount_out: int
+    fee_paid: int  # Total swap fee, protocol share included
+    sqrt_price_before: int
+    sqrt_price_after: int
+    tick_after: int
+    ticks_crossed: int
+    complete: bool  # False if the swap walked into bitmap words that were not read
+
+    @property
+    def price_move(self) -> float:
+        """Relative change of the pool price (token1 per token0) caused by the swap."""
+        return (self.sqrt_price_after / self.sqrt_price_before) ** 2 - 1
+
+    @property
+    def price_impact(self) -> float:
+        """Shortfall of the execution price against the pre-swap spot price, fees included."""
+        spot = (self.sqrt_price_before / Q96) ** 2
+        if not self.amount_in:
+            return 0.0
+        expected = self.amount_in * spot if self.zero_for_one else self.amount_in / spot
+        return 1 - self.amount_out / expected
+
+
+@dataclass
+class PoolSimulator:
+    """
+    A local copy of a Uniswap V3 pool that replays the contract's swap math exactly.
+
+    Seeded from the pool's slot0, liquidity, fee growth, tick bitmap and initialized
+    ticks at one block (see `load`), it quotes swaps, price impact and the liquidity a
+    mint would get without further RPC calls. Quotes are memoized: the simulator is
+    only valid for its `block_number`, so a new block means loading a new one.
+    """
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int
+    tick_spacing: int
+    ticks: Dict[int, TickInfo]
+    bitmap: TickBitmap
+    fee_protocol: int = 0
+    fee_growth_global0_x128: int = 0
+    fee_growth_global1_x128: int = 0
+    block_number: Optional[int] = None
+    _quotes: Dict[Tuple[bool, int, Optional[int]], SwapQuote] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, web3, pool_address: str, word_radius: int = 2, block_identifier: Any = "latest",
+             multicall_address: Optional[str] = None) -> "PoolSimulator":
+        """
+        Read a pool into a simulator with three Multicall3 eth_calls pinned to one block.
+
+        Reads the pool state, then the bitmap words within `word_radius` of the current
+        tick's word (each word spans 256 * tick_spacing ticks), then every initialized
+        tick in them.
+        """
+        batch = cls._batch(multicall_address)
+        batch.add("block_number", batch.multicall_address, "getBlockNumber()", ["uint256"])
+        batch.add("slot0", pool_address, "slot0()", SLOT0_TYPES)
+        batch.add("liquidity", pool_address, "liquidity()", ["uint128"])
+        batch.add("fee", pool_address, "fee()", ["uint24"])
+        batch.add("tick_spacing", pool_address, "tickSpacing()", ["int24"])
+        batch.add("fee_growth0", pool_address, "feeGrowthGlobal0X128()", ["uint256"])
+        batch.add("fee_growth1", pool_address, "feeGrowthGlobal1X128()", ["uint256"])
+        state = batch.execute(web3, block_identifier)
+        block = state["block_number"][0]
+        sqrt_price_x96, tick, fee_protocol = state["slot0"][0], state["slot0"][1], state["slot0"][5]
+        tick_spacing = state["tick_spacing"][0]
+
+        center_word = (tick // tick_spacing) >> 8
+        words = range(center_word - word_radius, center_word + word_radius + 1)
+        batch = cls._batch(multicall_address)
+        for word in words:
+            batch.add(f"word{word}", pool_address, "tickBitmap(int16)", ["uint256"], ["int16"], [word])
+        bitmap = TickBitmap(
+            tick_spacing,
+            {word: value[0] for word, value in zip(words, batch.execute(web3, block).values()) if value[0]},
+            loaded=(words[0], words[-1]),
+        )
+
+        initialized = [
+            ((word << 8) + bit) * tick_spacing
+            for word, value in bitmap.words.items() for bit in range(256) if value >> bit & 1
+        ]
+        ticks: Dict[int, TickInfo] = {}
+        if initialized:
+            batch = cls._batch(multicall_address)
+            for initialized_tick in initialized:
+                batch.add(str(initialized_tick), pool_address, "ticks(int24)", TICKS_TYPES, ["int24"], [initialized_tick])
+            for initialized_tick, info in zip(initialized, batch.execute(web3, block).values()):
+                ticks[initialized_tick] = TickInfo(info[1], info[2], info[3], info[0])
+
+        return cls(
+            sqrt_price_x96=sqrt_price_x96,
+            tick=tick,
+            liquidity=state["liquidity"][0],
+            fee=state["fee"][0],
+            tick_spacing=tick_spacing,
+            ticks=ticks,
+            bitmap=bitmap,
+            fee_protocol=fee_protocol,
+            fee_growth_global0_x128=state["fee_growth0"][0],
+            fee_growth_global1_x128=state["fee_growth1"][0],
+            block_number=block,
+        )
+
+    @staticmethod
+    def _batch(multicall_address: Optional[str]) -> MulticallBatch:
+        return MulticallBatch(multicall_address) if multicall_address else MulticallBatch()
+
+    def quote(self, zero_for_one: bool, amount_in: int, sqrt_price_limit_x96: Optional[int] = None) -> SwapQuote:
+        """Quote an exact-input swap (memoized for this block)."""
+        key = (zero_for_one, amount_in, sqrt_price_limit_x96)
+        quote = self._quotes.get(key)
+        if quote is None:
+            quote = self._quotes[key] = self.swap(zero_for_one, amount_in, sqrt_price_limit_x96, commit=False)
+        return quote
+
+    def swap(self, zero_for_one: bool, amount_specified: int, sqrt_price_limit_x96: Optional[int] = None,
+             commit: bool = True) -> SwapQuote:
+        """
+        Run the pool's swap loop (UniswapV3Pool.swap) for an exact input (positive
+        `amount_specified`) or exact output (negative), updating the pool if `commit`.
+        """
+        if sqrt_price_limit_x96 is None:
+            sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+        exact_input = amount_specified > 0
+        remaining, calculated = amount_specified, 0
+        sqrt_price, tick, liquidity = self.sqrt_price_x96, self.tick, self.liquidity
+        fee_growth = self.fee_growth_global0_x128 if zero_for_one else self.fee_growth_global1_x128
+        fee_protocol = self.fee_protocol % 16 if zero_for_one else self.fee_protocol >> 4
+        fees, crossed, complete = 0, [], True
+
+        while remaining != 0 and sqrt_price != sqrt_price_limit_x96:
+            sqrt_start = sqrt_price
+            tick_next, initialized, word = self.bitmap.next_initialized_tick_within_one_word(tick, zero_for_one)
+            complete = complete and self.bitmap.is_loaded(word)
+            tick_next = min(max(tick_next, MIN_TICK), MAX_TICK)
+            sqrt_next = sqrt_ratio_at_tick(tick_next)
+            beyond_limit = sqrt_next < sqrt_price_limit_x96 if zero_for_one else sqrt_next > sqrt_price_limit_x96
+            sqrt_price, amount_in, amount_out, fee_amount = compute_swap_step(
+                sqrt_price, sqrt_price_limit_x96 if beyond_limit else sqrt_next, liquidity, remaining, self.fee,
+            )
+            if exact_input:
+                remaining -= amount_in + fee_amount
+                calculated -= amount_out
+            else:
+                remaining += amount_out
+                calculated += amount_in + fee_amount
+            fees += fee_amount
+            if fee_protocol > 0:
+                fee_amount -= fee_amount // fee_protocol
+            if liquidity > 0:
+                fee_growth += mul_div(fee_amount, Q128, liquidity)
+
+            if sqrt_price == sqrt_next:
+                if initialized and tick_next in self.ticks:
+                    liquidity_net = self.ticks[tick_next].liquidity_net
+                    liquidity += -liquidity_net if zero_for_one else liquidity_net
+                    crossed.append((tick_next, fee_growth))
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price != sqrt_start:
+                tick = tick_at_sqrt_ratio(sqrt_price)
+
+        spent = amount_specified - remaining
+        quote = SwapQuote(
+            zero_for_one=zero_for_one,
+            amount_in=spent if exact_input else calculated,
+            amount_out=-calculated if exact_input else -spent,
+            fee_paid=fees,
+            sqrt_price_before=self.sqrt_price_x96,
+            sqrt_price_after=sqrt_price,
+            tick_after=tick,
+            ticks_crossed=len(crossed),
+            complete=complete,
+        )
+        if commit:
+            for crossed_tick, growth in crossed:
+                if zero_for_one:
+                    self._cross(crossed_tick, growth, self.fee_growth_global1_x128)
+                else:
+                    self._cross(crossed_tick, self.fee_growth_global0_x128, growth)
+            self.sqrt_price_x96, self.tick, self.liquidity = sqrt_price, tick, liquidity
+            if zero_for_one:
+                self.fee_growth_global0_x128 = fee_growth
+            else:
+                self.fee_growth_global1_x128 = fee_growth
+            self._quotes.clear()
+        return quote
+
+    def _cross(self, tick: int, fee_growth0: int, fee_growth1: int) -> None:
+        # Tick.cross flips the outside accumulators against the globals at the time of crossing.
+        info = self.ticks[tick]
+        info.fee_growth_outside0_x128 = (fee_growth0 - info.fee_growth_outside0_x128) % (1 << 256)
+        info.fee_growth_outside1_x128 = (fee_growth1 - info.fee_growth_outside1_x128) % (1 << 256)
+
+    def add_liquidity(self, tick_lower: int, tick_upper: int, liquidity: int) -> None:
+        """
+        Apply a mint (or, with negative `liquidity`, a burn) to the pool's ticks and active
+        liquidity, e.g. to quote against the pool as it will be after our own position opens.
+        """
+        for tick, delta in ((tick_lower, liquidity), (tick_upper, -liquidity)):
+            info = self.ticks.get(tick)
+            if info is None:
+                # A new tick starts with all fee growth "below" it (Tick.update).
+                below = tick <= self.tick
+                info = self.ticks[tick] = TickInfo(
+                    0,
+                    self.fee_growth_global0_x128 if below else 0,
+                    self.fee_growth_global1_x128 if below else 0,
+                )
+                self.bitmap.flip(tick)
+            info.liquidity_net += delta
+            info.liquidity_gross += liquidity
+            if info.liquidity_gross == 0:
+                del self.ticks[tick]
+                self.bitmap.flip(tick)
+        if tick_lower <= self.tick < tick_upper:
+            self.liquidity += liquidity
+        self._quotes.clear()
+
+    def fee_growth_inside(self, tick_lower: int, tick_upper: int) -> Tuple[int, int]:
+        """Fee growth per unit of liquidity inside a range, X128 (Tick.getFeeGrowthInside)."""
+        lower = self.ticks.get(tick_lower, TickInfo(0))
+        upper = self.ticks.get(tick_upper, TickInfo(0))
+        inside = []
+        for global_growth, below_outside, above_outside in (
+            (self.fee_growth_global0_x128, lower.fee_growth_outside0_x128, upper.fee_growth_outside0_x128),
+            (self.fee_growth_global1_x128, lower.fee_growth_outside1_x128, upper.fee_growth_outside1_x128),
+        ):
+            below = below_outside if self.tick >= tick_lower else global_growth - below_outside
+            above = above_outside if self.tick < tick_upper else global_growth - above_outside
+            inside.append((global_growth - below - above) % (1 << 256))
+        return inside[0], inside[1]
+
+    def fees_owed(self, liquidity: int, tick_lower: int, tick_upper: int,
+                  fee_growth_inside_last: Tuple[int, int]) -> Tuple[int, int]:
+        """Fees a position earned since its last fee checkpoint (as `positions()` reports it)."""
+        inside = self.fee_growth_inside(tick_lower, tick_upper)
+        return tuple(
+            mul_div((now - last) % (1 << 256), liquidity, Q128) for now, last in zip(inside, fee_growth_inside_last)
+        )
+
+    def mint_quote(self, tick_lower: int, tick_upper: int, amount0: int, amount1: int) -> Tuple[int, int, int]:
+        """
+        Liquidity a mint of up to (amount0, amount1) over a range gets at the current price.
+
+        Returns:
+            Tuple[int, int, int]: Liquidity, and the token0 and token1 amounts it takes.
+        """
+        liquidity = liquidity_for_amounts(self.sqrt_price_x96, tick_lower, tick_upper, amount0, amount1)
+        used0, used1 = amounts_for_liquidity(self.sqrt_price_x96, tick_lower, tick_upper, liquidity)
+        return liquidity, used0, used1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-JSON form (big integers as strings), e.g. for recorded fixtures."""
+        return {
+            "block_number": self.block_number,
+            "sqrt_price_x96": str(self.sqrt_price_x96),
+            "tick": self.tick,
+            "liquidity": str(self.liquidity),
+            "fee": self.fee,
+            "tick_spacing": self.tick_spacing,
+            "fee_protocol": self.fee_protocol,
+            "fee_growth_global": [str(self.fee_growth_global0_x128), str(self.fee_growth_global1_x128)],
+            "words": {str(word): str(value) for word, value in self.bitmap.words.items()},
+            "loaded_words": list(self.bitmap.loaded) if self.bitmap.loaded else None,
+            "ticks": {
+                str(tick): [str(value) for value in (info.liquidity_net, info.fee_growth_outside0_x128,
+                                                     info.fee_growth_outside1_x128, info.liquidity_gross)]
+                for tick, info in self.ticks.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PoolSimulator":
+        return cls(
+            sqrt_price_x96=int(data["sqrt_price_x96"]),
+            tick=data["tick"],
+            liquidity=int(data["liquidity"]),
+            fee=data["fee"],
+            tick_spacing=data["tick_spacing"],
+            ticks={int(tick): TickInfo(*map(int, info)) for tick, info in data["ticks"].items()},
+            bitmap=TickBitmap(
+                data["tick_spacing"],
+                {int(word): int(value) for word, value in data["words"].items()},
+                loaded=tuple(data["loaded_words"]) if data.get("loaded_words") else None,
+            ),
+            fee_protocol=data.get("fee_protocol", 0),
+            fee_growth_global0_x128=int(data["fee_growth_global"][0]),
+            fee_growth_global1_x128=int(data["fee_growth_global"][1]),
+            block_number=data.get("block_number"),
+        )
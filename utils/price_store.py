@@ -0,0 +1,207 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .candles import Candles, load_candles
+from .history import granularity_seconds
+
+RECORD = np.dtype([("timestamp", "<i8"), ("close", "<f8"), ("volume", "<f8")])
+
+
+class CandleSource:
+    """Where the price store gets candles it does not have yet (see `SOURCES`)."""
+    name = ""
+
+    def __init__(self):
+        self.stats = {"fetches": 0, "candles": 0}
+
+    def fetch(self, pool: str, granularity: str, start: int, end: int) -> Candles:
+        """Candles of `pool` opening in [start, end), oldest first (gaps where the pool did not trade)."""
+        raise NotImplementedError
+
+    def _fetched(self, candles: Candles) -> Candles:
+        self.stats["fetches"] += 1
+        self.stats["candles"] += len(candles)
+        return candles
+
+
+class FileCandleSource(CandleSource):
+    """
+    Offline stand-in serving candles from a local CSV or Parquet file (see `load_candles`),
+    e.g. the file a backtest runs on, for tests and replays.
+    """
+    name = "FILE"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.candles = load_candles(path)
+
+    def fetch(self, pool: str, granularity: str, start: int, end: int) -> Candles:
+        first, last = np.searchsorted(self.candles.timestamps, [start, end])
+        volume = self.candles.volume
+        return self._fetched(Candles(
+            timestamps=self.candles.timestamps[first:last],
+            close=self.candles.close[first:last],
+            volume=volume[first:last] if volume is not None else None,
+        ))
+
+
+class GeckoTerminalSource(CandleSource):
+    """
+    Pool OHLCV from CoinGecko's on-chain DEX API (GeckoTerminal), in USD per unit of `token`.
+
+    The API pages backwards from `before_timestamp`, up to 1000 candles per request.
+    """
+    name = "COINGECKO_DEX"
+    URL = "https://api.geckoterminal.com/api/v2/networks/{network}/pools/{pool}/ohlcv/{timeframe}"
+    TIMEFRAMES = {"m": "minute", "h": "hour", "d": "day"}
+    PAGE = 1000
+
+    def __init__(self, network: str = "base", token: str = "base", timeout: float = 10.0, session=None):
+        super().__init__()
+        import requests
+
+        self.network = network
+        self.token = token
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def fetch(self, pool: str, granularity: str, start: int, end: int) -> Candles:
+        url = self.URL.format(network=self.network, pool=pool.lower(), timeframe=self.TIMEFRAMES[granularity[-1]])
+        step = granularity_seconds(granularity)
+        rows: Dict[int, Tuple[float, float]] = {}
+        before = end
+        while before > start:
+            limit = min(self.PAGE, max((before - start) // step, 1))
+            response = self.session.get(url, timeout=self.timeout, params={
+                "aggregate": granularity[:-1],
+                "before_timestamp": before,
+                "limit": limit,
+                "currency": "usd",
+                "token": self.token,
+            })
+            response.raise_for_status()
+            page = response.json()["data"]["attributes"]["ohlcv_list"]  # Newest first
+            for timestamp, _, _, _, close, volume in page:
+                if start <= timestamp < end:
+                    rows[int(timestamp)] = (float(close), float(volume))
+            if len(page) < limit:
+                break
+            before = int(page[-1][0])
+        timestamps = np.array(sorted(rows), dtype=np.int64)
+        return self._fetched(Candles(
+            timestamps=timestamps,
+            close=np.array([rows[t][0] for t in timestamps], dtype=np.float64),
+            volume=np.array([rows[t][1] for t in timestamps], dtype=np.float64),
+        ))
+
+
+SOURCES = {source.name: source for source in (GeckoTerminalSource, FileCandleSource)}
+
+
+def get_source(name: str, **options) -> CandleSource:
+    """The candle source registered under `name` (a `data_source` value)."""
+    try:
+        return SOURCES[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown data source {name!r}, expected one of {sorted(SOURCES)}") from None
+
+
+class _Series:
+    """One (pool, granularity) series: an append-only file of fixed-size records, memory-mapped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records: Optional[np.ndarray] = None
+        self._map()
+
+    def _map(self) -> None:
+        count = os.path.getsize(self.path) // RECORD.itemsize if os.path.exists(self.path) else 0
+        # A record cut short by a crash mid-append is ignored (and overwritten by the next one).
+        self.records = np.memmap(self.path, RECORD, mode="r", shape=(count,)) if count else np.empty(0, RECORD)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.records["timestamp"][-1]) if len(self.records) else None
+
+    def append(self, candles: Candles) -> int:
+        last = self.last_timestamp
+        keep = candles.timestamps > last if last is not None else slice(None)
+        rows = np.empty(len(candles.timestamps[keep]), RECORD)
+        rows["timestamp"] = candles.timestamps[keep]
+        rows["close"] = candles.close[keep]
+        rows["volume"] = candles.volume[keep] if candles.volume is not None else np.nan
+        if len(rows):
+            with open(self.path, "r+b" if os.path.exists(self.path) else "wb") as f:
+                f.seek(len(self.records) * RECORD.itemsize)
+                f.write(rows.tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            self._map()
+        return len(rows)
+
+
+class PriceStore:
+    """
+    Local candle store keyed by (pool, granularity), filled incrementally from a `CandleSource`.
+
+    Each series is an append-only file of (timestamp, close, volume) records under
+    `root`, memory-mapped for reads: `window()` returns NumPy views into the mapping,
+    so serving the strategy's `time_window` candles copies nothing and makes no request.
+    `sync()` fetches only candles newer than the last stored one, and only once a new
+    candle has closed.
+
+    Args:
+        root: Directory of the series files (created if missing).
+        source: Where missing candles are fetched from.
+        backfill: Candles fetched for a series that has none yet.
+    """
+
+    def __init__(self, root: str, source: CandleSource, backfill: int = 96):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.source = source
+        self.backfill = backfill
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.stats = {"syncs": 0, "fetches": 0, "appended": 0, "windows": 0}
+
+    def _get(self, pool: str, granularity: str) -> _Series:
+        key = (pool.lower(), granularity)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = _Series(os.path.join(self.root, f"{key[0]}-{granularity}.candles"))
+            return self._series[key]
+
+    def sync(self, pool: str, granularity: str, now: float) -> int:
+        """
+        Fetch the candles closed since the last stored one (the last `backfill` on first use).
+
+        Returns:
+            int: Number of candles appended.
+        """
+        step = granularity_seconds(granularity)
+        series = self._get(pool, granularity)
+        with series.lock:
+            self.stats["syncs"] += 1
+            end = int(now) // step * step  # Open time of the candle still in progress
+            last = series.last_timestamp
+            start = last + step if last is not None else end - self.backfill * step
+            if start >= end:
+                return 0
+            self.stats["fetches"] += 1
+            appended = series.append(self.source.fetch(pool, granularity, start, end))
+            self.stats["appended"] += appended
+            return appended
+
+    def window(self, pool: str, granularity: str, count: int, end: Optional[float] = None) -> Candles:
+        """The last `count` stored candles opening before `end` (all stored ones by default), as views."""
+        records = self._get(pool, granularity).records
+        stop = len(records) if end is None else int(np.searchsorted(records["timestamp"], end))
+        rows = records[max(stop - count, 0):stop]
+        self.stats["windows"] += 1
+        return Candles(timestamps=rows["timestamp"], close=rows["close"], volume=rows["volume"])
@@ -0,0 +1,110 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .rpc_transport import RpcTransport
+
+
+class RpcBudget:
+    """
+    Process-wide cap on in-flight JSON-RPC requests.
+
+    Every provider registered with the budget takes a slot for the duration of each
+    HTTP request (a JSON-RPC batch counts as one), so N strategies sharing a process
+    never have more than `limit` requests open against the node at once.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("The RPC concurrency limit must be at least 1")
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "waited": 0, "peak_in_flight": 0}
+
+    def call(self, fn: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["waited"] += 1
+            self._slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+            self.stats["requests"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def wrap(self, web3) -> None:
+        """Route a Web3 instance's provider requests through the budget (before its first request)."""
+        provider = web3.provider
+        for name in ("make_request", "make_batch_request"):
+            fn = getattr(provider, name, None)
+            if fn is not None:
+                setattr(provider, name, lambda *args, _fn=fn: self.call(_fn, *args))
+
+
+class ProviderRegistry:
+    """
+    Shares Web3 providers and protocol SDK objects between strategy instances in one process.
+
+    Instances are built on first use with the given factories (in the strategy,
+    `get_web3_by_network_and_chain` and `get_protocol_sdk`) and reused for every
+    strategy on the same network and chain, so a process hosting many strategies keeps
+    one connection pool and one SDK (ABIs, contract objects) per chain.
+
+    With `transport_options`, each shared provider is routed through an `RpcTransport`
+    (coalescing, connection pool, batching) built with those options.
+    """
+
+    def __init__(
+        self,
+        web3_factory: Callable[[Any, Any], Any],
+        sdk_factory: Callable[[Any, Any, Any], Any],
+        rpc_budget: Optional[RpcBudget] = None,
+        transport_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.web3_factory = web3_factory
+        self.sdk_factory = sdk_factory
+        self.rpc_budget = rpc_budget
+        self.transport_options = transport_options
+        self.transports: Dict[Tuple[Hashable, ...], RpcTransport] = {}
+        self._web3: Dict[Tuple[Hashable, ...], Any] = {}
+        self._sdks: Dict[Tuple[Hashable, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def web3(self, network, chain):
+        key = (network, chain)
+        with self._lock:
+            if key not in self._web3:
+                web3 = self.web3_factory(network, chain)
+                transport = None
+                if self.transport_options is not None:
+                    transport = RpcTransport.install(web3, rpc_budget=self.rpc_budget, **self.transport_options)
+                if transport is not None:
+                    self.transports[key] = transport
+                elif self.rpc_budget is not None:
+                    self.rpc_budget.wrap(web3)
+                self._web3[key] = web3
+            return self._web3[key]
+
+    def sdk(self, protocol, network, chain):
+        key = (protocol, network, chain)
+        with self._lock:
+            if key not in self._sdks:
+                self._sdks[key] = self.sdk_factory(protocol, network, chain)
+            return self._sdks[key]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        stats = {"web3": len(self._web3), "sdks": len(self._sdks)}
+        if self.rpc_budget is not None:
+            stats["rpc"] = dict(self.rpc_budget.stats)
+        for key, transport in self.transports.items():
+            stats[f"transport {'/'.join(map(str, key))}"] = {
+                name: value for name, value in transport.stats.items() if name != "methods"
+            }
+        return stats
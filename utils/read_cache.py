@@ -0,0 +1,94 @@
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class BlockCache:
+    """
+    Read-through cache for chain reads, keyed by (block number, call, args).
+
+    Values are only served for the block they were read at: when a new block is seen
+    the cache is emptied. The current block number is re-queried at most once per
+    `block_time` seconds, or pushed in with `advance()` by callers that already know it.
+    Callers working from one block for a while (e.g. a cycle's chain snapshot) `pin()`
+    it: lookups are then keyed off that block without querying the chain until
+    `unpin()`, so block tracking adds no RPC load even with `block_time` 0.
+
+    `invalidate()` drops everything, unpins and forces a block refresh; call it after
+    our own transactions execute, since they change balances within the same block range.
+    """
+
+    def __init__(
+        self,
+        block_number_fn: Callable[[], int],
+        block_time: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.block_number_fn = block_number_fn
+        self.block_time = block_time
+        self.clock = clock
+        self.block_number: Optional[int] = None
+        self._block_checked_at: Optional[float] = None
+        self._pinned = False
+        self._entries: Dict[Tuple[int, str, Tuple[Hashable, ...]], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def current_block(self) -> int:
+        """Current block number: the pinned one, else refreshed at most once per `block_time`."""
+        if self._pinned:
+            return self.block_number
+        now = self.clock()
+        if self._block_checked_at is None or now - self._block_checked_at >= self.block_time:
+            self.advance(self.block_number_fn())
+        return self.block_number
+
+    def advance(self, block_number: int) -> None:
+        """Record an observed block number, evicting entries from older blocks."""
+        self._block_checked_at = self.clock()
+        if block_number != self.block_number:
+            self.block_number = block_number
+            self._entries.clear()
+
+    def pin(self, block_number: int) -> None:
+        """Serve lookups at `block_number` without querying the chain until `unpin()`."""
+        self.advance(block_number)
+        self._pinned = True
+
+    def unpin(self) -> None:
+        """Resume tracking the chain's block number."""
+        self._pinned = False
+
+    def get(self, call: str, args: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """Return the cached value for `call(*args)` at the current block, loading it on a miss."""
+        key = (self.current_block(), call, args)
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = loader()
+        self._entries[key] = value
+        return value
+
+    def put(self, call: str, args: Tuple[Hashable, ...], value: Any, block_number: int) -> None:
+        """Prime the cache with a value already read at `block_number`."""
+        self.advance(block_number)
+        self._entries[(block_number, call, args)] = value
+
+    def invalidate(self) -> None:
+        """Drop all entries and force the next access to re-check the block number."""
+        self._entries.clear()
+        self._block_checked_at = None
+        self._pinned = False
+        self.invalidations += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
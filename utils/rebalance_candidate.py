@@ -0,0 +1,35 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+
+
+@dataclass
+class RebalanceCandidate:
+    """
+    A rebalance bundle built ahead of the trigger, with the inputs it was built from.
+
+    It stays usable while the position it closes, the wallet balances it deposits and
+    the pool tick it centers the new range on still hold: the tick may drift by up to
+    a tolerance, since a new range a few ticks off-center is as good as a fresh one.
+    """
+    bundle: Any
+    position_id: Optional[int]
+    balances: Tuple[int, int]
+    center_tick: int
+    tick_lower: int
+    tick_upper: int
+    tick_spacing: int
+    spot_price: float
+    block_number: Optional[int]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def tolerance_ticks(self, tolerance: float) -> float:
+        """Allowed center drift: `tolerance` as a fraction of the new range's half-width."""
+        return tolerance * (self.tick_upper - self.tick_lower) / 2
+
+    def is_fresh(self, position_id: Optional[int], balances: Tuple[int, int], tick: int, tolerance: float) -> bool:
+        return (
+            position_id == self.position_id
+            and balances == self.balances
+            and abs(tick - self.center_tick) <= self.tolerance_ticks(tolerance)
+        )
@@ -0,0 +1,253 @@
+import itertools
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Read-only methods whose identical in-flight requests can share one response.
+COALESCED_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getStorageAt",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+    "net_version",
+})
+
+
+class RpcTransport:
+    """
+    JSON-RPC over HTTP with request coalescing, a keep-alive connection pool and batching.
+
+    Installed on a Web3 HTTP provider, it replaces the provider's `make_request`:
+    - Identical read requests (same method and params) already in flight are
+      coalesced: later callers wait for the first one's response instead of sending.
+    - Requests go out over a `requests` session holding up to `pool_size` keep-alive
+      connections.
+    - Requests are sent straight away while a connection is free. When all of them
+      are busy, new requests queue up and leave together as one JSON-RPC batch on the
+      next free connection, so batching adds no latency at low load.
+    Latency per method (as seen by the caller) is recorded in `stats`.
+
+    Args:
+        endpoint_uri: HTTP(S) JSON-RPC endpoint.
+        pool_size: Keep-alive connections, and so HTTP requests in flight, at most.
+        max_batch: Most requests sent in one batch.
+        timeout: HTTP timeout in seconds, unless `request_kwargs` sets one.
+        rpc_budget: Optional process-wide `RpcBudget` each HTTP request must fit in.
+        request_kwargs: Passed to every `requests` post (headers, auth, proxies, timeout...),
+            as the provider's `get_request_kwargs()`.
+        retry: The provider's `exception_retry_configuration` (errors, retries,
+            backoff_factor, method_allowlist); None to never retry.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        pool_size: int = 16,
+        max_batch: int = 100,
+        timeout: float = 30.0,
+        rpc_budget=None,
+        request_kwargs: Optional[Dict[str, Any]] = None,
+        retry=None,
+    ):
+        self.endpoint_uri = endpoint_uri
+        self.pool_size = pool_size
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.rpc_budget = rpc_budget
+        self.request_kwargs = {"timeout": timeout, **(request_kwargs or {})}
+        self.retry = retry
+        self.batching = True
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._ids = itertools.count(1)
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue()
+        self._slots = threading.Semaphore(pool_size)
+        self._senders = ThreadPoolExecutor(pool_size, thread_name_prefix="rpc")
+        self._dispatcher: Optional[threading.Thread] = None
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "requests": 0, "coalesced": 0, "http_requests": 0, "batches": 0, "batched_requests": 0,
+            "methods": {},
+        }
+
+    @classmethod
+    def install(cls, web3, **options) -> Optional["RpcTransport"]:
+        """
+        Route `web3`'s requests through a new transport (before its first request).
+
+        The provider's request kwargs (headers, auth, proxies, timeout) and exception
+        retry configuration carry over to the transport.
+
+        Returns:
+            Optional[RpcTransport]: The transport, or None if the provider isn't an HTTP
+                provider, in which case it is left as-is.
+        """
+        endpoint_uri = str(getattr(web3.provider, "endpoint_uri", ""))
+        if not endpoint_uri.startswith("http"):
+            return None
+        provider = web3.provider
+        if hasattr(provider, "get_request_kwargs"):
+            options.setdefault("request_kwargs", dict(provider.get_request_kwargs()))
+        options.setdefault("retry", getattr(provider, "exception_retry_configuration", None))
+        transport = cls(endpoint_uri, **options)
+        web3.provider.make_request = transport.make_request
+        return transport
+
+    def make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        """Send one JSON-RPC request and return its response object (as Web3 providers do)."""
+        started = time.perf_counter()
+        key = None
+        if method in COALESCED_METHODS:
+            key = (method, json.dumps(params, sort_keys=True, default=str))
+
+        with self._lock:
+            self.stats["requests"] += 1
+            future = self._in_flight.get(key) if key is not None else None
+            leader = future is None
+            if leader:
+                future = Future()
+                if key is not None:
+                    self._in_flight[key] = future
+                    future.add_done_callback(lambda _, key=key: self._forget(key))
+            else:
+                self.stats["coalesced"] += 1
+
+        if leader:
+            request = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+            self._enqueue(request, future)
+        try:
+            return dict(future.result())
+        finally:
+            self._record(method, time.perf_counter() - started)
+
+    def close(self) -> None:
+        if self._dispatcher is not None:
+            self._queue.put(None)
+            self._dispatcher.join()
+            self._dispatcher = None
+        self._senders.shutdown()
+        self.session.close()
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _enqueue(self, request: Dict[str, Any], future: Future) -> None:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="rpc-dispatch", daemon=True)
+                self._dispatcher.start()
+        self._queue.put((request, future))
+
+    def _dispatch(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # Wait for a free connection; requests arriving meanwhile join this batch.
+            self._slots.acquire()
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._senders.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        try:
+            if len(batch) > 1 and self.batching:
+                responses = self._post([request for request, _ in batch])
+                if isinstance(responses, list):
+                    by_id = {response.get("id"): response for response in responses}
+                    with self._lock:
+                        self.stats["batches"] += 1
+                        self.stats["batched_requests"] += len(batch)
+                    for request, future in batch:
+                        self._resolve(future, by_id.get(request["id"]), request)
+                    return
+                # The endpoint rejected the batch: send requests one by one from now on.
+                self.batching = False
+            for request, future in batch:
+                self._resolve(future, self._post(request), request)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _post(self, payload: Any) -> Any:
+        with self._lock:
+            self.stats["http_requests"] += 1
+        if self.rpc_budget is not None:
+            return self.rpc_budget.call(self._http_post, payload)
+        return self._http_post(payload)
+
+    def _http_post(self, payload: Any) -> Any:
+        methods = [request["method"] for request in (payload if isinstance(payload, list) else [payload])]
+        retries = max(self.retry.retries, 1) if self.retry is not None and all(map(self._retryable, methods)) else 1
+        for attempt in range(retries):
+            try:
+                response = self.session.post(self.endpoint_uri, json=payload, **self.request_kwargs)
+                response.raise_for_status()
+                return response.json()
+            except tuple(self.retry.errors if self.retry is not None else ()):
+                if attempt == retries - 1:
+                    raise
+                time.sleep(self.retry.backoff_factor * 2 ** attempt)
+
+    def _retryable(self, method: str) -> bool:
+        # As web3's check_if_retry_on_failure: the method or its namespace is allowlisted
+        allowlist = self.retry.method_allowlist
+        return method in allowlist or method.split("_")[0] in allowlist
+
+    @staticmethod
+    def _resolve(future: Future, response: Optional[Dict[str, Any]], request: Dict[str, Any]) -> None:
+        if response is None:
+            future.set_exception(ValueError(f"No response to {request['method']} in JSON-RPC batch"))
+        else:
+            future.set_result(response)
+
+    def _record(self, method: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self.stats["methods"].setdefault(method, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed * 1000
+            entry["max_ms"] = max(entry["max_ms"], elapsed * 1000)
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, mean and max latency in ms per JSON-RPC method."""
+        with self._lock:
+            return {
+                method: {
+                    "count": entry["count"],
+                    "mean_ms": entry["total_ms"] / entry["count"],
+                    "max_ms": entry["max_ms"],
+                }
+                for method, entry in self.stats["methods"].items()
+            }
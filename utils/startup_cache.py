@@ -0,0 +1,92 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import stat
+import tempfile
+from typing import Any, Dict, Optional, Type
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "almanak-strategy-startup")
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class StartupCache:
+    """
+    Validated config models, keyed by the hash of what produced them.
+
+    `validated(model, values)` returns a pydantic model validated from `values`, keyed by
+    the hash of the values and of the model's source file. Instances are kept in-process
+    (shared by every strategy of an orchestrator) and pickled to `directory`, so a
+    cron-style start skips validation, address checks included, until either the config
+    or the schema changes.
+
+    The on-disk cache is only used when `directory` is private to the current user,
+    since it holds pickles.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.environ.get("STRATEGY_STARTUP_CACHE", DEFAULT_CACHE_DIR)
+        self._memory: Dict[str, Any] = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def validated(self, model: Type, values: Dict[str, Any]) -> Any:
+        try:
+            schema = file_digest(inspect.getsourcefile(model))
+        except (OSError, TypeError):
+            return model(**values)  # No source file to key the schema on
+        payload = json.dumps(values, sort_keys=True, default=str).encode()
+        key = f"{model.__name__}-{hashlib.sha256(payload + schema.encode()).hexdigest()[:32]}"
+
+        instance = self._memory.get(key)
+        if instance is not None:
+            self.stats["hits"] += 1
+        else:
+            instance = self._read(key)
+            if instance is not None:
+                self.stats["disk_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                instance = model(**values)
+                self._write(key, instance)
+            self._memory[key] = instance
+        return instance.model_copy(deep=True)
+
+    def _private_directory(self) -> Optional[str]:
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            info = os.stat(self.directory)
+        except OSError:
+            return None
+        if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+            return None
+        return self.directory
+
+    def _read(self, key: str) -> Any:
+        directory = self._private_directory()
+        if directory is None:
+            return None
+        try:
+            with open(os.path.join(directory, f"{key}.pickle"), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+            return None
+
+    def _write(self, key: str, instance: Any) -> None:
+        directory = self._private_directory()
+        if directory is None:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(instance, f)
+            os.replace(tmp_path, os.path.join(directory, f"{key}.pickle"))
+        except (OSError, pickle.PicklingError):
+            pass
+
+
+startup_cache = StartupCache()
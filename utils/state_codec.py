@@ -0,0 +1,235 @@
+import json
+import struct
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+SLOT_KINDS = ("int", "float", "bool", "str", "datetime", "uuids", "history")
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert a persistent state value to plain JSON types (enums, UUIDs, datetimes)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if hasattr(value, "encode") and hasattr(value, "drain_changes"):
+        return value.encode()
+    if hasattr(value, "model_dump"):
+        return to_jsonable(value.model_dump())
+    return value
+
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+class StateSchema:
+    """
+    Versioned layout of a persistent state, with migrations from older versions.
+
+    `slots` lists the fields with a fixed binary encoding, as (name, kind) in storage
+    order; other fields are stored generically. Bump `version` whenever the slots or
+    field meanings change, keep the old layout in `layouts` so older payloads still
+    decode, and register a migration from the previous version:
+
+        @schema.migration(2)
+        def _v2_to_v3(data):
+            data["new_field"] = ...
+            return data
+    """
+
+    def __init__(self, version: int, slots: Sequence[Tuple[str, str]],
+                 layouts: Optional[Dict[int, Sequence[Tuple[str, str]]]] = None):
+        for name, kind in slots:
+            if kind not in SLOT_KINDS:
+                raise ValueError(f"Unknown slot kind {kind!r} for {name!r}, expected one of {SLOT_KINDS}")
+        self.version = version
+        self.slots = list(slots)
+        self.layouts = {**(layouts or {}), version: self.slots}
+        self.migrations: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+    def migration(self, from_version: int) -> Callable:
+        """Register a function upgrading a state dict from `from_version` to the next version."""
+        def register(fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable:
+            self.migrations[from_version] = fn
+            return fn
+        return register
+
+    def migrate(self, data: Dict[str, Any], version: int) -> Dict[str, Any]:
+        """Upgrade `data` stored at `version` to the current version."""
+        if version > self.version:
+            raise ValueError(f"State schema version {version} is newer than this strategy's ({self.version})")
+        while version < self.version:
+            migrate = self.migrations.get(version)
+            if migrate is not None:
+                data = migrate(data)
+            version += 1
+        return data
+
+
+class JsonCodec:
+    """Readable JSON snapshots: `{"generation", "schema_version", "state"}`."""
+
+    name = "json"
+    extension = "json"
+
+    def __init__(self, schema: StateSchema):
+        self.schema = schema
+
+    def encode(self, values: Dict[str, Any], generation: int) -> bytes:
+        document = {"generation": generation, "schema_version": self.schema.version, "state": to_jsonable(values)}
+        return json.dumps(document, separators=(",", ":"), default=str).encode()
+
+    def decode(self, payload: bytes) -> Tuple[int, Dict[str, Any]]:
+        document = json.loads(payload)
+        # Snapshots written before schema versioning are version 1.
+        data = self.schema.migrate(document["state"], document.get("schema_version", 1))
+        return document["generation"], data
+
+
+class BinaryCodec:
+    """
+    Compact binary snapshots: a fixed header, the schema's slots, then the remaining fields.
+
+    Layout (little-endian): magic, schema version (u16), generation (u64), a bitmap of
+    the slots that are None, the present slots in schema order, and the fields without
+    a slot as a length-prefixed JSON object. Histories are stored as their packed
+    `to_bytes()` form (no base64), datetimes as UTC epoch seconds.
+    """
+
+    name = "binary"
+    extension = "bin"
+    MAGIC = b"PSB1"
+    _HEADER = struct.Struct("<4sHQ")
+
+    def __init__(self, schema: StateSchema):
+        self.schema = schema
+
+    def encode(self, values: Dict[str, Any], generation: int) -> bytes:
+        slots = self.schema.slots
+        parts = [self._HEADER.pack(self.MAGIC, self.schema.version, generation), b""]
+        nulls = 0
+        for index, (name, kind) in enumerate(slots):
+            value = values.get(name)
+            if value is None:
+                nulls |= 1 << index
+            else:
+                parts.append(_ENCODERS[kind](value))
+        parts[1] = nulls.to_bytes((len(slots) + 7) // 8, "little")
+
+        slotted = {name for name, _ in slots}
+        rest = {name: value for name, value in values.items() if name not in slotted}
+        tail = json.dumps(to_jsonable(rest), separators=(",", ":"), default=str).encode()
+        parts.append(_U32.pack(len(tail)) + tail)
+        return b"".join(parts)
+
+    def decode(self, payload: bytes) -> Tuple[int, Dict[str, Any]]:
+        buf = memoryview(payload)
+        magic, version, generation = self._HEADER.unpack_from(buf, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a binary state snapshot (magic {magic!r})")
+        slots = self.schema.layouts.get(version)
+        if slots is None:
+            raise ValueError(f"No layout for state schema version {version}")
+
+        offset = self._HEADER.size
+        bitmap_size = (len(slots) + 7) // 8
+        nulls = int.from_bytes(buf[offset:offset + bitmap_size], "little")
+        offset += bitmap_size
+        data: Dict[str, Any] = {}
+        for index, (name, kind) in enumerate(slots):
+            if nulls >> index & 1:
+                data[name] = None
+            else:
+                data[name], offset = _DECODERS[kind](buf, offset)
+
+        (size,) = _U32.unpack_from(buf, offset)
+        offset += _U32.size
+        data.update(json.loads(bytes(buf[offset:offset + size])))
+        return generation, self.schema.migrate(data, version)
+
+
+def _sized(payload: bytes, size: struct.Struct = _U32) -> bytes:
+    return size.pack(len(payload)) + payload
+
+
+def _read_sized(buf: memoryview, offset: int, size: struct.Struct = _U32) -> Tuple[bytes, int]:
+    (length,) = size.unpack_from(buf, offset)
+    offset += size.size
+    return bytes(buf[offset:offset + length]), offset + length
+
+
+def _encode_str(value: Any) -> bytes:
+    if isinstance(value, Enum):
+        value = value.value
+    return _sized(str(value).encode(), _U16)
+
+
+def _encode_datetime(value: Any) -> bytes:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return _F64.pack(value.timestamp())
+
+
+def _encode_uuids(values: List[Any]) -> bytes:
+    return _U32.pack(len(values)) + b"".join(UUID(str(value)).bytes for value in values)
+
+
+def _decode_str(buf: memoryview, offset: int) -> Tuple[str, int]:
+    raw, offset = _read_sized(buf, offset, _U16)
+    return raw.decode(), offset
+
+
+def _decode_datetime(buf: memoryview, offset: int) -> Tuple[datetime, int]:
+    (timestamp,) = _F64.unpack_from(buf, offset)
+    return datetime.fromtimestamp(timestamp, timezone.utc), offset + _F64.size
+
+
+def _decode_uuids(buf: memoryview, offset: int) -> Tuple[List[UUID], int]:
+    (count,) = _U32.unpack_from(buf, offset)
+    offset += _U32.size
+    values = [UUID(bytes=bytes(buf[offset + 16 * i:offset + 16 * (i + 1)])) for i in range(count)]
+    return values, offset + 16 * count
+
+
+_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "int": lambda value: _I64.pack(int(value)),
+    "float": lambda value: _F64.pack(float(value)),
+    "bool": lambda value: b"\x01" if value else b"\x00",
+    "str": _encode_str,
+    "datetime": _encode_datetime,
+    "uuids": _encode_uuids,
+    "history": lambda value: _sized(value.to_bytes()),
+}
+
+_DECODERS: Dict[str, Callable[[memoryview, int], Tuple[Any, int]]] = {
+    "int": lambda buf, offset: (_I64.unpack_from(buf, offset)[0], offset + _I64.size),
+    "float": lambda buf, offset: (_F64.unpack_from(buf, offset)[0], offset + _F64.size),
+    "bool": lambda buf, offset: (buf[offset] != 0, offset + 1),
+    "str": _decode_str,
+    "datetime": _decode_datetime,
+    "uuids": _decode_uuids,
+    "history": _read_sized,
+}
+
+CODECS = {codec.name: codec for codec in (JsonCodec, BinaryCodec)}
+
+
+def get_codec(name: str, schema: StateSchema):
+    """The snapshot codec registered under `name` ("json" or "binary") for `schema`."""
+    try:
+        return CODECS[name](schema)
+    except KeyError:
+        raise ValueError(f"Unknown state codec {name!r}, expected one of {sorted(CODECS)}") from None
@@ -0,0 +1,211 @@
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .state_codec import CODECS, JsonCodec, StateSchema, to_jsonable  # noqa: F401 (to_jsonable is re-exported)
+
+
+def _fsync_dir(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, payload: bytes) -> None:
+    """Write a file so readers see either the old or the new content, never a partial one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+class StateJournal:
+    """
+    Persistent state stored as a full snapshot plus an append-only journal of deltas.
+
+    Each save appends one line holding only the fields that changed ("set") and the rows
+    added to history buffers ("append"). Every `compact_every` entries, or once the
+    journal outgrows the snapshot, the state is compacted into a new snapshot.
+
+    Crash safety:
+    - Snapshots are written atomically (temp file, fsync, rename).
+    - Each journal line carries a CRC32; a torn or corrupt tail is ignored on load.
+    - Snapshots record a generation number and each generation has its own journal
+      file, so a crash between writing a snapshot and dropping the old journal never
+      replays stale entries.
+
+    Snapshots are written with `codec` (see `state_codec`; JSON by default). A snapshot
+    left in another codec's format is still loaded, and replaced at the next compaction.
+    """
+
+    def __init__(self, directory: str, name: str = "persistent_state", compact_every: int = 500, codec=None):
+        self.directory = directory
+        self.name = name
+        self.compact_every = compact_every
+        self.codec = codec or JsonCodec(StateSchema(1, []))
+        self.generation = 0
+        self.entries = 0
+        self.journal_bytes = 0
+        self.snapshot_bytes = 0
+        self._synced = False
+        self._last_stat: Tuple[Optional[Tuple[int, int]], ...] = ()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return self._snapshot_path(self.codec)
+
+    def _snapshot_path(self, codec) -> str:
+        return os.path.join(self.directory, f"{self.name}.snapshot.{codec.extension}")
+
+    def _existing_snapshot(self) -> Optional[Tuple[str, Any]]:
+        """Path and codec of the snapshot on disk, preferring this journal's own format."""
+        codecs = [self.codec] + [codec(self.codec.schema) for name, codec in CODECS.items() if name != self.codec.name]
+        for codec in codecs:
+            path = self._snapshot_path(codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def journal_path(self, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.directory, f"{self.name}.journal.{generation}.jsonl")
+
+    def has_snapshot(self) -> bool:
+        return self._existing_snapshot() is not None
+
+    def is_current(self) -> bool:
+        """True when the files on disk are exactly what this instance last wrote or read."""
+        return self._synced and self._last_stat == self._stat()
+
+    def _stat(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        stats = []
+        for path in (self.snapshot_path, self.journal_path()):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def _mark_synced(self) -> None:
+        self._synced = True
+        self._last_stat = self._stat()
+
+    def load(self) -> Optional[Tuple[Dict[str, Any], Dict[str, List[list]]]]:
+        """
+        Rebuild the state from the snapshot and its journal.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], Dict[str, List[list]]]]: The field values, and rows
+                appended to history fields since the snapshot (to replay in order). None if
+                no snapshot exists yet.
+        """
+        existing = self._existing_snapshot()
+        if existing is None:
+            return None
+        path, codec = existing
+        with open(path, "rb") as f:
+            raw = f.read()
+        self.generation, data = codec.decode(raw)
+        self.snapshot_bytes = len(raw)
+
+        appends: Dict[str, List[list]] = {}
+        self.entries = 0
+        self.journal_bytes = 0
+        if os.path.exists(self.journal_path()):
+            with open(self.journal_path(), "rb") as f:
+                for line in f:
+                    entry = self._decode_line(line)
+                    if entry is None:
+                        break  # Torn write from a crash: everything after it is unreliable
+                    for field, value in entry.get("set", {}).items():
+                        data[field] = value
+                        appends.pop(field, None)
+                    for field, rows in entry.get("append", {}).items():
+                        appends.setdefault(field, []).extend(rows)
+                    self.entries += 1
+                    self.journal_bytes += len(line)
+            # Drop any torn tail so new entries are appended after the last good one.
+            with open(self.journal_path(), "r+b") as f:
+                f.truncate(self.journal_bytes)
+        self._mark_synced()
+        return data, appends
+
+    @staticmethod
+    def _decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+        if not line.endswith(b"\n") or len(line) < 10:
+            return None
+        checksum, payload = line[:8], line[9:-1]
+        try:
+            if int(checksum, 16) != zlib.crc32(payload):
+                return None
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def append(self, sets: Dict[str, Any], appends: Dict[str, List[list]]) -> int:
+        """
+        Durably append one delta entry.
+
+        Returns:
+            int: Bytes written (0 if there was nothing to record).
+        """
+        if not sets and not appends:
+            return 0
+        entry = {}
+        if sets:
+            entry["set"] = sets
+        if appends:
+            entry["append"] = appends
+        payload = json.dumps(entry, separators=(",", ":"), default=str).encode()
+        line = b"%08x %s\n" % (zlib.crc32(payload), payload)
+        with open(self.journal_path(), "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += 1
+        self.journal_bytes += len(line)
+        self._mark_synced()
+        return len(line)
+
+    def needs_compaction(self) -> bool:
+        return self.entries >= self.compact_every or (
+            self.snapshot_bytes > 0 and self.journal_bytes > self.snapshot_bytes
+        )
+
+    def compact(self, data: Dict[str, Any]) -> int:
+        """
+        Replace snapshot and journal with a new full snapshot of `data`.
+
+        Args:
+            data: Field values, either JSON-ready or as held by the model (the codec
+                converts them).
+
+        Returns:
+            int: Bytes written.
+        """
+        previous_journal = self.journal_path()
+        previous_snapshot = self._existing_snapshot()
+        generation = self.generation + 1
+        payload = self.codec.encode(data, generation)
+        atomic_write(self.snapshot_path, payload)
+        if previous_snapshot is not None and previous_snapshot[0] != self.snapshot_path:
+            os.remove(previous_snapshot[0])
+        self.generation = generation
+        self.entries = 0
+        self.journal_bytes = 0
+        self.snapshot_bytes = len(payload)
+        if os.path.exists(previous_journal):
+            os.remove(previous_journal)
+        self._mark_synced()
+        return len(payload)
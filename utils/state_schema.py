@@ -0,0 +1,56 @@
+from typing import Any, Dict
+
+from .state_codec import StateSchema
+
+# Storage layout of PersistentState. Bump the version (keeping the old layout) and
+# register a migration whenever fields are added, removed or change meaning.
+_V2_SLOTS = [
+    ("current_state", "str"),
+    ("current_substate", "str"),
+    ("current_flowstatus", "str"),
+    ("current_actions", "uuids"),
+    ("sadflow_counter", "int"),
+    ("sadflow_actions", "uuids"),
+    ("not_included_counter", "int"),
+    ("position_id", "int"),
+    ("eth_usdc_position_id", "int"),
+    ("retry_count", "int"),
+    ("last_check_time", "datetime"),
+    ("last_rebalance_time", "datetime"),
+    ("last_rebalance_timestamp", "float"),
+    ("last_eth_price", "float"),
+    ("position_tick_lower", "int"),
+    ("position_tick_upper", "int"),
+    ("tick_spacing", "int"),
+    ("price_history", "history"),
+    ("rebalance_history", "history"),
+]
+
+# v3 added `allowances`, stored with the unslotted fields; v4 the packed `volatility` statistics.
+_V4_SLOTS = _V2_SLOTS + [("volatility", "history")]
+PERSISTENT_STATE_SCHEMA = StateSchema(version=4, slots=_V4_SLOTS, layouts={2: _V2_SLOTS, 3: _V2_SLOTS})
+
+
+@PERSISTENT_STATE_SCHEMA.migration(1)
+def _v1_to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
+    # v1 kept the states' position id and rebalance time as untyped extra fields, and
+    # the position id read by the chain snapshot could lag behind the one the states set.
+    data.setdefault("eth_usdc_position_id", None)
+    data.setdefault("last_rebalance_timestamp", None)
+    if data.get("position_id", -1) == -1 and data["eth_usdc_position_id"] is not None:
+        data["position_id"] = data["eth_usdc_position_id"]
+    return data
+
+
+@PERSISTENT_STATE_SCHEMA.migration(2)
+def _v2_to_v3(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Allowances are read from the chain on first use.
+    data.setdefault("allowances", {})
+    return data
+
+
+@PERSISTENT_STATE_SCHEMA.migration(3)
+def _v3_to_v4(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Volatility statistics start empty and are rebuilt from the price history on load.
+    data.setdefault("volatility", None)
+    return data
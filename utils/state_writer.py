@@ -0,0 +1,159 @@
+import atexit
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from .state_journal import StateJournal
+from .structured_log import StructuredLogger, get_logger
+
+_writers: "weakref.WeakSet[StateWriter]" = weakref.WeakSet()
+
+
+class StateWriter:
+    """
+    Writes persistent state saves to a `StateJournal` on a background thread (write-behind).
+
+    The caller hands over a save already detached from the live state, either a delta
+    (`submit_delta`) or a full snapshot (`submit_snapshot`), and returns without any I/O.
+    Saves submitted while a write is in progress are coalesced: deltas merge the way the
+    journal replays them (a "set" drops earlier appends to the field), and a snapshot
+    supersedes everything queued before it. Each write keeps the journal's guarantees
+    (atomic snapshot replace, fsynced CRC-checked journal lines).
+
+    `flush()` is the barrier: it returns once everything submitted so far is on disk and
+    re-raises a write that failed. After a failure the journal may lack entries, so
+    deltas are dropped and `needs_snapshot` stays set until a full snapshot is written.
+
+    Args:
+        journal: Where saves are written; only this writer may write to it.
+        on_write: Called on the writer thread with (bytes written, seconds) per write.
+        log: Where failed writes are reported (a logger of its own by default).
+    """
+
+    def __init__(
+        self,
+        journal: StateJournal,
+        on_write: Optional[Callable[[int, float], None]] = None,
+        log: Optional[StructuredLogger] = None,
+    ):
+        self.journal = journal
+        self.on_write = on_write
+        self.log = log or get_logger("state_writer")
+        self.needs_snapshot = False
+        self.error: Optional[BaseException] = None
+        self.stats = {"submitted": 0, "coalesced": 0, "writes": 0, "bytes": 0}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._sets: Dict[str, Any] = {}
+        self._appends: Dict[str, List[list]] = {}
+        self._submitted = 0  # Sequence number of the last save submitted
+        self._written = 0  # ... and of the last one written (or dropped by a failure)
+        self._queued = False  # A save is waiting for the writer (not yet taken)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        _writers.add(self)
+
+    @property
+    def pending(self) -> bool:
+        """True while submitted saves are not on disk yet."""
+        return self._written < self._submitted
+
+    def submit_delta(self, sets: Dict[str, Any], appends: Dict[str, List[list]]) -> bool:
+        """
+        Queue a journal entry (as from `PersistentState.journal_delta()`).
+
+        Returns:
+            bool: False if it was dropped because a full snapshot must be written first.
+        """
+        if not sets and not appends:
+            return True
+        with self._cond:
+            if self.needs_snapshot:
+                return False
+            if self._queued:
+                self.stats["coalesced"] += 1
+            for field, value in sets.items():
+                self._sets[field] = value
+                self._appends.pop(field, None)
+            for field, rows in appends.items():
+                self._appends.setdefault(field, []).extend(rows)
+            self._enqueue()
+        return True
+
+    def submit_snapshot(self, values: Dict[str, Any]) -> None:
+        """Queue a compaction into a full snapshot of `values`, which must not be mutated afterwards."""
+        with self._cond:
+            if self._queued:
+                self.stats["coalesced"] += 1
+            self._snapshot, self._sets, self._appends = values, {}, {}
+            self.needs_snapshot = False
+            self._enqueue()
+
+    def _enqueue(self) -> None:
+        self._submitted += 1
+        self._queued = True
+        self.stats["submitted"] += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every save submitted so far is written.
+
+        Returns:
+            bool: False on timeout.
+
+        Raises:
+            Exception: The error of a write that failed since the last flush.
+        """
+        with self._cond:
+            target = self._submitted
+            if not self._cond.wait_for(lambda: self._written >= target, timeout):
+                return False
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._written < self._submitted)
+                sequence = self._submitted
+                snapshot, sets, appends = self._snapshot, self._sets, self._appends
+                self._snapshot, self._sets, self._appends = None, {}, {}
+                self._queued = False
+
+            started = time.perf_counter()
+            try:
+                written = self.journal.compact(snapshot) if snapshot is not None else 0
+                written += self.journal.append(sets, appends)
+            except Exception as e:
+                self.log.warning("Background state write failed", error=repr(e), snapshot=snapshot is not None)
+                with self._cond:
+                    self.error = e
+                    if self._snapshot is None:  # Unless a snapshot is queued to repair it,
+                        self.needs_snapshot = True  # the journal now has a gap: drop deltas until one is
+                        self._sets, self._appends = {}, {}
+                    self._written = sequence
+                    self._cond.notify_all()
+                continue
+
+            with self._cond:
+                self.stats["writes"] += 1
+                self.stats["bytes"] += written
+                self._written = sequence
+                self._cond.notify_all()
+            if self.on_write is not None:
+                self.on_write(written, time.perf_counter() - started)
+
+
+@atexit.register
+def _flush_writers() -> None:
+    for writer in list(_writers):
+        try:
+            writer.flush(timeout=5.0)
+        except Exception as e:
+            writer.log.error("Persistent state write failed at exit", error=repr(e))
@@ -0,0 +1,165 @@
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, TextIO
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest")
+
+
+class LogWriter:
+    """
+    Writes log records as JSON lines from a bounded queue on a background thread.
+
+    Callers only enqueue a dict; serialization and the (possibly blocking) stream write
+    happen on the writer thread. When the queue is full the overflow policy drops a
+    record (the new one, or the oldest queued) instead of waiting, so logging never
+    stalls the caller. The number dropped is reported in the next line written.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, queue_size: int = 10000, overflow: str = "drop_new"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}")
+        self.stream = stream or sys.stdout
+        self.overflow = overflow
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queue a record without blocking; returns False if it (or an older one) was dropped."""
+        self._start()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+        if self.overflow == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._lock:
+            self.dropped += 1
+        return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every record queued so far is written; returns False on timeout."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _start(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < 256:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines, markers = [], []
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                lines.append(json.dumps({"ts": time.time(), "level": "WARNING", "msg": "log records dropped",
+                                         "count": dropped}))
+            for item in items:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    lines.append(json.dumps(item, default=str, separators=(",", ":")))
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                    self.written += len(lines)
+                except (OSError, ValueError):
+                    pass  # Closed or broken stream: logging must not take the strategy down
+            for marker in markers:
+                marker.set()
+
+
+class StructuredLogger:
+    """
+    Level-filtered JSON-lines logger with bound context fields.
+
+    Records below `level` are discarded before anything is formatted. Fields should
+    be plain values or small dicts; they are serialized later on the writer thread.
+    """
+
+    def __init__(self, name: str, writer: LogWriter, level: str = "INFO", context: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.writer = writer
+        self.level = LEVELS[level.upper()]
+        self.context = context or {}
+
+    def bind(self, **context) -> "StructuredLogger":
+        logger = StructuredLogger(self.name, self.writer, context={**self.context, **context})
+        logger.level = self.level
+        return logger
+
+    def is_enabled_for(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def log(self, level: str, msg: str, **fields) -> None:
+        if LEVELS[level] < self.level:
+            return
+        self.writer.submit({"ts": time.time(), "level": level, "logger": self.name, "msg": msg,
+                            **self.context, **fields})
+
+    def debug(self, msg: str, **fields) -> None:
+        self.log("DEBUG", msg, **fields)
+
+    def info(self, msg: str, **fields) -> None:
+        self.log("INFO", msg, **fields)
+
+    def warning(self, msg: str, **fields) -> None:
+        self.log("WARNING", msg, **fields)
+
+    def error(self, msg: str, **fields) -> None:
+        self.log("ERROR", msg, **fields)
+
+
+_writers: Dict[Any, LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_logger(
+    name: str,
+    level: str = "INFO",
+    path: Optional[str] = None,
+    queue_size: int = 10000,
+    overflow: str = "drop_new",
+) -> StructuredLogger:
+    """A logger writing to `path` (stdout if None); loggers on the same target share one writer."""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            stream = open(path, "a", buffering=1) if path else None
+            writer = _writers[path] = LogWriter(stream, queue_size, overflow)
+    return StructuredLogger(name, writer, level)
+
+
+@atexit.register
+def _flush_writers() -> None:
+    for writer in list(_writers.values()):
+        writer.flush(timeout=2.0)
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from .tick_math import Q96, sqrt_ratio_at_tick
+
+FEE_DENOMINATOR = 1_000_000
+
+
+@dataclass
+class SwapPlan:
+    """The swap that leaves balances in the ratio a mint over the target range takes."""
+    zero_for_one: bool
+    amount_in: int
+    expected_out: int
+    sqrt_price_after: int
+
+    @property
+    def needed(self) -> bool:
+        return self.amount_in > 0
+
+    def balances_after(self, amount0: int, amount1: int) -> Tuple[int, int]:
+        """Expected (token0, token1) balances once the swap has executed."""
+        if not self.needed:
+            return amount0, amount1
+        if self.zero_for_one:
+            return amount0 - self.amount_in, amount1 + self.expected_out
+        return amount0 + self.expected_out, amount1 - self.amount_in
+
+
+def mint_ratio(sqrt_price_x96: int, tick_lower: int, tick_upper: int) -> Optional[float]:
+    """
+    Token1 per token0 (raw units) that a mint over the range takes at a price; None when
+    the price is outside the range and the mint is single-sided.
+    """
+    sqrt_lower, sqrt_upper = sqrt_ratio_at_tick(tick_lower), sqrt_ratio_at_tick(tick_upper)
+    if not sqrt_lower < sqrt_price_x96 < sqrt_upper:
+        return None
+    p, pa, pb = sqrt_price_x96 / Q96, sqrt_lower / Q96, sqrt_upper / Q96
+    return (p - pa) / (1 / p - 1 / pb)
+
+
+def optimal_swap(
+    sqrt_price_x96: int,
+    tick_lower: int,
+    tick_upper: int,
+    amount0: int,
+    amount1: int,
+    fee_pips: int,
+    quote: Optional[Callable[[bool, int], Tuple[int, int]]] = None,
+    iterations: int = 60,
+    min_share: float = 0.001,
+) -> SwapPlan:
+    """
+    Size the swap after which a mint over [tick_lower, tick_upper) takes both balances whole.
+
+    With balances (x, y) and a mint ratio r = y'/x', selling d of token1 at a rate q
+    (token0 out per token1 in, fee included) must satisfy (y - d) / (x + q d) = r, so
+    d = (y - r x) / (1 + r q); selling token0 mirrors it. The closed form is an
+    approximation: it takes r at the pre-swap price and q as the spot price net of the
+    fee tier, ignoring price impact, so larger swaps leave part of the balances idle.
+    With `quote` (e.g. a pool simulator's) the closed form is only the starting point:
+    the amount is bisected on the quoted output and the mint ratio at the quoted
+    post-swap price until the leftover is below a millionth of the swap. Pass a quote
+    whenever one is available.
+
+    Args:
+        sqrt_price_x96: Current pool price.
+        tick_lower: Lower tick of the target range.
+        tick_upper: Upper tick of the target range.
+        amount0: token0 available to the mint.
+        amount1: token1 available to the mint.
+        fee_pips: Pool fee tier, e.g. 500 for 0.05%.
+        quote: Optional `(zero_for_one, amount_in) -> (amount_out, sqrt_price_after)`.
+        iterations: Maximum refinement steps with `quote`.
+        min_share: Swaps worth less than this share of the balances are skipped.
+
+    Returns:
+        SwapPlan: Direction and amount to swap (amount 0 when no swap is worth making).
+    """
+    spot = (sqrt_price_x96 / Q96) ** 2  # token1 per token0
+    fee_factor = 1 - fee_pips / FEE_DENOMINATOR
+    total_in_token1 = amount0 * spot + amount1
+
+    ratio = mint_ratio(sqrt_price_x96, tick_lower, tick_upper)
+    if ratio is None:
+        # Out of range: the mint takes only the token on the far side of the price.
+        zero_for_one = sqrt_price_x96 >= sqrt_ratio_at_tick(tick_upper)
+        amount_in = amount0 if zero_for_one else amount1
+        rate = spot * fee_factor if zero_for_one else fee_factor / spot
+        plan = SwapPlan(zero_for_one, amount_in, int(amount_in * rate), sqrt_price_x96)
+        if quote is not None and amount_in:
+            plan.expected_out, plan.sqrt_price_after = quote(zero_for_one, amount_in)
+    else:
+        zero_for_one = amount1 < ratio * amount0
+        rate = spot * fee_factor if zero_for_one else fee_factor / spot
+        plan = _solve(zero_for_one, amount0, amount1, ratio, rate, sqrt_price_x96)
+
+    # Whether a swap is worth making is judged before price impact, which can shrink
+    # the refined amount on a thin pool while the mint still depends on it.
+    value = plan.amount_in * (spot if plan.zero_for_one else 1)
+    if total_in_token1 <= 0 or value < min_share * total_in_token1:
+        return SwapPlan(plan.zero_for_one, 0, 0, sqrt_price_x96)
+    if quote is not None and ratio is not None:
+        plan = _refine(plan, quote, amount0, amount1, tick_lower, tick_upper, iterations)
+    return plan
+
+
+def _refine(plan: SwapPlan, quote: Callable[[bool, int], Tuple[int, int]], amount0: int, amount1: int,
+            tick_lower: int, tick_upper: int, iterations: int) -> SwapPlan:
+    zero_for_one = plan.zero_for_one
+
+    def excess(amount_in: int) -> Tuple[float, int, int]:
+        # > 0 while the token being sold is still in excess after the swap
+        amount_out, sqrt_after = quote(zero_for_one, amount_in)
+        ratio = mint_ratio(sqrt_after, tick_lower, tick_upper)
+        if ratio is None:
+            return -1.0, amount_out, sqrt_after  # Pushed out of the range: too much
+        if zero_for_one:
+            return ratio * (amount0 - amount_in) - (amount1 + amount_out), amount_out, sqrt_after
+        return (amount1 - amount_in) - ratio * (amount0 + amount_out), amount_out, sqrt_after
+
+    low, high = 0, amount0 if zero_for_one else amount1
+    amount_in = plan.amount_in
+    best = None
+    for _ in range(iterations):
+        value, amount_out, sqrt_after = excess(amount_in)
+        if value >= 0:
+            low = amount_in
+            best = SwapPlan(zero_for_one, amount_in, amount_out, sqrt_after)
+        else:
+            high = amount_in
+        if high - low <= max(low // 10 ** 6, 1):
+            break
+        amount_in = (low + high) // 2
+    if best is None:
+        amount_out, sqrt_after = quote(zero_for_one, low) if low else (0, plan.sqrt_price_after)
+        best = SwapPlan(zero_for_one, low, amount_out, sqrt_after)
+    return best
+
+
+def _solve(zero_for_one: bool, amount0: int, amount1: int, ratio: float, rate: float, sqrt_price_x96: int) -> SwapPlan:
+    # ratio at the pre-swap price, rate net of the fee only: no price impact
+    if zero_for_one:
+        amount_in = (ratio * amount0 - amount1) / (rate + ratio)
+        amount_in = min(max(int(amount_in), 0), amount0)
+    else:
+        amount_in = (amount1 - ratio * amount0) / (1 + ratio * rate)
+        amount_in = min(max(int(amount_in), 0), amount1)
+    return SwapPlan(zero_for_one, amount_in, int(amount_in * rate), sqrt_price_x96)
@@ -0,0 +1,196 @@
+import math
+from array import array
+from bisect import bisect_right
+from typing import Tuple
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+LOG_TICK_BASE = math.log(1.0001)
+
+# Tick spacing Uniswap V3 enables for each fee tier (hundredths of a bip).
+FEE_TIER_TICK_SPACING = {100: 1, 500: 10, 3000: 60, 10000: 200}
+
+
+def tick_to_price(tick: int, decimals0: int, decimals1: int) -> float:
+    """Price of token0 in token1 units for a tick, adjusted for token decimals."""
+    return 1.0001 ** tick * 10 ** (decimals0 - decimals1)
+
+
+def price_to_tick(price: float, decimals0: int, decimals1: int) -> int:
+    """Largest tick whose price is <= `price` (the tick a pool at this price reports)."""
+    tick = math.floor(math.log(price / 10 ** (decimals0 - decimals1)) / LOG_TICK_BASE)
+    # The logarithm can land one tick off near a boundary; settle it against the exact price.
+    if tick_to_price(tick + 1, decimals0, decimals1) <= price:
+        tick += 1
+    elif tick_to_price(tick, decimals0, decimals1) > price:
+        tick -= 1
+    return max(MIN_TICK, min(MAX_TICK, tick))
+
+
+Q96 = 1 << 96
+
+# TickMath.getSqrtRatioAtTick: sqrt(1.0001^-2^i) as Q128.128 for each bit i of |tick|.
+_SQRT_RATIO_FACTORS = (
+    0xfffcb933bd6fad37aa2d162d1a594001, 0xfff97272373d413259a46990580e213a, 0xfff2e50f5f656932ef12357cf3c7fdcc,
+    0xffe5caca7e10e4e61c3624eaa0941cd0, 0xffcb9843d60f6159c9db58835c926644, 0xff973b41fa98c081472e6896dfb254c0,
+    0xff2ea16466c96a3843ec78b326b52861, 0xfe5dee046a99a2a811c461f1969c3053, 0xfcbe86c7900a88aedcffc83b479aa3a4,
+    0xf987a7253ac413176f2b074cf7815e54, 0xf3392b0822b70005940c7a398e4b70f3, 0xe7159475a2c29b7443b29c7fa6e889d9,
+    0xd097f3bdfd2022b8845ad8f792aa5825, 0xa9f746462d870fdf8a65dc1f90e061e5, 0x70d869a156d2a1b890bb3df62baf32f7,
+    0x31be135f97d08fd981231505542fcfa6, 0x9aa508b5b7a84e1c677de54f3e99bc9, 0x5d6af8dedb81196699c329225ee604,
+    0x2216e584f5fa1ea926041bedfe98, 0x48a170391f7dc42444e8fa2,
+)
+
+
+def sqrt_ratio_at_tick(tick: int) -> int:
+    """Exact sqrtPriceX96 at `tick`, as the pool computes it (TickMath.getSqrtRatioAtTick)."""
+    if not MIN_TICK <= tick <= MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range")
+    abs_tick = abs(tick)
+    ratio = _SQRT_RATIO_FACTORS[0] if abs_tick & 1 else 1 << 128
+    for bit in range(1, len(_SQRT_RATIO_FACTORS)):
+        if abs_tick & (1 << bit):
+            ratio = (ratio * _SQRT_RATIO_FACTORS[bit]) >> 128
+    if tick > 0:
+        ratio = ((1 << 256) - 1) // ratio
+    return (ratio >> 32) + (1 if ratio % (1 << 32) else 0)
+
+
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+
+def tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Greatest tick whose sqrt ratio is <= `sqrt_price_x96` (TickMath.getTickAtSqrtRatio)."""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 {sqrt_price_x96} out of range")
+    # The float estimate is within a tick or two; settle it with exact ratios.
+    tick = math.floor(2 * math.log(sqrt_price_x96 / Q96) / LOG_TICK_BASE)
+    tick = min(max(tick, MIN_TICK), MAX_TICK)
+    while tick < MAX_TICK and sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    while sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    return tick
+
+
+def amounts_for_liquidity(sqrt_price_x96: int, tick_lower: int, tick_upper: int, liquidity: int) -> Tuple[int, int]:
+    """Token amounts (rounded down) held by `liquidity` over a tick range at a pool price (LiquidityAmounts)."""
+    sqrt_lower, sqrt_upper = sqrt_ratio_at_tick(tick_lower), sqrt_ratio_at_tick(tick_upper)
+    if sqrt_price_x96 <= sqrt_lower:
+        return liquidity * Q96 * (sqrt_upper - sqrt_lower) // sqrt_upper // sqrt_lower, 0
+    if sqrt_price_x96 >= sqrt_upper:
+        return 0, liquidity * (sqrt_upper - sqrt_lower) // Q96
+    amount0 = liquidity * Q96 * (sqrt_upper - sqrt_price_x96) // sqrt_upper // sqrt_price_x96
+    amount1 = liquidity * (sqrt_price_x96 - sqrt_lower) // Q96
+    return amount0, amount1
+
+
+def liquidity_for_amounts(sqrt_price_x96: int, tick_lower: int, tick_upper: int, amount0: int, amount1: int) -> int:
+    """Largest liquidity `amount0`/`amount1` can fund over a tick range at a pool price (LiquidityAmounts)."""
+    sqrt_lower, sqrt_upper = sqrt_ratio_at_tick(tick_lower), sqrt_ratio_at_tick(tick_upper)
+
+    def from_amount0(lower: int, upper: int) -> int:
+        return amount0 * (lower * upper // Q96) // (upper - lower)
+
+    def from_amount1(lower: int, upper: int) -> int:
+        return amount1 * Q96 // (upper - lower)
+
+    if sqrt_price_x96 <= sqrt_lower:
+        return from_amount0(sqrt_lower, sqrt_upper)
+    if sqrt_price_x96 >= sqrt_upper:
+        return from_amount1(sqrt_lower, sqrt_upper)
+    return min(from_amount0(sqrt_price_x96, sqrt_upper), from_amount1(sqrt_lower, sqrt_price_x96))
+
+
+def align_down(tick: int, tick_spacing: int) -> int:
+    return tick // tick_spacing * tick_spacing
+
+
+def align_up(tick: int, tick_spacing: int) -> int:
+    return -(-tick // tick_spacing) * tick_spacing
+
+
+def range_ticks(center_tick: int, width: float, tick_spacing: int) -> Tuple[int, int]:
+    """
+    Usable (lower, upper) ticks covering at least ±`width` around `center_tick`.
+
+    Args:
+        center_tick: Tick to center the range on (the pool's current tick).
+        width: Relative half-width of the range, e.g. 0.02 for ±2%.
+        tick_spacing: Pool tick spacing; both ends are aligned outward to it.
+
+    Returns:
+        Tuple[int, int]: tickLower and tickUpper for the position.
+    """
+    lower = align_down(center_tick + math.floor(math.log(1 - width) / LOG_TICK_BASE), tick_spacing)
+    upper = align_up(center_tick + math.ceil(math.log(1 + width) / LOG_TICK_BASE), tick_spacing)
+    lower = max(lower, align_up(MIN_TICK, tick_spacing))
+    upper = min(max(upper, lower + tick_spacing), align_down(MAX_TICK, tick_spacing))
+    return lower, upper
+
+
+class TickTable:
+    """
+    Precomputed tick <-> price table around a position's range.
+
+    Covers every usable tick from one range width below `tick_lower` to one range width
+    above `tick_upper`. Range decisions are integer comparisons on ticks
+    (tickLower <= tick < tickUpper, as the pool defines an active position); prices are
+    only looked up for logging, and a float price is mapped back to a tick by bisection,
+    so repeated checks near an edge always agree.
+    """
+
+    def __init__(self, tick_lower: int, tick_upper: int, tick_spacing: int, decimals0: int, decimals1: int):
+        self.tick_lower = tick_lower
+        self.tick_upper = tick_upper
+        self.tick_spacing = tick_spacing
+        self.decimals0 = decimals0
+        self.decimals1 = decimals1
+
+        span = tick_upper - tick_lower
+        self.first_tick = align_down(max(tick_lower - span, MIN_TICK), tick_spacing)
+        last_tick = align_up(min(tick_upper + span, MAX_TICK), tick_spacing)
+        self.prices = array("d", (
+            tick_to_price(tick, decimals0, decimals1)
+            for tick in range(self.first_tick, last_tick + 1, tick_spacing)
+        ))
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return self.tick_lower, self.tick_upper, self.tick_spacing
+
+    def contains(self, tick: int) -> bool:
+        """Whether a pool at `tick` is inside the position range."""
+        return self.tick_lower <= tick < self.tick_upper
+
+    def near_bound(self, tick: int, fraction: float) -> bool:
+        """Whether `tick` is within `fraction` of the range width of either bound (or outside the range)."""
+        margin = fraction * (self.tick_upper - self.tick_lower)
+        return tick < self.tick_lower + margin or tick >= self.tick_upper - margin
+
+    def price(self, tick: int) -> float:
+        index, offset = divmod(tick - self.first_tick, self.tick_spacing)
+        if offset == 0 and 0 <= index < len(self.prices):
+            return self.prices[index]
+        return tick_to_price(tick, self.decimals0, self.decimals1)
+
+    def bounds(self) -> Tuple[float, float]:
+        """Position (lower, upper) bounds as prices."""
+        return self.price(self.tick_lower), self.price(self.tick_upper)
+
+    def center(self) -> float:
+        """Geometric mid-price of the position's range, the price it was centered on."""
+        lower, upper = self.bounds()
+        return math.sqrt(lower * upper)
+
+    def tick_at(self, price: float) -> int:
+        """
+        Usable tick at or below `price`.
+
+        Exact for range checks against this table's (usable) bounds; prices outside the
+        table fall back to `price_to_tick`.
+        """
+        index = bisect_right(self.prices, price) - 1
+        if 0 <= index < len(self.prices) - 1:
+            return self.first_tick + index * self.tick_spacing
+        return align_down(price_to_tick(price, self.decimals0, self.decimals1), self.tick_spacing)
@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class Observation:
+    """
+    What the trigger rules see at one check, all read from the cycle's chain snapshot.
+
+    Attributes:
+        price: Spot price.
+        timestamp: Time of the check (seconds).
+        in_range: Whether the pool tick is inside the position's ticks; None without a position.
+        reference_price: Price the position was opened at (`last_eth_price`), if known.
+        opened_at: Time of the last rebalance (seconds), if any.
+        volatility_threshold: Deviation floor for rules with a "volatility" threshold
+            (`MyStrategy.rebalance_threshold()`).
+    """
+    price: float
+    timestamp: float
+    in_range: Optional[bool] = None
+    reference_price: Optional[float] = None
+    opened_at: Optional[float] = None
+    volatility_threshold: float = 0.0
+
+    @property
+    def deviation(self) -> Optional[float]:
+        """Relative move from the reference price, as |price / reference - 1|."""
+        if not self.reference_price:
+            return None
+        return abs(self.price / self.reference_price - 1)
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        return self.timestamp - self.opened_at if self.opened_at is not None else None
+
+
+class Rule:
+    """A rebalance condition; `evaluate()` is called on every check, in order, with the same observation."""
+    kind = ""
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or self.kind
+
+    def evaluate(self, observation: Observation) -> bool:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget state carried between checks (the position was replaced)."""
+
+
+class PositionBounds(Rule):
+    """The pool tick left the position's tick range."""
+    kind = "position_bounds"
+
+    def evaluate(self, observation: Observation) -> bool:
+        return observation.in_range is False
+
+
+class PriceDeviation(Rule):
+    """
+    The price moved more than `threshold` from the price the position was opened at.
+
+    With `hysteresis`, a rule that has fired stays true until the move falls back below
+    `threshold - hysteresis`, so a price hovering at the threshold does not flip it on
+    every check (matters when combined with other rules in an "all").
+    `threshold` may be "volatility" to use the observation's volatility threshold.
+    """
+    kind = "price_deviation"
+
+    def __init__(self, threshold: Any, hysteresis: float = 0.0, name: Optional[str] = None):
+        super().__init__(name)
+        if threshold != "volatility" and not isinstance(threshold, (int, float)):
+            raise ValueError(f"price_deviation threshold must be a number or 'volatility', got {threshold!r}")
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.active = False
+
+    def evaluate(self, observation: Observation) -> bool:
+        deviation = observation.deviation
+        if deviation is None:
+            self.active = False
+            return False
+        threshold = observation.volatility_threshold if self.threshold == "volatility" else self.threshold
+        self.active = deviation > (threshold - self.hysteresis if self.active else threshold)
+        return self.active
+
+    def reset(self) -> None:
+        self.active = False
+
+
+class TimeElapsed(Rule):
+    """More than `seconds` have passed since the last rebalance."""
+    kind = "time_elapsed"
+
+    def __init__(self, seconds: float, name: Optional[str] = None):
+        super().__init__(name)
+        self.seconds = seconds
+
+    def evaluate(self, observation: Observation) -> bool:
+        elapsed = observation.elapsed
+        return elapsed is not None and elapsed > self.seconds
+
+
+class AllOf(Rule):
+    """Every child rule holds (all are evaluated, so their state stays current)."""
+    kind = "all"
+
+    def __init__(self, rules: Sequence[Rule], name: Optional[str] = None):
+        super().__init__(name or "+".join(rule.name for rule in rules))
+        self.rules = list(rules)
+
+    def evaluate(self, observation: Observation) -> bool:
+        return all([rule.evaluate(observation) for rule in self.rules])
+
+    def reset(self) -> None:
+        for rule in self.rules:
+            rule.reset()
+
+
+class AnyOf(AllOf):
+    """At least one child rule holds."""
+    kind = "any"
+
+    def __init__(self, rules: Sequence[Rule], name: Optional[str] = None):
+        super().__init__(rules, name or "|".join(rule.name for rule in rules))
+
+    def evaluate(self, observation: Observation) -> bool:
+        return any([rule.evaluate(observation) for rule in self.rules])
+
+
+RULES = {rule.kind: rule for rule in (PositionBounds, PriceDeviation, TimeElapsed)}
+COMBINATORS = {rule.kind: rule for rule in (AllOf, AnyOf)}
+
+
+def compile_rule(spec: Dict[str, Any]) -> Rule:
+    """
+    Build a rule from its declarative form, e.g.
+    {"rule": "price_deviation", "threshold": 0.02} or
+    {"name": "time_interval", "all": [{"rule": "time_elapsed", "seconds": 3600}, ...]}.
+    """
+    spec = dict(spec)
+    name = spec.pop("name", None)
+    for kind, combinator in COMBINATORS.items():
+        if kind in spec:
+            children = spec.pop(kind)
+            if spec or not children:
+                raise ValueError(f"'{kind}' takes a non-empty list of rules and an optional name, got {spec}")
+            return combinator([compile_rule(child) for child in children], name=name)
+    kind = spec.pop("rule", None)
+    try:
+        return RULES[kind](name=name, **spec)
+    except KeyError:
+        raise ValueError(f"Unknown trigger rule {kind!r}, expected one of {sorted(RULES)}") from None
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for trigger rule {kind!r}: {e}") from None
+
+
+class TriggerEngine:
+    """
+    Rebalance triggers compiled once from their declarative form, checked in one pass.
+
+    Top-level rules are alternatives: `evaluate()` runs every one of them against the
+    same observation (keeping hysteresis state current) and returns the names of those
+    that fired, in declaration order; the first one is the recorded trigger.
+    """
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = list(rules)
+
+    @classmethod
+    def compile(cls, specs: Sequence[Dict[str, Any]]) -> "TriggerEngine":
+        return cls([compile_rule(spec) for spec in specs])
+
+    def evaluate(self, observation: Observation) -> List[str]:
+        return [rule.name for rule in self.rules if rule.evaluate(observation)]
+
+    def reset(self) -> None:
+        for rule in self.rules:
+            rule.reset()
+
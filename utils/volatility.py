@@ -0,0 +1,188 @@
+import base64
+import math
+import struct
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .history import ColumnarRing
+
+
+class VolatilityStats:
+    """
+    Streaming volatility of the pool price over the last `window` periods of `period` seconds.
+
+    Observations are bucketed into periods. Each closed period adds its close-to-close
+    log return to a rolling mean/variance (Welford, with the return leaving the window
+    removed the same way), to an EWMA of squared returns (alpha = 2 / (window + 1)), and
+    its true range, relative to the previous close, to a Wilder ATR over `window` periods.
+    An observation costs O(1) time; memory is the ring of `window` returns plus a few
+    scalars, packed into `to_bytes()` (about 0.8 KB at the default window).
+
+    Like the history buffers, observations since the last `drain_changes()` are tracked,
+    so the state journal records them as appends and `replay()` re-applies them.
+    """
+    MAGIC = b"VS01"
+    COLUMNS = [("log_return", "d")]
+    _STATE = struct.Struct("<4sIIddddIqdddd")
+
+    def __init__(self, period: int = 900, window: int = 96):
+        self.period = period
+        self.window = window
+        self.returns = ColumnarRing(self.COLUMNS, window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma_variance = math.nan
+        self.atr = math.nan
+        self.atr_count = 0
+        self.bucket = -1  # Start of the period being observed, -1 before the first observation
+        self.previous_close = math.nan
+        self.high = self.low = self.close = math.nan
+        self._pending: Optional[List[Tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+    def __repr__(self) -> str:
+        return f"VolatilityStats(returns={len(self.returns)}/{self.window}, period={self.period}s)"
+
+    def update(self, timestamp: int, price: float) -> None:
+        """Add an observation; ones older than the current period, or non-positive prices, are ignored."""
+        if self._pending is not None:
+            self._pending.append((timestamp, price))
+        if price <= 0:
+            return
+        bucket = timestamp - timestamp % self.period
+        if bucket > self.bucket:
+            if self.bucket >= 0:
+                self._close_period()
+            self.bucket = bucket
+            self.high = self.low = self.close = price
+        elif bucket == self.bucket:
+            self.high = max(self.high, price)
+            self.low = min(self.low, price)
+            self.close = price
+
+    def _close_period(self) -> None:
+        previous = self.previous_close
+        self.previous_close = self.close
+        if math.isnan(previous):
+            return
+        log_return = math.log(self.close / previous)
+        evicted = self.returns.append((log_return,))
+        if evicted is not None:
+            self._remove(evicted[0])
+        self._add(log_return)
+
+        alpha = 2 / (self.window + 1)
+        squared = log_return * log_return
+        self.ewma_variance = squared if math.isnan(self.ewma_variance) else (
+            self.ewma_variance + alpha * (squared - self.ewma_variance))
+
+        true_range = (max(self.high, previous) - min(self.low, previous)) / previous
+        self.atr_count = min(self.atr_count + 1, self.window)
+        self.atr = true_range if math.isnan(self.atr) else self.atr + (true_range - self.atr) / self.atr_count
+
+    def _add(self, value: float) -> None:
+        count = len(self.returns)
+        delta = value - self.mean
+        self.mean += delta / count
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        count = len(self.returns) - 1  # Count once `value` is out (the new return is not added yet)
+        if count == 0:
+            self.mean = self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / count
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+
+    @property
+    def sigma(self) -> Optional[float]:
+        """Standard deviation of the per-period log return over the window (None below 2 returns)."""
+        count = len(self.returns)
+        return math.sqrt(self.m2 / (count - 1)) if count > 1 else None
+
+    @property
+    def ewma_sigma(self) -> Optional[float]:
+        return None if math.isnan(self.ewma_variance) else math.sqrt(self.ewma_variance)
+
+    @property
+    def relative_atr(self) -> Optional[float]:
+        """Average true range of a period, as a fraction of the price."""
+        return None if math.isnan(self.atr) else self.atr
+
+    def variance_rate(self) -> Optional[float]:
+        """Per-second log variance, from the larger of the rolling and EWMA estimates."""
+        sigma = max(self.sigma or 0.0, self.ewma_sigma or 0.0)
+        return sigma * sigma / self.period if sigma else None
+
+    def range_width(self, horizon: float, sigmas: float, min_width: float, max_width: float,
+                    default: float) -> float:
+        """
+        Relative half-width of a range the price should stay in for `horizon` seconds:
+        `sigmas` standard deviations of the move over the horizon, within [min_width,
+        max_width]; `default` until a few periods have been observed.
+        """
+        variance_rate = self.variance_rate()
+        if variance_rate is None or len(self.returns) < 4:
+            return default
+        width = sigmas * math.sqrt(variance_rate * horizon)
+        return min(max(width, min_width), max_width)
+
+    def rebalance_threshold(self, minimum: float) -> float:
+        """Smallest relative move worth a time-based rebalance: one average true range, at least `minimum`."""
+        atr = self.relative_atr
+        return minimum if atr is None else max(minimum, atr)
+
+    def replay(self, rows: List[Sequence[Any]]) -> None:
+        """Re-apply observations returned by `drain_changes()`."""
+        for timestamp, price in rows:
+            self.update(int(timestamp), float(price))
+
+    def drain_changes(self) -> Optional[List[Tuple]]:
+        """Observations since the last drain, or None if the state was rebuilt and must be saved whole."""
+        changes, self._pending = self._pending, []
+        return changes
+
+    def rebuild(self, rows: Sequence[Tuple[int, float]], period: int, window: int) -> None:
+        """Reset for a new period/window and re-feed observations, e.g. the raw price history."""
+        self.__init__(period, window)
+        for timestamp, price in rows:
+            self.update(int(timestamp), float(price))
+        self._pending = None
+
+    def to_bytes(self) -> bytes:
+        header = self._STATE.pack(
+            self.MAGIC, self.period, self.window, self.mean, self.m2, self.ewma_variance, self.atr,
+            self.atr_count, self.bucket, self.previous_close, self.high, self.low, self.close,
+        )
+        return header + self.returns.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "VolatilityStats":
+        buf = memoryview(data)
+        (magic, period, window, mean, m2, ewma_variance, atr, atr_count, bucket,
+         previous_close, high, low, close) = cls._STATE.unpack_from(buf, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not packed VolatilityStats (magic {magic!r})")
+        stats = cls(period, window)
+        stats.mean, stats.m2, stats.ewma_variance, stats.atr = mean, m2, ewma_variance, atr
+        stats.atr_count, stats.bucket = atr_count, bucket
+        stats.previous_close, stats.high, stats.low, stats.close = previous_close, high, low, close
+        stats.returns, _ = ColumnarRing.from_bytes(cls.COLUMNS, buf[cls._STATE.size:])
+        return stats
+
+    def encode(self) -> str:
+        """Base64 text form, for embedding in the JSON persistent state."""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, value: Any) -> "VolatilityStats":
+        """Build from an encoded string, packed bytes or an existing instance (empty when None)."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_bytes(base64.b64decode(value)) if value else cls()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        return cls()